@@ -0,0 +1,59 @@
+# Время проверки запрещенного форматирования на синтетическом документе
+# с большим количеством окружений center/flushright и команд выделения.
+#
+# Запуск из корня репозитория:
+# python benchmarks/formatting_time.py
+# python benchmarks/formatting_time.py --blocks 5000 --repeat 5
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.logics.parsers.latex_parser import LatexParser  # noqa: E402
+
+
+def build_document(blocks: int) -> bytes:
+    parts = [
+        "\\begin{document}\n",
+        "\\chapter*{ВВЕДЕНИЕ}\n\\addcontentsline{toc}{chapter}{ВВЕДЕНИЕ}\n{\\bf Цель работы} - проверка.\n",
+        "\\chapter{Основная часть}\n",
+    ]
+    for i in range(blocks):
+        env = "center" if i % 2 else "flushright"
+        parts.append(f"\\begin{{{env}}}\\textbf{{Заголовок {i}}}\\end{{{env}}}\n")
+        parts.append(f"Абзац {i} с \\textit{{курсивом}} и \\underline{{подчеркиванием}}.\n")
+    parts.append("\\end{document}\n")
+    return "".join(parts).encode("utf-8")
+
+
+def run_once(parser: LatexParser) -> float:
+    parser.errors = []
+    start = time.perf_counter()
+    parser.check_text_formatting_outside_introduction()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время проверки форматирования вне введения")
+    parser.add_argument("--blocks", type=int, default=3000, help="Количество окружений center/flushright")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    content = build_document(args.blocks)
+    latex_parser = LatexParser(io.BytesIO(content))
+
+    timings = [run_once(latex_parser) for _ in range(args.repeat)]
+
+    print(f"{args.blocks} окружений, {len(latex_parser.errors)} ошибок, {args.repeat} повторов")
+    print(f"min {min(timings) * 1000:.1f} ms  median {statistics.median(timings) * 1000:.1f} ms  "
+          f"max {max(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Замер времени холодного старта CLI и сервиса.
+#
+# Запуск из корня репозитория:
+# python benchmarks/import_time.py
+# python benchmarks/import_time.py --repeat 10 --output import_time.json
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    "cli list-doc-types": [sys.executable, "cli.py", "list-doc-types"],
+    "cli get-rules": [sys.executable, "cli.py", "get-rules", "diploma"],
+    "cli validate-latex": [sys.executable, "cli.py", "validate-latex", "docs/my.tex", "docs/settings.sty", "diploma"],
+    "cli --help": [sys.executable, "cli.py"],
+    "import main:app": [sys.executable, "-c", "import main"],
+    "import docx stack": [sys.executable, "-c", "from src.logics.checkers.docx_checker import DocxChecker"],
+}
+
+
+def measure(command, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "returncode": completed.returncode,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время холодного старта cli.py и main:app")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Файл для сохранения результатов в формате JSON")
+    args = parser.parse_args()
+
+    results = {name: measure(command, args.repeat) for name, command in COMMANDS.items()}
+
+    for name, result in results.items():
+        status = "" if result["returncode"] == 0 else f" (код возврата {result['returncode']})"
+        print(f"{name:<22} min {result['min']:.3f} s  median {result['median']:.3f} s  "
+              f"max {result['max']:.3f} s{status}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
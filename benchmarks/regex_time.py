@@ -0,0 +1,133 @@
+# Время этапов разбора LaTeX, которые больше всего работают с регулярными выражениями:
+# ссылки на приложения, позиции команд выделения и списки.
+# Для каждого этапа сравниваются две реализации:
+# - baseline: прежний код с вызовами re.* и строковыми шаблонами внутри функций;
+# - current: методы LatexParser с шаблонами из patterns.py и индексом команд LatexTokenizer.
+#
+# Запуск из корня репозитория:
+# python benchmarks/regex_time.py
+# python benchmarks/regex_time.py docs/my.tex --repeat 50 --purge
+#
+# --purge очищает внутренний кэш модуля re перед каждым повтором baseline - так ведет себя
+# сервис под нагрузкой, когда кэш на 512 шаблонов вытесняется другими запросами.
+# На current очистка не влияет: шаблоны patterns.py скомпилированы при импорте и не берутся из кэша re.
+# Токенизация нужна только current и выполняется один раз на документ, ее время выводится отдельно.
+
+import argparse
+import io
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.logics.parsers import patterns  # noqa: E402
+from src.logics.parsers.latex_parser import LatexParser  # noqa: E402
+from src.logics.parsers.latex_tokenizer import LatexTokenizer  # noqa: E402
+
+BASELINE_APPENDIX_LINKS = [
+    r'\(\s*прил\.?\s*([А-Я])\s*\)',
+    r'\bв\s+приложении\s+([А-Я])\b',
+    r'\bиз\s+приложения\s+([А-Я])\b',
+    r'\(см\.?\s*прил\.?\s*([А-Я])\)',
+]
+
+BASELINE_FORMATTING = [r'\\textbf\{', r'\\bf\s*\{', r'{\\bf\s+', r'\\textit\{', r'\\it\s*\{', r'{\\it\s+',
+                       r'\\underline\{', r'\\emph\{']
+
+
+def baseline_appendix_links(text: str) -> list:
+    links = []
+    for pattern in BASELINE_APPENDIX_LINKS:
+        for match in re.finditer(pattern, text, flags=re.IGNORECASE):
+            links.append({"letter": match.group(1).upper(), "raw_text": match.group(0)})
+    return links
+
+
+def current_appendix_links(parser: LatexParser) -> list:
+    links = []
+    for pattern in patterns.LATEX_APPENDIX_LINKS:
+        links += parser.find_appendix_links(pattern)
+    return links
+
+
+def baseline_formatting_positions(text: str) -> list:
+    return sorted(match.start() for pattern in BASELINE_FORMATTING for match in re.finditer(pattern, text))
+
+
+def current_formatting_positions(parser: LatexParser) -> list:
+    positions = []
+    for command_name, _ in patterns.LATEX_FORMATTING_COMMANDS:
+        by_command, by_group = parser.formatting_position_groups(command_name)
+        positions += by_command + by_group
+    return sorted(positions)
+
+
+def baseline_lists(text: str) -> dict:
+    list_types = ['enumarabic', 'enumasbuk', 'enummarker']
+    lists = {list_type: [] for list_type in list_types}
+    for list_type in list_types:
+        pattern = re.compile(rf'\\begin\{{{list_type}\}}|\\end\{{{list_type}\}}')
+        stack = []
+        for match in pattern.finditer(text):
+            if match.group() == f'\\begin{{{list_type}}}':
+                stack.append(match.start())
+            elif stack:
+                start = stack.pop()
+                block = text[start:match.end()]
+                before_match = re.search(
+                    r'((?:\\textbf\{[^}]+?\}|\\bf\s*\{[^}]+?\}|{\\bf\s+[^}]+?}|[^.?!:\n]+[.?!:]))\s*$', text[:start])
+                before_text = before_match.group(1).strip() if before_match else ""
+                lists[list_type].append(f"{before_text}\n{block}".strip())
+    return lists
+
+
+STAGES = {
+    "find_appendix_links": (baseline_appendix_links, current_appendix_links),
+    "formatting_position_groups": (baseline_formatting_positions, current_formatting_positions),
+    "parse_lists": (baseline_lists, LatexParser.parse_lists),
+}
+
+
+def measure(func, arg, repeat: int, purge: bool) -> list:
+    timings = []
+    for _ in range(repeat):
+        if purge:
+            re.purge()
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время этапов разбора LaTeX: прежние вызовы re.* и текущая реализация")
+    parser.add_argument("tex_path", nargs="?", default=str(ROOT / "docs" / "my.tex"))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--purge", action="store_true", help="Очищать кэш re перед каждым повтором baseline")
+    args = parser.parse_args()
+
+    tex_content = Path(args.tex_path).read_bytes()
+    latex_parser = LatexParser(io.BytesIO(tex_content))
+    text = latex_parser.tex_content
+
+    print(f"{Path(args.tex_path).name}: {len(tex_content) // 1024} KB, {args.repeat} повторов"
+          f"{', кэш re очищается перед baseline' if args.purge else ''}")
+    tokenize = measure(LatexTokenizer, text, args.repeat, False)
+    print(f"{'tokenize (только current)':<30} {statistics.median(tokenize) * 1000:9.3f} ms")
+    print(f"{'этап':<30} {'baseline':>12} {'current':>12}  результат")
+
+    for name, (baseline, current) in STAGES.items():
+        same = baseline(text) == current(latex_parser)
+        baseline(text), current(latex_parser)  # прогрев
+        baseline_timings = measure(baseline, text, args.repeat, args.purge)
+        current_timings = measure(current, latex_parser, args.repeat, False)
+        print(f"{name:<30} {statistics.median(baseline_timings) * 1000:9.3f} ms "
+              f"{statistics.median(current_timings) * 1000:9.3f} ms  {'совпадает' if same else 'отличается'}")
+
+
+if __name__ == "__main__":
+    main()
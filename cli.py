@@ -15,19 +15,35 @@
 # # Проверка DOCX
 # python cli.py validate-docx C:\path\to\file.docx diploma
 #
+# # Быстрая проверка DOCX без dedoc
+# python cli.py validate-docx C:\path\to\file.docx diploma --fast
+#
 # # Проверка LaTeX
 # python cli.py validate-latex C:\path\to\doc.tex C:\path\to\template.sty diploma
+#
+# # Проверка LaTeX-проекта из нескольких файлов (каталог или zip-архив с \input/\include)
+# python cli.py validate-latex C:\path\to\project C:\path\to\template.sty diploma
+#
+# # Проверка всех .docx и .tex в каталоге (рекурсивно) в 4 процессах с записью в JSON Lines
+# python cli.py validate-dir C:\path\to\archive diploma --workers 4 --output results.jsonl
 
 
 import argparse
 import os
+import sys
 import tempfile
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 from src.core.doc_type import DocType
 from src.core.validator import OperationException
-from src.logics.checkers.docx_checker import DocxChecker
 from src.logics.checkers.latex_checker import LatexChecker
+from src.logics.parsers.latex_project import LatexProject
+from src.logics.parsers.streaming_threshold import StreamingThreshold
+from src.logics.dedoc_pool import DedocPool
+from src.logics.batch_service import BatchService
 from src.logics.doc_service import DocService
 from src.logics.rule_service import RuleService
 from src.settings_manager import SettingsManager
@@ -36,6 +52,8 @@ from src.logics.logging import Logging
 manager = SettingsManager()
 manager.open("settings.json")
 logger = Logging(manager)
+DedocPool.configure(manager.current_settings.dedoc_pool_size)
+StreamingThreshold.configure(manager.current_settings.docx_streaming_threshold_mb * 1024 * 1024)
 
 
 def list_doc_options():
@@ -80,10 +98,16 @@ def update_rule_all(rule_key, new_value):
         print("Ошибки:", errors)
 
 
-def validate_docx(file_path, doc_type):
+def validate_docx(file_path, doc_type, fast=False):
+    # Стек DOCX (python-docx, dedoc) загружается только для этой команды
+    from src.logics.checkers.docx_checker import DocxChecker
+
     try:
         doc_type_enum = DocType[doc_type.upper()]
-        checker = DocxChecker(file_path, doc_type)
+        if not fast:
+            # DedocManager берется из прогретого пула, как в сервисе и в процессах validate-dir
+            DedocPool.warm_up(1)
+        checker = DocxChecker(file_path, doc_type, fast=fast)
         result = checker.check_document()
         print(json.dumps(result, indent=2, ensure_ascii=False))
     except Exception as e:
@@ -93,14 +117,110 @@ def validate_docx(file_path, doc_type):
 def validate_latex(tex_path, sty_path, doc_type):
     try:
         doc_type_enum = DocType[doc_type.upper()]
-        with open(tex_path, "rb") as tex_file, open(sty_path, "rb") as sty_file:
-            checker = LatexChecker(tex_file, sty_file, doc_type)
-            result = checker.check_document()
-            print(json.dumps(result, indent=2, ensure_ascii=False))
+        if os.path.isdir(tex_path) or tex_path.lower().endswith(".zip"):
+            # Проект из нескольких файлов: основной файл определяется по \documentclass
+            if os.path.isdir(tex_path):
+                project = LatexProject.from_directory(tex_path)
+            else:
+                with open(tex_path, "rb") as archive:
+                    project = LatexProject.from_zip(archive.read())
+            with open(sty_path, "rb") as sty_file:
+                result = LatexChecker.from_project(project, sty_file, doc_type).check_document()
+        else:
+            with open(tex_path, "rb") as tex_file, open(sty_path, "rb") as sty_file:
+                result = LatexChecker(tex_file, sty_file, doc_type).check_document()
+        print(json.dumps(result, indent=2, ensure_ascii=False))
     except Exception as e:
         print(f"Ошибка: {e}")
 
 
+def discover_documents(directory):
+    """Все .docx и .tex в каталоге (рекурсивно) и .sty для каждого .tex"""
+    root = Path(directory)
+    sty_files = {path.as_posix(): path for path in root.rglob("*.sty")}
+
+    documents = []
+    for path in sorted(root.rglob("*")):
+        suffix = path.suffix.lower()
+        if not path.is_file() or path.name.startswith("~$"):
+            continue
+        if suffix == ".docx":
+            documents.append((str(path), None))
+        elif suffix == ".tex":
+            sty_path = BatchService.find_sty(path.as_posix(), sty_files)
+            documents.append((str(path), str(sty_path) if sty_path else None))
+    return documents
+
+
+def percentile(values, percent):
+    """Перцентиль по методу ближайшего ранга"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def validate_dir(directory, doc_type, workers=None, output=None, fast=False):
+    from src.logics import validation_tasks
+
+    try:
+        DocType[doc_type.upper()]
+    except KeyError:
+        print(f"Неизвестный тип документа: {doc_type}")
+        return
+
+    documents = discover_documents(directory)
+    if not documents:
+        print(f"В каталоге {directory} не найдено .docx и .tex файлов")
+        return
+
+    workers = workers or os.cpu_count() or 1
+    stream = open(output, "w", encoding="utf-8") if output else sys.stdout
+    # Без --output результаты идут в stdout, поэтому сводка печатается в stderr
+    summary_stream = sys.stdout if output else sys.stderr
+
+    latencies = []
+    counts = {"valid": 0, "invalid": 0, "failed": 0}
+    started = time.perf_counter()
+    try:
+        # Каждый процесс один раз загружает парсеры (и dedoc) и проверяет много документов
+        with ProcessPoolExecutor(max_workers=workers, initializer=validation_tasks.warm_up_worker,
+                                 initargs=(not fast, manager.current_settings.dedoc_pool_size,
+                                           manager.current_settings.docx_streaming_threshold_mb * 1024 * 1024)
+                                 ) as executor:
+            futures = []
+            for file_path, sty_path in documents:
+                if file_path.lower().endswith(".tex") and sty_path is None:
+                    line = {"file": file_path, "error": "Не найден .sty файл для проверки", "seconds": 0.0}
+                    counts["failed"] += 1
+                    stream.write(json.dumps(line, ensure_ascii=False) + "\n")
+                    continue
+                futures.append(executor.submit(validation_tasks.validate_file, file_path, doc_type, fast, sty_path))
+
+            for future in as_completed(futures):
+                line = future.result()
+                latencies.append(line["seconds"])
+                if "error" in line:
+                    counts["failed"] += 1
+                elif line["result"].get("valid"):
+                    counts["valid"] += 1
+                else:
+                    counts["invalid"] += 1
+                stream.write(json.dumps(line, ensure_ascii=False) + "\n")
+                stream.flush()
+    finally:
+        if output:
+            stream.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Проверено документов: {len(documents)} за {elapsed:.1f} с ({len(documents) / elapsed:.2f} док/с), "
+          f"процессов: {workers}", file=summary_stream)
+    print(f"Без ошибок: {counts['valid']}, с ошибками: {counts['invalid']}, не проверено: {counts['failed']}",
+          file=summary_stream)
+    if latencies:
+        print(f"Время на документ: p50 {percentile(latencies, 50):.3f} с, p95 {percentile(latencies, 95):.3f} с",
+              file=summary_stream)
+
+
 def main():
     parser = argparse.ArgumentParser(description="CLI для системы автоматического нормоконтроля")
     subparsers = parser.add_subparsers(dest="command")
@@ -122,12 +242,22 @@ def main():
     validate_docx_parser = subparsers.add_parser("validate-docx", help="Проверить .docx документ")
     validate_docx_parser.add_argument("file_path")
     validate_docx_parser.add_argument("doc_type")
+    validate_docx_parser.add_argument("--fast", action="store_true", help="Проверка без dedoc")
 
     validate_latex_parser = subparsers.add_parser("validate-latex", help="Проверить LaTeX документ")
     validate_latex_parser.add_argument("tex_path")
     validate_latex_parser.add_argument("sty_path")
     validate_latex_parser.add_argument("doc_type")
 
+    validate_dir_parser = subparsers.add_parser("validate-dir",
+                                                help="Проверить все .docx и .tex в каталоге (рекурсивно)")
+    validate_dir_parser.add_argument("directory")
+    validate_dir_parser.add_argument("doc_type")
+    validate_dir_parser.add_argument("--workers", type=int, default=None,
+                                     help="Количество процессов (по умолчанию - число ядер)")
+    validate_dir_parser.add_argument("--output", default=None, help="Файл JSON Lines (по умолчанию - stdout)")
+    validate_dir_parser.add_argument("--fast", action="store_true", help="Проверка .docx без dedoc")
+
     args = parser.parse_args()
 
     if args.command == "list-doc-types":
@@ -139,9 +269,11 @@ def main():
     elif args.command == "update-rule-all":
         update_rule_all(args.rule_key, args.new_value)
     elif args.command == "validate-docx":
-        validate_docx(args.file_path, args.doc_type)
+        validate_docx(args.file_path, args.doc_type, args.fast)
     elif args.command == "validate-latex":
         validate_latex(args.tex_path, args.sty_path, args.doc_type)
+    elif args.command == "validate-dir":
+        validate_dir(args.directory, args.doc_type, args.workers, args.output, args.fast)
     else:
         parser.print_help()
 
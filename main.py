@@ -1,18 +1,30 @@
-import os
-import tempfile
+import asyncio
+import json
+import time
+from typing import List
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.params import Path
+from fastapi.responses import StreamingResponse, PlainTextResponse
 
 from src.core.doc_type import DocType
 from src.core.event_type import EventType
-from src.core.validator import OperationException
-from src.logics.checkers.docx_checker import DocxChecker
-from src.logics.checkers.latex_checker import LatexChecker
+from src.core.validator import OperationException, OverloadException
+from src.logics import validation_tasks
+from src.logics.batch_service import BatchService
+from src.logics.dedoc_pool import DedocPool
 from src.logics.doc_service import DocService
+from src.logics.job_service import JobService
+from src.logics.log_writer import LogWriter
 from src.logics.logging import Logging
+from src.logics.metrics_service import MetricsService
 from src.logics.observe_service import ObserveService
+from src.logics.parsers.streaming_threshold import StreamingThreshold
+from src.logics.result_cache import ResultCache
 from src.logics.rule_service import RuleService
+from src.logics.timing_stats import TimingStats
+from src.logics.worker_pool import WorkerPool
+from src.logics.worker_stats import WorkerStats
 from src.settings_manager import SettingsManager
 
 app = FastAPI()
@@ -20,6 +32,118 @@ app = FastAPI()
 manager = SettingsManager()
 manager.open("settings.json")
 logging = Logging(manager)
+# Дочерние процессы настраиваются так же, как основной; dedoc в них прогревается, если включено в settings.json
+WorkerPool.configure(manager.current_settings.worker_pool_size, manager.current_settings.worker_queue_size,
+                     initializer=validation_tasks.warm_up_worker,
+                     initargs=(manager.current_settings.dedoc_warm_up, manager.current_settings.dedoc_pool_size,
+                               manager.current_settings.docx_streaming_threshold_mb * 1024 * 1024))
+JobService.configure(manager.current_settings.job_workers, manager.current_settings.job_queue_size,
+                     manager.current_settings.job_result_ttl, manager.current_settings.job_max_finished)
+result_cache = ResultCache()
+ResultCache.configure(manager.current_settings.result_cache_size,
+                      manager.current_settings.result_cache_max_mb * 1024 * 1024,
+                      manager.current_settings.result_cache_dir)
+BatchService.configure(manager.current_settings.batch_max_files,
+                      manager.current_settings.batch_max_file_mb * 1024 * 1024,
+                      manager.current_settings.batch_max_total_mb * 1024 * 1024)
+StreamingThreshold.configure(manager.current_settings.docx_streaming_threshold_mb * 1024 * 1024)
+MetricsService.register("worker_pool", WorkerPool.get_stats, counters=("completed", "failed", "rejected"))
+# Счетчики dedoc и кэша правил собираются с процессов проверки (приходят вместе с результатом)
+MetricsService.register("dedoc_pool", lambda: WorkerStats.get_stats("dedoc_pool"),
+                        counters=("warm_parses", "cold_parses"))
+MetricsService.register("rule_cache", lambda: WorkerStats.get_stats("rule_cache"), counters=("hits", "misses"))
+MetricsService.register("result_cache", ResultCache.get_stats, counters=("hits", "misses", "evictions"))
+MetricsService.register("jobs", JobService.get_stats)
+MetricsService.register("logging", LogWriter.get_stats, counters=("written", "dropped", "failed", "rotations"))
+
+
+@app.on_event("startup")
+def warm_up_dedoc():
+    # По умолчанию dedoc загружается при первой проверке .docx; прогрев включается в settings.json
+    if not manager.current_settings.dedoc_warm_up:
+        return
+    if manager.current_settings.worker_pool_size == 0:
+        # Проверка выполняется в основном процессе
+        DedocPool.warm_up(manager.current_settings.dedoc_pool_size)
+        ObserveService.raise_event(EventType.LOG_INFO,
+                                   lambda: f"Пул dedoc прогрет: {manager.current_settings.dedoc_pool_size} экз.")
+        return
+    # dedoc прогревается в каждом процессе проверки при его запуске (validation_tasks.warm_up_worker)
+    WorkerPool.start()
+    ObserveService.raise_event(EventType.LOG_INFO,
+                               lambda: f"Процессы проверки запущены и прогреты: "
+                                       f"{manager.current_settings.worker_pool_size}")
+
+
+@app.on_event("shutdown")
+def stop_workers():
+    WorkerPool.shutdown()
+    LogWriter.shutdown()
+
+
+@app.middleware("http")
+async def collect_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Метка - шаблон маршрута, а не фактический путь, чтобы число рядов метрик не росло
+        route = request.scope.get("route")
+        MetricsService.observe_request(getattr(route, "path", "unmatched"), request.method, status,
+                                       time.perf_counter() - started)
+
+
+async def run_validation(func, *args, doc_type: str, cache_key: str = None, timings: bool = False,
+                         session_id: str = None):
+    """
+    Выполняет проверку в пуле процессов; при переполнении очереди отвечает 429.
+    Проверки одной сессии (session_id) выполняются одним процессом, где хранится кэш сессии.
+    Результат для повторно загруженных файлов берется из ResultCache.
+    Замеры этапов учитываются в TimingStats и возвращаются в ответе, если запрошены (timings).
+    """
+    document_format = validation_tasks.document_format(func)
+    if cache_key:
+        cached = ResultCache.get(cache_key)
+        if cached is not None:
+            ObserveService.raise_event(EventType.LOG_DEBUG, "Результат проверки взят из кэша")
+            MetricsService.observe_validation(document_format, doc_type, cached, cached=True)
+            return cached
+
+    started = time.perf_counter()
+    try:
+        result = await WorkerPool.run(func, *args, route_key=session_id or None)
+    except OverloadException as e:
+        ObserveService.raise_event(EventType.LOG_ERROR, str(e))
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+    stage_timings = TimingStats.collect(result)
+    MetricsService.observe_validation(document_format, doc_type, result, time.perf_counter() - started)
+    if cache_key:
+        ResultCache.put(cache_key, result)
+    if timings and stage_timings:
+        return {**result, "timings": stage_timings}
+    return result
+
+
+@app.get("/api/health")
+def health():
+    return {"status": "ok", "dedoc_pool": WorkerStats.get_stats("dedoc_pool"),
+            "rule_cache": WorkerStats.get_stats("rule_cache"),
+            "worker_pool": WorkerPool.get_stats(), "jobs": JobService.get_stats(),
+            "result_cache": ResultCache.get_stats(), "logging": LogWriter.get_stats()}
+
+
+@app.get("/api/health/timings")
+def health_timings():
+    return TimingStats.get_stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(MetricsService.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.get("/api/documents/options")
@@ -43,15 +167,15 @@ def exact_rules(
         doc_type: str = Path(..., description="Тип документа",
                              enum=["diploma", "course_work", "practice_report"])
 ):
-    ObserveService.raise_event(EventType.LOG_DEBUG, f"Запрос правил для типа документа: {doc_type} [GET]")
+    ObserveService.raise_event(EventType.LOG_DEBUG, lambda: f"Запрос правил для типа документа: {doc_type} [GET]")
     try:
         doc_type_enum = DocType[doc_type.upper()]
     except KeyError:
-        ObserveService.raise_event(EventType.LOG_ERROR, f"Неизвестный тип документа: {doc_type}")
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Неизвестный тип документа: {doc_type}")
         raise HTTPException(status_code=400, detail=f"Неизвестный тип документа: {doc_type}")
 
     rules = RuleService.load_rules(doc_type_enum)
-    ObserveService.raise_event(EventType.LOG_INFO, f"Правила для {doc_type} возвращены")
+    ObserveService.raise_event(EventType.LOG_INFO, lambda: f"Правила для {doc_type} возвращены")
     return rules
 
 
@@ -61,26 +185,27 @@ def change_rules(doc_type: str, rule_key: str, new_value: str):
         doc_type_enum = DocType[doc_type.upper()]
     except KeyError:
         ObserveService.raise_event(EventType.LOG_ERROR,
-                                   f"Попытка обновления правила для неизвестного типа документа: {doc_type}")
+                                   lambda: f"Попытка обновления правила для неизвестного типа документа: {doc_type}")
         raise HTTPException(status_code=400, detail=f"Неизвестный тип документа: {doc_type}")
 
     try:
         RuleService.update_rule(doc_type_enum, rule_key, new_value)
-        ObserveService.raise_event(EventType.LOG_INFO, f"Правило {rule_key} для {doc_type} изменено на {new_value}")
+        ObserveService.raise_event(EventType.LOG_INFO,
+                                   lambda: f"Правило {rule_key} для {doc_type} изменено на {new_value}")
         return {"message": f"Правило {rule_key} успешно обновлено"}
     except OperationException as e:
-        ObserveService.raise_event(EventType.LOG_ERROR, f"Ошибка при обновлении правила {rule_key}: {str(e)}")
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Ошибка при обновлении правила {rule_key}: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Ошибка: {str(e)}")
     except Exception as e:
         ObserveService.raise_event(EventType.LOG_ERROR,
-                                   f"Внутренняя ошибка сервера при обновлении правила {rule_key}: {str(e)}")
+                                   lambda: f"Внутренняя ошибка сервера при обновлении правила {rule_key}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
 
 
 @app.post("/api/rules/update/all")
 def change_rule_for_all(rule_key: str, new_value: str):
     ObserveService.raise_event(EventType.LOG_DEBUG,
-                               f"Запрос на изменение правила {rule_key} для всех типов документов [POST]")
+                               lambda: f"Запрос на изменение правила {rule_key} для всех типов документов [POST]")
 
     updated_docs = []
     errors = []
@@ -90,15 +215,16 @@ def change_rule_for_all(rule_key: str, new_value: str):
             RuleService.update_rule(doc_type_enum, rule_key, new_value)
             updated_docs.append(doc_type_enum.name.lower())
             ObserveService.raise_event(EventType.LOG_INFO,
-                                       f"Правило {rule_key} для {doc_type_enum.name.lower()} обновлено на {new_value}")
+                                       lambda: f"Правило {rule_key} для {doc_type_enum.name.lower()} обновлено на {new_value}")
         except OperationException as e:
             errors.append(f"{doc_type_enum.name.lower()}: {str(e)}")
             ObserveService.raise_event(EventType.LOG_ERROR,
-                                       f"Ошибка при обновлении {rule_key} для {doc_type_enum.name.lower()}: {str(e)}")
+                                       lambda: f"Ошибка при обновлении {rule_key} для {doc_type_enum.name.lower()}: {str(e)}")
         except Exception as e:
             errors.append(f"{doc_type_enum.name.lower()}: Внутренняя ошибка")
             ObserveService.raise_event(EventType.LOG_ERROR,
-                                       f"Внутренняя ошибка сервера при обновлении {rule_key} для {doc_type_enum.name.lower()}: {str(e)}")
+                                       lambda: f"Внутренняя ошибка сервера при обновлении {rule_key} "
+                                               f"для {doc_type_enum.name.lower()}: {str(e)}")
 
     if errors:
         return {"message": "Некоторые обновления прошли с ошибками", "updated": updated_docs, "errors": errors}
@@ -106,68 +232,208 @@ def change_rule_for_all(rule_key: str, new_value: str):
 
 
 @app.post("/api/documents/validate/latex")
-def validate_document_latex(
-        tex_file: UploadFile = File(...),
-        sty_file: UploadFile = File(...),
-        doc_type: str = Form(..., description="Тип документа (выберите из: diploma, course_work, practice_report)")
+async def validate_document_latex(
+        tex_file: UploadFile = File(..., description="Файл .tex или zip-архив проекта из нескольких файлов"),
+        sty_file: UploadFile = File(None, description="Файл .sty (для архива - необязательно, берется из архива)"),
+        doc_type: str = Form(..., description="Тип документа (выберите из: diploma, course_work, practice_report)"),
+        timings: bool = Form(False, description="Добавить в ответ время выполнения этапов проверки"),
+        session_id: str = Form(None, max_length=128,
+                               description="Идентификатор документа для повторных проверок: "
+                                           "заново разбираются только измененные главы")
 ):
+    sty_name = sty_file.filename if sty_file is not None else None
     ObserveService.raise_event(EventType.LOG_DEBUG,
-                               f"Загрузка файлов {tex_file.filename} и {sty_file.filename} для проверки [POST]")
+                               lambda: f"Загрузка файлов {tex_file.filename} и {sty_name} для проверки [POST]")
 
     try:
         doc_type_enum = DocType[doc_type.upper()]
     except KeyError:
-        ObserveService.raise_event(EventType.LOG_ERROR, f"Неизвестный тип документа: {doc_type}")
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Неизвестный тип документа: {doc_type}")
         raise HTTPException(status_code=400, detail=f"Неизвестный тип документа: {doc_type}")
 
-    if not tex_file.filename.endswith(".tex"):
-        ObserveService.raise_event(EventType.LOG_ERROR, f"Ошибка: ожидался .tex файл, но получен {tex_file.filename}")
-        raise HTTPException(status_code=400, detail=f"Ожидался .tex файл, но получен: {tex_file.filename}")
-    if not sty_file.filename.endswith(".sty"):
-        ObserveService.raise_event(EventType.LOG_ERROR, f"Ошибка: ожидался .sty файл, но получен {sty_file.filename}")
+    is_project = tex_file.filename.endswith(".zip")
+    if not tex_file.filename.endswith(".tex") and not is_project:
+        ObserveService.raise_event(EventType.LOG_ERROR,
+                                   lambda: f"Ошибка: ожидался .tex файл, но получен {tex_file.filename}")
+        raise HTTPException(status_code=400, detail=f"Ожидался .tex файл или .zip, но получен: {tex_file.filename}")
+    if sty_file is None and not is_project:
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Для {tex_file.filename} не передан .sty файл")
+        raise HTTPException(status_code=400, detail="Для проверки .tex необходимо передать .sty файл в sty_file")
+    if sty_file is not None and not sty_file.filename.endswith(".sty"):
+        ObserveService.raise_event(EventType.LOG_ERROR,
+                                   lambda: f"Ошибка: ожидался .sty файл, но получен {sty_file.filename}")
         raise HTTPException(status_code=400, detail=f"Ожидался .sty файл, но получен: {sty_file.filename}")
-    if tex_file.filename.endswith(".sty") or sty_file.filename.endswith(".tex"):
+    if tex_file.filename.endswith(".sty") or (sty_name or "").endswith(".tex"):
         ObserveService.raise_event(EventType.LOG_ERROR, "Ошибка: файлы перепутаны местами")
         raise HTTPException(status_code=400,
                             detail="Файлы перепутаны местами. Загрузите .tex как tex_file и .sty как sty_file")
 
-    checker = LatexChecker(tex_file.file, sty_file.file, doc_type)
-    validation_result = checker.check_document()
-    ObserveService.raise_event(EventType.LOG_INFO, f"Файлы {tex_file.filename} и {sty_file.filename} успешно проверены")
+    tex_content = await tex_file.read()
+    sty_content = await sty_file.read() if sty_file is not None else b""
+    # Архив проверяется как проект: \input и \include подключаются, ошибки ссылаются на файл и строку
+    task = validation_tasks.validate_latex_project if is_project else validation_tasks.validate_latex
+    validation_result = await run_validation(task, tex_content, sty_content, doc_type, session_id,
+                                             cache_key=ResultCache.make_key(doc_type_enum, False, tex_content,
+                                                                            sty_content),
+                                             doc_type=doc_type, timings=timings, session_id=session_id)
+    ObserveService.raise_event(EventType.LOG_INFO,
+                               lambda: f"Файлы {tex_file.filename} и {sty_name} успешно проверены")
     return validation_result
 
 
 @app.post("/api/documents/validate/single_file")
-def validate_document_single_file(
+async def validate_document_single_file(
         file: UploadFile = File(...),
-        doc_type: str = Form(..., description="Тип документа (выберите из: diploma, course_work, practice_report)")
+        doc_type: str = Form(..., description="Тип документа (выберите из: diploma, course_work, practice_report)"),
+        fast: bool = Form(False, description="Быстрая проверка без dedoc (размер шрифта определяется по стилям)"),
+        timings: bool = Form(False, description="Добавить в ответ время выполнения этапов проверки"),
+        session_id: str = Form(None, max_length=128,
+                               description="Идентификатор документа для повторных проверок: "
+                                           "заново разбираются только измененные абзацы и таблицы")
 ):
-    ObserveService.raise_event(EventType.LOG_DEBUG, f"Загрузка файла {file.filename} для проверки [POST]")
+    ObserveService.raise_event(EventType.LOG_DEBUG, lambda: f"Загрузка файла {file.filename} для проверки [POST]")
 
     try:
         doc_type_enum = DocType[doc_type.upper()]
     except KeyError:
-        ObserveService.raise_event(EventType.LOG_ERROR, f"Неизвестный тип документа: {doc_type}")
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Неизвестный тип документа: {doc_type}")
         raise HTTPException(status_code=400, detail=f"Неизвестный тип документа: {doc_type}")
 
     # Проверяем, что файл имеет расширение .docx
     file_extension = file.filename.split(".")[-1].lower()
     if file_extension != "docx":
-        ObserveService.raise_event(EventType.LOG_ERROR, f"Неподдерживаемый формат файла: {file.filename}")
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Неподдерживаемый формат файла: {file.filename}")
         raise HTTPException(status_code=400, detail="Неподдерживаемый формат файла. Ожидается .docx")
 
-    # Сохраняем файл на диск
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as temp_file:
-        temp_file.write(file.file.read())  # Сохраняем содержимое файла
-        temp_file_path = temp_file.name  # Получаем путь к сохраненному файлу
+    content = await file.read()
+    validation_result = await run_validation(validation_tasks.validate_docx, content, doc_type, fast, session_id,
+                                             cache_key=ResultCache.make_key(doc_type_enum, fast, content),
+                                             doc_type=doc_type, timings=timings, session_id=session_id)
+    ObserveService.raise_event(EventType.LOG_INFO, lambda: f"Файл {file.filename} успешно проверен")
+    return validation_result
+
+
+@app.post("/api/documents/validate/jobs", status_code=202)
+async def create_validation_job(
+        file: UploadFile = File(..., description="Документ .docx или .tex"),
+        sty_file: UploadFile = File(None, description="Файл .sty (для .tex)"),
+        doc_type: str = Form(..., description="Тип документа (выберите из: diploma, course_work, practice_report)"),
+        fast: bool = Form(False, description="Быстрая проверка .docx без dedoc"),
+        priority: int = Form(0, description="Приоритет: задачи с большим значением выполняются раньше")
+):
+    ObserveService.raise_event(EventType.LOG_DEBUG, lambda: f"Фоновая проверка файла {file.filename} [POST]")
+
+    try:
+        doc_type_enum = DocType[doc_type.upper()]
+    except KeyError:
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Неизвестный тип документа: {doc_type}")
+        raise HTTPException(status_code=400, detail=f"Неизвестный тип документа: {doc_type}")
+
+    file_extension = file.filename.split(".")[-1].lower()
+    if file_extension == "docx":
+        content = await file.read()
+        task, args = validation_tasks.validate_docx, (content, doc_type, fast)
+        cache_key = ResultCache.make_key(doc_type_enum, fast, content)
+    elif file_extension == "tex":
+        if sty_file is None or not sty_file.filename.endswith(".sty"):
+            ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Для {file.filename} не передан .sty файл")
+            raise HTTPException(status_code=400, detail="Для проверки .tex необходимо передать .sty файл в sty_file")
+        tex_content, sty_content = await file.read(), await sty_file.read()
+        task, args = validation_tasks.validate_latex, (tex_content, sty_content, doc_type)
+        cache_key = ResultCache.make_key(doc_type_enum, False, tex_content, sty_content)
+    else:
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Неподдерживаемый формат файла: {file.filename}")
+        raise HTTPException(status_code=400, detail="Неподдерживаемый формат файла. Ожидается .docx или .tex")
 
-    # Инициализация чекера для .docx файла с путем
-    checker = DocxChecker(temp_file_path, doc_type)
+    try:
+        job = JobService.submit(file.filename, doc_type_enum, task, *args, priority=priority, cache_key=cache_key)
+    except OverloadException as e:
+        ObserveService.raise_event(EventType.LOG_ERROR, str(e))
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
 
-    validation_result = checker.check_document()
-    ObserveService.raise_event(EventType.LOG_INFO, f"Файл {file.filename} успешно проверен")
+    return {"job_id": job.id, "status": job.status.name}
 
-    # После проверки можно удалить временный файл
-    os.remove(temp_file_path)
 
-    return validation_result
+@app.get("/api/documents/validate/jobs/{job_id}")
+def validation_job_status(job_id: str):
+    job = JobService.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Задача {job_id} не найдена или ее результат уже удален")
+    return job.to_dict()
+
+
+@app.post("/api/documents/validate/batch")
+async def validate_documents_batch(
+        files: List[UploadFile] = File(None, description="Файлы .docx, .tex и .sty"),
+        archive: UploadFile = File(None, description="zip-архив с файлами .docx, .tex и .sty"),
+        doc_type: str = Form(..., description="Тип документа (выберите из: diploma, course_work, practice_report)"),
+        fast: bool = Form(False, description="Быстрая проверка .docx без dedoc"),
+        timings: bool = Form(False, description="Добавить в ответ время выполнения этапов проверки")
+):
+    ObserveService.raise_event(EventType.LOG_DEBUG, "Пакетная проверка документов [POST]")
+
+    try:
+        DocType[doc_type.upper()]
+    except KeyError:
+        ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Неизвестный тип документа: {doc_type}")
+        raise HTTPException(status_code=400, detail=f"Неизвестный тип документа: {doc_type}")
+
+    entries = [(file.filename, await file.read()) for file in files or []]
+    if archive is not None:
+        try:
+            entries += BatchService.read_archive(await archive.read())
+        except OperationException as e:
+            ObserveService.raise_event(EventType.LOG_ERROR, str(e))
+            raise HTTPException(status_code=400, detail=str(e))
+
+    tasks = BatchService.build_tasks(entries, doc_type, fast)
+    if not tasks:
+        raise HTTPException(status_code=400, detail="Не передано ни одного файла .docx или .tex")
+
+    stats = WorkerPool.get_stats()
+    if stats["active"] >= stats["queue_size"]:
+        raise HTTPException(status_code=429, detail="Очередь проверки заполнена, повторите запрос позже.",
+                            headers={"Retry-After": "1"})
+
+    # Одновременно проверяется не больше документов, чем процессов в пуле. Каждый документ занимает место
+    # в общей очереди WorkerPool.run: если ее заняли другие запросы, документ получает ошибку перегрузки
+    semaphore = asyncio.Semaphore(max(1, stats["workers"]))
+
+    async def validate(item):
+        if "error" in item:
+            return {"file": item["file"], "error": item["error"]}
+        document_format = validation_tasks.document_format(item["task"])
+        cached = ResultCache.get(item["cache_key"])
+        if cached is not None:
+            MetricsService.observe_validation(document_format, doc_type, cached, cached=True)
+            return {"file": item["file"], "result": cached}
+        async with semaphore:
+            try:
+                started = time.perf_counter()
+                result = await WorkerPool.run(item["task"], *item["args"])
+                stage_timings = TimingStats.collect(result)
+                MetricsService.observe_validation(document_format, doc_type, result, time.perf_counter() - started)
+                ResultCache.put(item["cache_key"], result)
+                if timings and stage_timings:
+                    return {"file": item["file"], "result": result, "timings": stage_timings}
+                return {"file": item["file"], "result": result}
+            except Exception as e:
+                return {"file": item["file"], "error": str(e) or type(e).__name__}
+
+    async def stream():
+        # Результаты отдаются по мере готовности, по одному JSON-объекту на строку
+        summary = {"total": len(tasks), "valid": 0, "invalid": 0, "failed": 0}
+        for completed in asyncio.as_completed([validate(item) for item in tasks]):
+            line = await completed
+            if "error" in line:
+                summary["failed"] += 1
+            elif line["result"].get("valid"):
+                summary["valid"] += 1
+            else:
+                summary["invalid"] += 1
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+        ObserveService.raise_event(EventType.LOG_INFO, lambda: f"Пакетная проверка завершена: {summary}")
+        yield json.dumps({"summary": summary}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
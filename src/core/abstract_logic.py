@@ -7,6 +7,8 @@ from src.core.validator import Validator
 class AbstractLogic(ABC):
     """Абстрактный класс для обработки логики"""
     __error_text: str = ""
+    # Обработка событий в отдельном потоке ObserveService (для медленных наблюдателей)
+    async_events: bool = False
 
     @property
     def error_text(self) -> str:
@@ -17,6 +19,11 @@ class AbstractLogic(ABC):
         Validator.validate(message, str)
         self.__error_text = message.strip()
 
+    @property
+    def subscriptions(self) -> frozenset:
+        """Типы событий, которые нужно передавать в handle_event (по умолчанию - все)"""
+        return frozenset(EventType)
+
     @property
     def is_error(self) -> bool:
         return self.error_text != ""
@@ -7,3 +7,4 @@ class EventType(Enum):
     LOG_INFO = 1
     LOG_ERROR = 2
     LOG_DEBUG = 3
+    RULES_CHANGED = 4
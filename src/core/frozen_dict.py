@@ -0,0 +1,43 @@
+from typing import Any
+
+
+class FrozenDict(dict):
+    """
+    Словарь только для чтения.
+    Используется для общих между потоками снимков данных (например, кэшированных правил),
+    чтобы один потребитель не мог изменить данные другого.
+    """
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} не поддерживает изменение")
+
+    __setitem__ = __readonly
+    __delitem__ = __readonly
+    __ior__ = __readonly
+    clear = __readonly
+    pop = __readonly
+    popitem = __readonly
+    setdefault = __readonly
+    update = __readonly
+
+    def __reduce__(self):
+        # Стандартная распаковка dict заполняет объект через __setitem__
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Рекурсивно заменяет словари на FrozenDict, а списки на кортежи"""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Изменяемая глубокая копия снимка, созданного freeze"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class JobStatus(Enum):
+    """Состояния фоновой проверки документа"""
+
+    QUEUED = 1
+    RUNNING = 2
+    DONE = 3
+    FAILED = 4
@@ -0,0 +1,60 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+
+class StageTimer:
+    """
+    Иерархический замер времени этапов проверки.
+    Этапы вкладываются друг в друга через stage(), повторный вход в этап с тем же именем
+    суммирует время. Результат - словарь {имя: {"seconds": ..., "stages": {...}}}.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.__started = time.perf_counter()
+        self.__root: Dict[str, Any] = {"seconds": 0.0, "stages": {}}
+        self.__stack = [self.__root]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        node = self.__child(name)
+        self.__stack.append(node)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            node["seconds"] += time.perf_counter() - started
+            self.__stack.pop()
+
+    def add(self, name: str, seconds: float):
+        """Добавляет время вложенного этапа, замеренное вызывающим кодом (например, в общем цикле)"""
+        self.__child(name)["seconds"] += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Дерево этапов; время корня - от создания таймера до вызова"""
+        self.__root["seconds"] = time.perf_counter() - self.__started
+        return {self.name: self.__export(self.__root)}
+
+    def __child(self, name: str) -> Dict[str, Any]:
+        stages = self.__stack[-1]["stages"]
+        if name not in stages:
+            stages[name] = {"seconds": 0.0, "stages": {}}
+        return stages[name]
+
+    @classmethod
+    def __export(cls, node: Dict[str, Any]) -> Dict[str, Any]:
+        result = {"seconds": round(node["seconds"], 6)}
+        if node["stages"]:
+            result["stages"] = {name: cls.__export(child) for name, child in node["stages"].items()}
+        return result
+
+    @staticmethod
+    def flatten(timings: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+        """Плоский словарь {"latex.check.check_lists": секунды} из результата to_dict"""
+        flat = {}
+        for name, node in timings.items():
+            path = f"{prefix}{name}"
+            flat[path] = node["seconds"]
+            flat.update(StageTimer.flatten(node.get("stages", {}), f"{path}."))
+        return flat
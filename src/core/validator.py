@@ -8,6 +8,11 @@ class OperationException(Exception):
     pass
 
 
+class OverloadException(OperationException):
+    """Исключение при переполнении очереди задач"""
+    pass
+
+
 class Validator:
     """Набор проверок данных"""
 
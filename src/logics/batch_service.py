@@ -0,0 +1,112 @@
+import threading
+import zipfile
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import List, Tuple, Dict, Any
+
+from src.core.doc_type import DocType
+from src.core.validator import OperationException, Validator
+from src.logics import validation_tasks
+from src.logics.result_cache import ResultCache
+
+
+class BatchService:
+    """Подготовка пакетной проверки: разбор архива и сопоставление .tex и .sty файлов"""
+
+    SUPPORTED_EXTENSIONS = (".docx", ".tex", ".sty")
+
+    __lock = threading.Lock()
+    __max_files: int = 200
+    __max_file_bytes: int = 50 * 1024 * 1024
+    __max_total_bytes: int = 200 * 1024 * 1024
+
+    @classmethod
+    def configure(cls, max_files: int, max_file_bytes: int, max_total_bytes: int):
+        """Ограничения zip-архива: количество файлов, размер файла и суммарный размер после распаковки"""
+        Validator.validate(max_files, int)
+        Validator.validate(max_file_bytes, int)
+        Validator.validate(max_total_bytes, int)
+        with cls.__lock:
+            cls.__max_files = max(1, max_files)
+            cls.__max_file_bytes = max(1, max_file_bytes)
+            cls.__max_total_bytes = max(1, max_total_bytes)
+
+    @classmethod
+    def read_archive(cls, content: bytes) -> List[Tuple[str, bytes]]:
+        """
+        Файлы .docx, .tex и .sty из zip-архива (служебные каталоги пропускаются).
+        Размеры проверяются по оглавлению архива до распаковки; при превышении ограничений - OperationException
+        """
+        try:
+            archive = zipfile.ZipFile(BytesIO(content))
+        except zipfile.BadZipFile as ex:
+            raise OperationException(f"Некорректный zip-архив: {ex}")
+
+        with cls.__lock:
+            max_files, max_file_bytes, max_total_bytes = cls.__max_files, cls.__max_file_bytes, cls.__max_total_bytes
+
+        with archive:
+            selected = []
+            total = 0
+            for info in archive.infolist():
+                path = PurePosixPath(info.filename)
+                if info.is_dir() or "__MACOSX" in path.parts or path.name.startswith("."):
+                    continue
+                if path.suffix.lower() not in cls.SUPPORTED_EXTENSIONS:
+                    continue
+                if len(selected) >= max_files:
+                    raise OperationException(f"В архиве больше {max_files} файлов .docx, .tex и .sty")
+                if info.file_size > max_file_bytes:
+                    raise OperationException(f"Файл {info.filename} в архиве больше допустимого размера "
+                                             f"({max_file_bytes // (1024 * 1024)} МБ)")
+                total += info.file_size
+                if total > max_total_bytes:
+                    raise OperationException(f"Суммарный размер файлов в архиве больше допустимого "
+                                             f"({max_total_bytes // (1024 * 1024)} МБ)")
+                selected.append(info)
+
+            # zipfile не распаковывает больше заявленного в оглавлении размера файла
+            return [(info.filename, archive.read(info)) for info in selected]
+
+    @staticmethod
+    def find_sty(tex_name: str, sty_files: Dict[str, bytes]):
+        """
+        .sty для .tex: файл с тем же именем в том же каталоге, иначе единственный .sty в каталоге,
+        иначе единственный .sty в пакете
+        """
+        tex_path = PurePosixPath(tex_name)
+        same_name = str(tex_path.with_suffix(".sty"))
+        if same_name in sty_files:
+            return sty_files[same_name]
+
+        same_dir = [name for name in sty_files if PurePosixPath(name).parent == tex_path.parent]
+        if len(same_dir) == 1:
+            return sty_files[same_dir[0]]
+        if len(sty_files) == 1:
+            return next(iter(sty_files.values()))
+        return None
+
+    @staticmethod
+    def build_tasks(entries: List[Tuple[str, bytes]], doc_type: str, fast: bool = False) -> List[Dict[str, Any]]:
+        """
+        Задачи проверки для файлов пакета.
+        Каждая задача - словарь с ключами file, task, args и cache_key; если файл нельзя проверить - с ключом error.
+        """
+        doc_type_enum = DocType[doc_type.upper()]
+        sty_files = {name: content for name, content in entries if name.lower().endswith(".sty")}
+
+        tasks = []
+        for name, content in entries:
+            extension = PurePosixPath(name).suffix.lower()
+            if extension == ".docx":
+                tasks.append({"file": name, "task": validation_tasks.validate_docx, "args": (content, doc_type, fast),
+                              "cache_key": ResultCache.make_key(doc_type_enum, fast, content)})
+            elif extension == ".tex":
+                sty_content = BatchService.find_sty(name, sty_files)
+                if sty_content is None:
+                    tasks.append({"file": name, "error": "Не найден .sty файл для проверки"})
+                else:
+                    tasks.append({"file": name, "task": validation_tasks.validate_latex,
+                                  "args": (content, sty_content, doc_type),
+                                  "cache_key": ResultCache.make_key(doc_type_enum, False, content, sty_content)})
+        return tasks
@@ -1,18 +1,41 @@
-import re
 from typing import Dict, Any
 
 from src.core.doc_type import DocType
+from src.core.stage_timer import StageTimer
+from src.logics.parsers import patterns
+from src.logics.parsers.docx_context import DocxContext
 from src.logics.parsers.docx_parser import DocxParser
+from src.logics.parsers.incremental_docx_parser import IncrementalDocxParser
+from src.logics.parsers.streaming_docx_parser import StreamingDocxParser
 from src.logics.rule_service import RuleService
 
 
 class DocxChecker:
-    def __init__(self, docx_file_path, doc_type: str, deduplicate_errors: bool = True):
-        parser = DocxParser(docx_file_path)
+    def __init__(self, docx_file, doc_type: str, deduplicate_errors: bool = True, fast: bool = False,
+                 timings: bool = False, error_stats: bool = False, session_id: str = None):
+        # docx_file - путь, байты или файловый объект; документ разбирается в памяти без временных файлов.
+        # В быстром режиме dedoc не используется, размеры шрифта берутся из стилей документа.
+        # timings - добавить в результат check_document замеры времени этапов,
+        # error_stats - количество ошибок по каждой проверке (check_errors),
+        # session_id - повторная проверка документа: неизмененные абзацы и таблицы берутся из кэша сессии.
+        # Большие документы (порог - StreamingThreshold.configure) разбираются потоково
+        self.timings = timings
+        self.error_stats = error_stats
+        self.timer = StageTimer("docx")
+        with self.timer.stage("read"):
+            context = docx_file if isinstance(docx_file, DocxContext) else DocxContext(docx_file)
+        if session_id:
+            parser = IncrementalDocxParser(context, use_dedoc=not fast, timer=self.timer, session_id=session_id)
+        elif StreamingDocxParser.suits(context):
+            parser = StreamingDocxParser(context, use_dedoc=not fast, timer=self.timer)
+        else:
+            parser = DocxParser(context, use_dedoc=not fast, timer=self.timer)
+        self.fast = fast
         self.parsed_document = parser.parsed_document
         self.serialized_document = parser.serialised_document
         self.errors = []
-        self.rules = RuleService.load_rules(DocType[doc_type.upper()])
+        with self.timer.stage("load_rules"):
+            self.rules = RuleService.load_rules(DocType[doc_type.upper()])
 
         self.deduplicate_errors = deduplicate_errors
         self._error_set = set() if deduplicate_errors else None
@@ -26,15 +49,28 @@ class DocxChecker:
             self.errors.append(message)
 
     def check_document(self) -> Dict[str, Any]:
-        self.check_structure()
-        self.check_intro_keywords()
-        self.check_pictures()
-        self.check_tables()
-        self.check_appendices()
-        self.check_bibliography()
-        self.check_font_size()
-        return {"valid": not bool(self.errors), "found": self.short_parsed_document(self.parsed_document),
-                "errors": self.errors}
+        checks = (self.check_structure, self.check_intro_keywords, self.check_pictures, self.check_tables,
+                  self.check_appendices, self.check_bibliography, self.check_font_size)
+        # Проверка, добавившая ошибку
+        origins = {}
+        with self.timer.stage("check"):
+            for check in checks:
+                with self.timer.stage(check.__name__):
+                    check()
+                for message in self.errors:
+                    origins.setdefault(message, check.__name__)
+
+        check_errors = dict.fromkeys([check.__name__ for check in checks], 0)
+        for message in self.errors:
+            check_errors[origins[message]] += 1
+
+        result = {"valid": not bool(self.errors), "found": self.short_parsed_document(self.parsed_document),
+                  "errors": self.errors}
+        if self.timings:
+            result["timings"] = self.timer.to_dict()
+        if self.error_stats:
+            result["check_errors"] = check_errors
+        return result
 
     def check_structure(self) -> None:
         structure = self.parsed_document["structure"]
@@ -142,7 +178,8 @@ class DocxChecker:
         references = biblio.get("references_in_text", [])
         bibliography_items = biblio.get("bibliography", [])
 
-        ref_nums = set(int(re.sub(r"[^\d]", "", ref)) for ref in references if re.sub(r"[^\d]", "", ref).isdigit())
+        ref_digits = [patterns.DOCX_NON_DIGITS.sub("", ref) for ref in references]
+        ref_nums = set(int(digits) for digits in ref_digits if digits.isdigit())
         biblio_nums = set(item["number"] for item in bibliography_items)
 
         # Ссылки без источников
@@ -178,6 +215,10 @@ class DocxChecker:
     def check_font_size(self):
         expected_size = str(self.rules["common_rules"]["font_size"])
 
+        if self.serialized_document is None:
+            self.check_font_size_fast(expected_size)
+            return
+
         def recursive_check(paragraph, skip_subs_if_title=False):
             text = paragraph.get("text", "")
             annotations = paragraph.get("annotations", [])
@@ -202,6 +243,16 @@ class DocxChecker:
         root = self.serialized_document["content"]["structure"]
         recursive_check(root)
 
+    def check_font_size_fast(self, expected_size: str):
+        """Проверка размера шрифта по размерам, вычисленным из стилей OOXML (без dedoc)"""
+        for paragraph in self.parsed_document.get("font_sizes", []):
+            text = paragraph["text"]
+            for actual_size in paragraph["sizes"]:
+                if actual_size != expected_size:
+                    self.add_error(
+                        f"Неверный размер шрифта: '{text[:30]}...' (ожидается {expected_size}, найдено {actual_size})"
+                    )
+
     def short_parsed_document(self, parsed_document: dict) -> dict:
         def truncate(text, length=20):
             return text[:length] + ('...' if len(text) > length else '')
@@ -1,23 +1,60 @@
-import os
-import re
+import time
+from io import BytesIO
 from typing import Dict, Any
 
 from src.core.doc_type import DocType
+from src.core.stage_timer import StageTimer
+from src.logics.parsers import patterns
+from src.logics.parsers.incremental_latex_parser import IncrementalLatexParser
 from src.logics.parsers.latex_parser import LatexParser
+from src.logics.parsers.latex_project import LatexProject, SourceMap
 from src.logics.rule_service import RuleService
+from src.logics.sty_reference import StyReference
 
 
 class LatexChecker:
-    def __init__(self, tex_file, sty_file, doc_type: str, deduplicate_errors: bool = True):
-        parser = LatexParser(tex_file)
+    def __init__(self, tex_file, sty_file, doc_type: str, deduplicate_errors: bool = True, timings: bool = False,
+                 error_stats: bool = False, source_map: SourceMap = None, session_id: str = None):
+        # timings - добавить в результат check_document замеры времени этапов,
+        # error_stats - количество ошибок по каждой проверке (check_errors),
+        # source_map - карта позиций для проекта из нескольких файлов (см. from_project),
+        # session_id - повторная проверка документа: неизмененные главы берутся из кэша сессии
+        self.timings = timings
+        self.error_stats = error_stats
+        self.timer = StageTimer("latex")
+        if session_id:
+            parser = IncrementalLatexParser(tex_file, self.timer, source_map, session_id)
+        else:
+            parser = LatexParser(tex_file, self.timer, source_map)
         self.parsed_document = parser.parsed_document
         self.errors = parser.errors
-        self.rules = RuleService.load_rules(DocType[doc_type.upper()])
-        self.sty_file = self.sty_content = sty_file.read().decode("utf-8").splitlines() if sty_file else []
+        with self.timer.stage("load_rules"):
+            self.rules = RuleService.load_rules(DocType[doc_type.upper()])
+            self.sty_bytes = sty_file.read() if sty_file else b""
+            self.sty_file = self.sty_content = self.sty_bytes.decode("utf-8").splitlines()
 
         self.deduplicate_errors = deduplicate_errors
         self._error_set = set() if deduplicate_errors else None
 
+    @classmethod
+    def from_project(cls, project: LatexProject, sty_file, doc_type: str, **kwargs) -> "LatexChecker":
+        """
+        Проверка проекта из нескольких файлов: подключенные файлы собираются в один текст,
+        ошибки оформления ссылаются на исходный файл и строку. Если sty_file не передан,
+        используется .sty из проекта.
+        """
+        started = time.perf_counter()
+        text, source_map, project_errors = project.expand()
+        expand_seconds = time.perf_counter() - started
+        if sty_file is None:
+            sty_file = BytesIO(project.find_sty() or b"")
+
+        checker = cls(BytesIO(text.encode("utf-8")), sty_file, doc_type, source_map=source_map, **kwargs)
+        checker.timer.add("project", expand_seconds)
+        for message in project_errors:
+            checker.add_error(message)
+        return checker
+
     def add_error(self, message: str):
         if self.deduplicate_errors:
             if message not in self._error_set:
@@ -27,18 +64,30 @@ class LatexChecker:
             self.errors.append(message)
 
     def check_document(self) -> Dict[str, Any]:
-        self.check_structure()
-        self.check_introduction_keywords()
-        self.check_sty_file()
-        self.check_lists()
-        self.check_pictures()
-        self.check_tables()
-        self.check_appendices()
-        self.check_bibliography()
-
-        return {"valid": not bool(self.errors),
-                "found": self.short_parsed_document(self.parsed_document),
-                "errors": self.errors}
+        # Проверка, добавившая ошибку; ошибки разбора документа учитываются как parser_checks
+        checks = (self.check_structure, self.check_introduction_keywords, self.check_sty_file, self.check_lists,
+                  self.check_pictures, self.check_tables, self.check_appendices, self.check_bibliography)
+        origins = dict.fromkeys(self.errors, "parser_checks")
+        with self.timer.stage("check"):
+            for check in checks:
+                with self.timer.stage(check.__name__):
+                    check()
+                for message in self.errors:
+                    origins.setdefault(message, check.__name__)
+
+        # Считаются только оставшиеся ошибки: check_appendices может снять ошибку check_structure
+        check_errors = dict.fromkeys(["parser_checks"] + [check.__name__ for check in checks], 0)
+        for message in self.errors:
+            check_errors[origins[message]] += 1
+
+        result = {"valid": not bool(self.errors),
+                  "found": self.short_parsed_document(self.parsed_document),
+                  "errors": self.errors}
+        if self.timings:
+            result["timings"] = self.timer.to_dict()
+        if self.error_stats:
+            result["check_errors"] = check_errors
+        return result
 
     def check_structure(self):
         required_chapters = self.rules["structure_rules"].get("required_chapters", [])
@@ -85,48 +134,18 @@ class LatexChecker:
                     f"Отсутствует ключевое слово во введении, которое должно быть выделено командой жирности {{\\bf}}: {keyword}")
 
     def check_sty_file(self):
-        rules_dir = os.path.join(os.path.dirname(__file__), "../../..", "docs")
-        reference_sty_path = os.path.join(rules_dir, "settings.sty")
-
-        try:
-            with open(reference_sty_path, "r", encoding="utf-8") as ref_file:
-                reference_lines = ref_file.readlines()
-        except FileNotFoundError:
-            #self.add_error("Файл settings.sty не найден в папке docs.")
+        # Эталон docs/settings.sty загружается один раз, результат сравнения кэшируется по хэшу файла
+        errors = StyReference.compare(self.sty_bytes)
+        if errors is None:
+            # Без эталона проверка не выполняется
             return
 
-        uploaded_lines = self.sty_content
-
-        if not uploaded_lines:
+        if not self.sty_content:
             self.add_error("Файл settings.sty не был загружен или пуст.")
             return
 
-        def remove_comments_and_empty_lines(lines):
-            cleaned_lines = []
-            for line in lines:
-                line = line.split('%', 1)[0].strip()
-                if line:
-                    cleaned_lines.append(line)
-            return cleaned_lines
-
-        reference_lines = remove_comments_and_empty_lines(reference_lines)
-        uploaded_lines = remove_comments_and_empty_lines(uploaded_lines)
-
-        for i, (ref_line, uploaded_line) in enumerate(zip(reference_lines, uploaded_lines), start=1):
-            if ref_line.strip() != uploaded_line.strip():
-                self.add_error(
-                    f"Несовпадение в settings.sty: ожидалось '{ref_line.strip()}', получено '{uploaded_line.strip()}'"
-                )
-                break
-
-        if len(uploaded_lines) < len(reference_lines):
-            self.add_error(
-                f"Файл settings.sty содержит только {len(uploaded_lines)} строк, ожидалось {len(reference_lines)}."
-            )
-        elif len(uploaded_lines) > len(reference_lines):
-            self.add_error(
-                f"Файл settings.sty содержит {len(uploaded_lines)} строк, что больше ожидаемых {len(reference_lines)}."
-            )
+        for error in errors:
+            self.add_error(error)
 
     @staticmethod
     def short(item: str, max_len: int = 60) -> str:
@@ -138,26 +157,26 @@ class LatexChecker:
 
         for list_type, entries in lists.items():
             for full_list in entries:
-                is_nested = bool(re.search(r"\\begin\{enum[a-z]+\}.*?\\begin\{enum[a-z]+\}", full_list, re.DOTALL))
+                is_nested = bool(patterns.LATEX_NESTED_LIST.search(full_list))
                 if is_nested:
                     self.check_nested_list(full_list)
                 else:
                     self.check_regular_list(full_list)
 
     def check_regular_list(self, content: str):
-        match_before = re.search(r"(.+?)\\begin\{enum[a-z]+\}", content, re.DOTALL)
+        match_before = patterns.LATEX_LIST_BEFORE.search(content)
         intro = match_before.group(1).strip() if match_before else ""
-        items = re.findall(r"\\item (.+?)(?=(\\item|\\end\{))", content, re.DOTALL)
+        items = patterns.LATEX_LIST_ITEM.findall(content)
         items = [item[0].strip() for item in items]
 
         if not items:
             return
 
         # Удаляем LaTeX-команды и внешние скобки, чтобы определить, чем заканчивается вводная часть
-        clean_intro = re.sub(r"{\\bf\s+([^}]+)}", r"\1", intro)  # {\bf ...} → ...
-        clean_intro = re.sub(r"\\textbf\{([^}]+)\}", r"\1", clean_intro)  # \textbf{...} → ...
-        clean_intro = re.sub(r"\\[a-zA-Z]+\s*", "", clean_intro)  # удалить остальные команды
-        clean_intro = re.sub(r"{|}", "", clean_intro).strip()
+        clean_intro = patterns.LATEX_BF_GROUP_NONEMPTY.sub(r"\1", intro)  # {\bf ...} → ...
+        clean_intro = patterns.LATEX_TEXTBF_GROUP_NONEMPTY.sub(r"\1", clean_intro)  # \textbf{...} → ...
+        clean_intro = patterns.LATEX_COMMAND.sub("", clean_intro)  # удалить остальные команды
+        clean_intro = patterns.LATEX_BRACES.sub("", clean_intro).strip()
 
         intro_end = clean_intro[-1] if clean_intro else ""
 
@@ -185,15 +204,15 @@ class LatexChecker:
                     f"Вводная часть перед списком должна заканчиваться ':' или '.' --> '{self.short(intro)}'")
 
     def check_nested_list(self, content: str):
-        top_items = re.split(r"\\item", content)
+        top_items = patterns.LATEX_ITEM.split(content)
         for i, top in enumerate(top_items[1:]):
             top = top.strip()
 
             # Очистка от \bf, \textbf, других команд и фигурных скобок
-            clean_top = re.sub(r"{\\bf\s+([^}]+)}", r"\1", top)
-            clean_top = re.sub(r"\\textbf\{([^}]+)\}", r"\1", clean_top)
-            clean_top = re.sub(r"\\[a-zA-Z]+\s*", "", clean_top)
-            clean_top = re.sub(r"{|}", "", clean_top).strip()
+            clean_top = patterns.LATEX_BF_GROUP_NONEMPTY.sub(r"\1", top)
+            clean_top = patterns.LATEX_TEXTBF_GROUP_NONEMPTY.sub(r"\1", clean_top)
+            clean_top = patterns.LATEX_COMMAND.sub("", clean_top)
+            clean_top = patterns.LATEX_BRACES.sub("", clean_top).strip()
 
             # Проверка окончания верхнего уровня
             if not clean_top.endswith(":"):
@@ -204,7 +223,7 @@ class LatexChecker:
                 continue
 
             # Извлечение вложенных пунктов
-            nested_items = re.findall(r"\\item (.+?)(?=(\\item|\\end\{))", top, re.DOTALL)
+            nested_items = patterns.LATEX_LIST_ITEM.findall(top)
             nested_items = [item[0].strip() for item in nested_items]
 
             for j, subitem in enumerate(nested_items):
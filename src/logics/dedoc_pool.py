@@ -0,0 +1,99 @@
+import threading
+from contextlib import contextmanager
+from queue import Queue, Empty
+
+from src.core.validator import Validator
+
+
+class DedocPool:
+    """
+    Общий для процесса пул прогретых экземпляров DedocManager.
+    Создание DedocManager загружает ридеры и модели dedoc, поэтому менеджеры
+    создаются один раз и выдаются на время разбора документа.
+    Сам dedoc (и torch) импортируется только при создании первого менеджера.
+    """
+    __managers: Queue = Queue()
+    __lock = threading.Lock()
+    __max_size: int = 2
+    __created: int = 0
+    __warm_parses: int = 0
+    __cold_parses: int = 0
+
+    @classmethod
+    def configure(cls, size: int):
+        """Задает максимальное количество менеджеров в пуле"""
+        Validator.validate(size, int)
+        with cls.__lock:
+            cls.__max_size = max(1, size)
+
+    @classmethod
+    def warm_up(cls, size: int = None):
+        """Заранее создает менеджеры, чтобы первые запросы не ждали загрузки dedoc"""
+        if size is not None:
+            cls.configure(size)
+
+        while True:
+            with cls.__lock:
+                if cls.__created >= cls.__max_size:
+                    return
+                cls.__created += 1
+            try:
+                cls.__managers.put(cls._create_manager())
+            except Exception:
+                with cls.__lock:
+                    cls.__created -= 1
+                raise
+
+    @staticmethod
+    def _create_manager():
+        from dedoc import DedocManager
+        return DedocManager()
+
+    @classmethod
+    @contextmanager
+    def acquire(cls):
+        """Выдает менеджер из пула и возвращает его обратно после использования"""
+        manager = None
+        cold = False
+        try:
+            manager = cls.__managers.get_nowait()
+        except Empty:
+            with cls.__lock:
+                cold = cls.__created < cls.__max_size
+                if cold:
+                    cls.__created += 1
+            if cold:
+                try:
+                    manager = cls._create_manager()
+                except Exception:
+                    with cls.__lock:
+                        cls.__created -= 1
+                    raise
+            else:
+                # Все менеджеры заняты - ждем освобождения одного из них
+                manager = cls.__managers.get()
+
+        with cls.__lock:
+            if cold:
+                cls.__cold_parses += 1
+            else:
+                cls.__warm_parses += 1
+
+        try:
+            yield manager
+        finally:
+            cls.__managers.put(manager)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Состояние пула: размер, занятость и количество прогретых/холодных разборов"""
+        with cls.__lock:
+            idle = cls.__managers.qsize()
+            return {
+                "max_size": cls.__max_size,
+                "created": cls.__created,
+                "idle": idle,
+                "in_use": cls.__created - idle,
+                "warm_parses": cls.__warm_parses,
+                "cold_parses": cls.__cold_parses,
+            }
@@ -16,5 +16,10 @@ class DocService(AbstractLogic):
     def set_exception(self, ex: Exception):
         super().set_exception(ex)
 
+    @property
+    def subscriptions(self) -> frozenset:
+        # События сервису не нужны
+        return frozenset()
+
     def handle_event(self, event_type: EventType, params):
         super().handle_event(event_type, params)
\ No newline at end of file
@@ -0,0 +1,181 @@
+import itertools
+import threading
+import time
+from collections import deque
+from queue import PriorityQueue
+from typing import Dict, Optional
+
+from src.core.abstract_logic import AbstractLogic
+from src.core.doc_type import DocType
+from src.core.event_type import EventType
+from src.core.job_status import JobStatus
+from src.core.validator import Validator, OverloadException
+from src.logics.observe_service import ObserveService
+from src.logics import validation_tasks
+from src.logics.metrics_service import MetricsService
+from src.logics.result_cache import ResultCache
+from src.logics.timing_stats import TimingStats
+from src.logics.worker_pool import WorkerPool
+from src.models.validation_job import ValidationJob
+
+
+class JobService(AbstractLogic):
+    """
+    Фоновые проверки документов.
+    Задачи ставятся в очередь с приоритетом и выполняются потоками-планировщиками
+    в пуле процессов WorkerPool. Завершенные задачи хранятся result_ttl секунд;
+    если завершенных задач больше max_finished, самые старые удаляются раньше.
+    """
+    __jobs: Dict[str, ValidationJob] = {}
+    __tasks: PriorityQueue = PriorityQueue()
+    __expirations: deque = deque()  # (время удаления, id задачи) в порядке завершения
+    __sequence = itertools.count()  # порядок постановки для задач с одинаковым приоритетом
+    __lock = threading.Lock()
+    __workers: list = []
+    __max_workers: int = 2
+    __max_queue: int = 100
+    __result_ttl: int = 3600
+    __max_finished: int = 1000
+    __queued: int = 0
+
+    def __init__(self):
+        ObserveService.append(self)
+
+    @classmethod
+    def configure(cls, workers: int, queue_size: int, result_ttl: int, max_finished: int = 1000):
+        """
+        Задает количество планировщиков, размер очереди, время хранения результатов (в секундах)
+        и максимальное количество хранимых завершенных задач
+        """
+        Validator.validate(workers, int)
+        Validator.validate(queue_size, int)
+        Validator.validate(result_ttl, int)
+        Validator.validate(max_finished, int)
+        with cls.__lock:
+            cls.__max_workers = max(1, workers)
+            cls.__max_queue = max(1, queue_size)
+            cls.__result_ttl = max(0, result_ttl)
+            cls.__max_finished = max(1, max_finished)
+            cls.__evict_expired()
+
+    @classmethod
+    def submit(cls, name: str, doc_type: DocType, func, *args, priority: int = 0, cache_key: str = None) -> ValidationJob:
+        """
+        Ставит проверку func(*args) в очередь и возвращает задачу.
+        Если результат для cache_key уже есть в ResultCache, задача сразу завершается.
+        """
+        job = ValidationJob()
+        job.name = name
+        job.doc_type = doc_type
+        job.priority = priority
+
+        cached = ResultCache.get(cache_key) if cache_key else None
+        if cached is not None:
+            MetricsService.observe_validation(validation_tasks.document_format(func), doc_type.name, cached,
+                                              cached=True)
+            job.result = cached
+            job.status = JobStatus.DONE
+            with cls.__lock:
+                cls.__evict_expired()
+                cls.__jobs[job.id] = job
+                cls.__expirations.append((time.monotonic() + cls.__result_ttl, job.id))
+                cls.__evict_expired()
+            return job
+
+        with cls.__lock:
+            cls.__evict_expired()
+            if cls.__queued >= cls.__max_queue:
+                raise OverloadException(f"Очередь фоновых проверок заполнена ({cls.__max_queue} задач).")
+            cls.__queued += 1
+            cls.__jobs[job.id] = job
+            cls.__start_workers()
+
+        # Большее значение приоритета - раньше в очереди
+        cls.__tasks.put((-priority, next(cls.__sequence), job.id, func, args, cache_key))
+        ObserveService.raise_event(EventType.LOG_DEBUG, lambda: f"Фоновая проверка {job} поставлена в очередь")
+        return job
+
+    @classmethod
+    def get_job(cls, job_id: str) -> Optional[ValidationJob]:
+        """Задача по идентификатору или None, если ее нет или результат уже удален"""
+        with cls.__lock:
+            cls.__evict_expired()
+            return cls.__jobs.get(job_id)
+
+    @classmethod
+    def __start_workers(cls):
+        cls.__workers = [worker for worker in cls.__workers if worker.is_alive()]
+        while len(cls.__workers) < cls.__max_workers:
+            worker = threading.Thread(target=cls.__work, name=f"job-worker-{len(cls.__workers)}", daemon=True)
+            worker.start()
+            cls.__workers.append(worker)
+
+    @classmethod
+    def __work(cls):
+        while True:
+            _, _, job_id, func, args, cache_key = cls.__tasks.get()
+            with cls.__lock:
+                cls.__queued -= 1
+                job = cls.__jobs.get(job_id)
+            if job is None:
+                continue
+
+            job.status = JobStatus.RUNNING
+            try:
+                started = time.perf_counter()
+                result = WorkerPool.execute(func, *args)
+                # Служебные ключи процесса проверки извлекаются до публикации результата:
+                # get_job из другого потока не должен видеть их или изменяемый словарь
+                TimingStats.collect(result)
+                MetricsService.observe_validation(validation_tasks.document_format(func), job.doc_type.name,
+                                                  result, time.perf_counter() - started)
+                if cache_key:
+                    ResultCache.put(cache_key, result)
+                job.result = result
+                job.status = JobStatus.DONE
+                ObserveService.raise_event(EventType.LOG_INFO,
+                                           lambda: f"Фоновая проверка {job.name} ({job.id}) завершена")
+            except Exception as ex:
+                job.error = str(ex) or type(ex).__name__
+                job.status = JobStatus.FAILED
+                ObserveService.raise_event(EventType.LOG_ERROR,
+                                           lambda: f"Ошибка фоновой проверки {job.name} ({job.id}): {job.error}")
+
+            with cls.__lock:
+                cls.__expirations.append((time.monotonic() + cls.__result_ttl, job_id))
+                cls.__evict_expired()
+
+    @classmethod
+    def __evict_expired(cls):
+        """
+        Удаляет завершенные задачи с истекшим временем хранения и самые старые задачи сверх max_finished
+        (вызывается под блокировкой)
+        """
+        now = time.monotonic()
+        while cls.__expirations and (cls.__expirations[0][0] <= now or len(cls.__expirations) > cls.__max_finished):
+            _, job_id = cls.__expirations.popleft()
+            cls.__jobs.pop(job_id, None)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Состояние очереди: количество ожидающих, выполняемых и хранимых задач"""
+        with cls.__lock:
+            cls.__evict_expired()
+            running = sum(1 for job in cls.__jobs.values() if job.status == JobStatus.RUNNING)
+            return {
+                "workers": cls.__max_workers,
+                "queued": cls.__queued,
+                "running": running,
+                "stored": len(cls.__jobs),
+            }
+
+    def set_exception(self, ex: Exception):
+        super().set_exception(ex)
+
+    @property
+    def subscriptions(self) -> frozenset:
+        # События сервису не нужны
+        return frozenset()
+
+    def handle_event(self, event_type: EventType, params):
+        super().handle_event(event_type, params)
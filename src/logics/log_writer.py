@@ -0,0 +1,199 @@
+import atexit
+import calendar
+import os
+import threading
+import time
+from queue import Queue, Empty, Full
+from typing import List, Optional
+
+from src.core.validator import Validator
+
+# Признак остановки фонового потока записи
+_STOP = object()
+
+
+class LogWriter:
+    """
+    Фоновая запись журнала.
+    Сообщения ставятся в ограниченную очередь без ожидания; поток записи забирает их пачками
+    и дописывает в файл за одно открытие. Если очередь заполнена, сообщение отбрасывается
+    и учитывается в счетчике dropped. Файл ротируется по размеру и по времени:
+    application.log -> application.log.1 -> ... -> application.log.<backup_count>.
+    Ротация по времени выполняется на границах интервалов местного времени (для 24 часов - в полночь):
+    интервал содержимого файла определяется по времени его последнего изменения, поэтому
+    перезапуск процесса не откладывает ротацию.
+    """
+    __queue: Queue = Queue(maxsize=10000)
+    __lock = threading.Lock()
+    __thread: Optional[threading.Thread] = None
+    __file_path: str = "application.log"
+    __max_bytes: int = 10 * 1024 * 1024
+    __rotate_interval: int = 24 * 3600
+    __backup_count: int = 5
+    __flush_interval: float = 0.5
+    __batch_size: int = 500
+    __written: int = 0
+    __dropped: int = 0
+    __failed: int = 0
+    __rotations: int = 0
+
+    @classmethod
+    def configure(cls, file_path: str, queue_size: int, max_bytes: int, rotate_interval: int, backup_count: int,
+                  flush_interval: float = 0.5):
+        """
+        Задает файл журнала, размер очереди и параметры ротации.
+        max_bytes и rotate_interval (в секундах) равные 0 отключают соответствующую ротацию.
+        """
+        Validator.validate(file_path, str)
+        Validator.validate(queue_size, int)
+        Validator.validate(max_bytes, int)
+        Validator.validate(rotate_interval, int)
+        Validator.validate(backup_count, int)
+        with cls.__lock:
+            cls.__file_path = file_path
+            cls.__queue.maxsize = max(1, queue_size)
+            cls.__max_bytes = max(0, max_bytes)
+            cls.__rotate_interval = max(0, rotate_interval)
+            cls.__backup_count = max(0, backup_count)
+            cls.__flush_interval = max(0.01, flush_interval)
+
+    @classmethod
+    def write(cls, message: str):
+        """Ставит сообщение в очередь записи; не блокирует вызывающий поток"""
+        cls.__start()
+        try:
+            cls.__queue.put_nowait(message)
+        except Full:
+            with cls.__lock:
+                cls.__dropped += 1
+
+    @classmethod
+    def flush(cls):
+        """Ожидает записи всех сообщений, поставленных в очередь"""
+        if cls.__thread is not None and cls.__thread.is_alive():
+            cls.__queue.join()
+
+    @classmethod
+    def shutdown(cls, timeout: float = 5.0):
+        """Дописывает очередь и останавливает поток записи"""
+        with cls.__lock:
+            thread, cls.__thread = cls.__thread, None
+        if thread is None or not thread.is_alive():
+            return
+        cls.__queue.put(_STOP)
+        thread.join(timeout)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Состояние журнала: длина очереди, записанные, отброшенные и не записанные сообщения, число ротаций"""
+        with cls.__lock:
+            return {
+                "queued": cls.__queue.qsize(),
+                "written": cls.__written,
+                "dropped": cls.__dropped,
+                "failed": cls.__failed,
+                "rotations": cls.__rotations,
+            }
+
+    @classmethod
+    def __start(cls):
+        if cls.__thread is not None and cls.__thread.is_alive():
+            return
+        with cls.__lock:
+            if cls.__thread is not None and cls.__thread.is_alive():
+                return
+            cls.__thread = threading.Thread(target=cls.__run, name="log-writer", daemon=True)
+            cls.__thread.start()
+
+    @classmethod
+    def __run(cls):
+        while True:
+            try:
+                batch = [cls.__queue.get(timeout=cls.__flush_interval)]
+            except Empty:
+                continue
+            while len(batch) < cls.__batch_size:
+                try:
+                    batch.append(cls.__queue.get_nowait())
+                except Empty:
+                    break
+
+            messages = [message for message in batch if message is not _STOP]
+            if messages:
+                cls.__write_batch(messages)
+            for _ in batch:
+                cls.__queue.task_done()
+            if len(messages) != len(batch):
+                return
+
+    @classmethod
+    def __write_batch(cls, messages: List[str]):
+        try:
+            try:
+                stat = os.stat(cls.__file_path)
+                size, modified = stat.st_size, stat.st_mtime
+            except FileNotFoundError:
+                size, modified = 0, time.time()
+
+            # Пачка делится на части, если файл нужно ротировать посреди нее
+            lines = []
+            for message in messages:
+                line = message + "\n"
+                length = len(line.encode("utf-8"))
+                if size > 0 and cls.__needs_rotation(size + length, modified):
+                    cls.__append(lines)
+                    cls.__rotate()
+                    lines, size = [], 0
+                modified = time.time()
+                lines.append(line)
+                size += length
+            cls.__append(lines)
+
+            with cls.__lock:
+                cls.__written += len(messages)
+        except OSError as ex:
+            # Запись идет в фоне, поэтому ошибка не может быть передана вызывающему коду
+            with cls.__lock:
+                cls.__failed += len(messages)
+            print(f"Ошибка записи журнала: {ex}")
+
+    @classmethod
+    def __append(cls, lines: List[str]):
+        if lines:
+            with open(cls.__file_path, "a", encoding="utf-8") as log_file:
+                log_file.write("".join(lines))
+
+    @classmethod
+    def __needs_rotation(cls, size: int, modified: float) -> bool:
+        if cls.__max_bytes and size > cls.__max_bytes:
+            return True
+        return bool(cls.__rotate_interval) and cls.__interval(modified) != cls.__interval(time.time())
+
+    @classmethod
+    def __interval(cls, timestamp: float) -> int:
+        """Номер интервала ротации, в который попадает момент timestamp (по местному времени)"""
+        return calendar.timegm(time.localtime(timestamp)) // cls.__rotate_interval
+
+    @classmethod
+    def __rotate(cls):
+        if cls.__backup_count == 0:
+            os.remove(cls.__file_path)
+        else:
+            for index in range(cls.__backup_count - 1, 0, -1):
+                source = f"{cls.__file_path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{cls.__file_path}.{index + 1}")
+            os.replace(cls.__file_path, f"{cls.__file_path}.1")
+        with cls.__lock:
+            cls.__rotations += 1
+
+    @classmethod
+    def _reset_after_fork(cls):
+        # Дочерний процесс не наследует поток записи, а очередь и блокировка могли остаться захваченными
+        cls.__queue = Queue(maxsize=cls.__queue.maxsize)
+        cls.__lock = threading.Lock()
+        cls.__thread = None
+
+
+os.register_at_fork(after_in_child=LogWriter._reset_after_fork)
+atexit.register(LogWriter.shutdown)
@@ -4,7 +4,8 @@ from src.settings_manager import SettingsManager
 from src.core.abstract_logic import AbstractLogic
 from src.core.event_type import EventType
 from src.core.logging_level import LoggingLevel
-from src.core.validator import OperationException, Validator
+from src.core.validator import Validator
+from src.logics.log_writer import LogWriter
 from src.logics.observe_service import ObserveService
 
 
@@ -15,11 +16,22 @@ class Logging(AbstractLogic):
     def __init__(self, manager: SettingsManager):
         Validator.validate(manager, SettingsManager)
 
-        ObserveService.append(self)
-
         self.__settings_manager = manager
         self.current_logging_level = LoggingLevel(self.__settings_manager.current_settings.logging_level)
 
+        settings = self.__settings_manager.current_settings
+        LogWriter.configure(self.__log_file_path, settings.log_queue_size, settings.log_max_mb * 1024 * 1024,
+                            settings.log_rotate_hours * 3600, settings.log_backup_count)
+
+        # Подписки зависят от уровня логирования, поэтому регистрация - после его установки
+        ObserveService.append(self)
+
+    @property
+    def subscriptions(self) -> frozenset:
+        """Только события, проходящие текущий уровень логирования"""
+        return frozenset(type for type in (EventType.LOG_INFO, EventType.LOG_ERROR, EventType.LOG_DEBUG)
+                         if self._should_log(type))
+
     def set_exception(self, ex: Exception):  # pragma: no cover
         super().set_exception(ex)
 
@@ -59,11 +71,7 @@ class Logging(AbstractLogic):
 
     def _write_log(self, message: str):
         """
-        Записывает лог-сообщение в файл
+        Передает лог-сообщение фоновой записи в файл
         """
-        try:
-            with open(self.__log_file_path, 'a', encoding='utf-8') as log_file:
-                log_file.write(message + "\n")
-        except Exception as ex:
-            raise OperationException(f"Error writing to log file: {ex}")
+        LogWriter.write(message)
         # print(message)
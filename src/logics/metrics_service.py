@@ -0,0 +1,161 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Any, Callable, Iterable, List, Tuple
+
+from src.logics.timing_stats import TimingStats
+from src.logics.worker_stats import WorkerStats
+
+
+def _labels(**labels) -> str:
+    """Метки в формате Prometheus: {name="value",...}"""
+    items = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        items.append(f'{name}="{value}"')
+    return "{" + ",".join(items) + "}" if items else ""
+
+
+class _Histogram:
+    """Гистограмма с фиксированными границами интервалов (не потокобезопасна, защищается вызывающим кодом)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: Dict[str, Any]) -> List[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(**labels)} {round(self.sum, 6)}")
+        lines.append(f"{name}_count{_labels(**labels)} {self.count}")
+        return lines
+
+
+class MetricsService:
+    """
+    Метрики сервиса в текстовом формате Prometheus (эндпоинт /metrics).
+    Счетчики запросов и проверок накапливаются в процессе сервиса; состояние пулов и кэшей
+    снимается в момент запроса с зарегистрированных функций get_stats.
+    """
+    PREFIX = "doccheck"
+    REQUEST_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    __lock = threading.Lock()
+    __requests: Dict[Tuple[str, str, int], int] = {}
+    __request_durations: Dict[Tuple[str, str], _Histogram] = {}
+    __validations: Dict[Tuple[str, str, bool, bool], int] = {}
+    __validation_durations: Dict[Tuple[str, str], _Histogram] = {}
+    __check_errors: Dict[Tuple[str, str], int] = {}
+    __collectors: List[Tuple[str, Callable[[], dict], Tuple[str, ...]]] = []
+
+    @classmethod
+    def register(cls, name: str, stats: Callable[[], dict], counters: Iterable[str] = ()):
+        """
+        Добавляет в /metrics числовые поля словаря stats() как doccheck_<name>_<поле>.
+        Поля из counters публикуются как счетчики, остальные - как текущие значения (gauge).
+        """
+        with cls.__lock:
+            cls.__collectors = [item for item in cls.__collectors if item[0] != name]
+            cls.__collectors.append((name, stats, tuple(counters)))
+
+    @classmethod
+    def observe_request(cls, route: str, method: str, status: int, seconds: float):
+        with cls.__lock:
+            key = (route, method, status)
+            cls.__requests[key] = cls.__requests.get(key, 0) + 1
+            histogram = cls.__request_durations.get((route, method))
+            if histogram is None:
+                histogram = _Histogram(cls.REQUEST_BUCKETS)
+                cls.__request_durations[(route, method)] = histogram
+            histogram.observe(seconds)
+
+    @classmethod
+    def observe_validation(cls, document_format: str, doc_type: str, result: Dict[str, Any], seconds: float = None,
+                           cached: bool = False):
+        """
+        Учитывает результат проверки: итог valid, время и количество ошибок по проверкам.
+        Количество ошибок (ключ check_errors) и счетчики процесса проверки (worker_stats) извлекаются из результата.
+        """
+        check_errors = result.pop("check_errors", None) or {}
+        WorkerStats.collect(result)
+        doc_type = doc_type.lower()
+        with cls.__lock:
+            key = (document_format, doc_type, bool(result.get("valid")), cached)
+            cls.__validations[key] = cls.__validations.get(key, 0) + 1
+            if seconds is not None:
+                histogram = cls.__validation_durations.get((document_format, doc_type))
+                if histogram is None:
+                    histogram = _Histogram(cls.REQUEST_BUCKETS)
+                    cls.__validation_durations[(document_format, doc_type)] = histogram
+                histogram.observe(seconds)
+            for check, count in check_errors.items():
+                key = (document_format, check)
+                cls.__check_errors[key] = cls.__check_errors.get(key, 0) + count
+
+    @classmethod
+    def render(cls) -> str:
+        prefix = cls.PREFIX
+        lines = []
+
+        def header(name: str, metric_type: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+
+        with cls.__lock:
+            header("http_requests_total", "counter", "Количество HTTP-запросов")
+            for (route, method, status), count in sorted(cls.__requests.items()):
+                labels = _labels(route=route, method=method, status=status)
+                lines.append(f"{prefix}_http_requests_total{labels} {count}")
+
+            header("http_request_duration_seconds", "histogram", "Время обработки HTTP-запросов")
+            for (route, method), histogram in sorted(cls.__request_durations.items()):
+                lines += histogram.lines(f"{prefix}_http_request_duration_seconds", {"route": route, "method": method})
+
+            header("validations_total", "counter", "Количество проверок документов по итогу valid")
+            for (document_format, doc_type, valid, cached), count in sorted(cls.__validations.items()):
+                labels = _labels(format=document_format, doc_type=doc_type, valid=str(valid).lower(),
+                                 cached=str(cached).lower())
+                lines.append(f"{prefix}_validations_total{labels} {count}")
+
+            header("validation_duration_seconds", "histogram", "Время проверки документов без учета кэша")
+            for (document_format, doc_type), histogram in sorted(cls.__validation_durations.items()):
+                lines += histogram.lines(f"{prefix}_validation_duration_seconds",
+                                         {"format": document_format, "doc_type": doc_type})
+
+            header("validation_errors_total", "counter", "Количество найденных ошибок оформления по проверкам")
+            for (document_format, check), count in sorted(cls.__check_errors.items()):
+                lines.append(f"{prefix}_validation_errors_total{_labels(format=document_format, check=check)} {count}")
+
+            collectors = list(cls.__collectors)
+
+        header("stage_duration_seconds", "histogram", "Время этапов проверки")
+        for stage, histogram in TimingStats.get_stats().items():
+            for bound, count in histogram["buckets"].items():
+                lines.append(f"{prefix}_stage_duration_seconds_bucket{_labels(stage=stage, le=bound)} {count}")
+            lines.append(f"{prefix}_stage_duration_seconds_sum{_labels(stage=stage)} {histogram['sum']}")
+            lines.append(f"{prefix}_stage_duration_seconds_count{_labels(stage=stage)} {histogram['count']}")
+
+        for name, stats, counters in collectors:
+            values = stats()
+            for field, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric_type = "counter" if field in counters else "gauge"
+                metric = f"{name}_{field}_total" if metric_type == "counter" else f"{name}_{field}"
+                header(metric, metric_type, f"{name}: {field}")
+                lines.append(f"{prefix}_{metric} {value}")
+            # Доля попаданий для кэшей
+            if isinstance(values.get("hits"), int) and isinstance(values.get("misses"), int):
+                total = values["hits"] + values["misses"]
+                header(f"{name}_hit_ratio", "gauge", f"{name}: доля попаданий")
+                lines.append(f"{prefix}_{name}_hit_ratio {round(values['hits'] / total, 6) if total else 0}")
+
+        return "\n".join(lines) + "\n"
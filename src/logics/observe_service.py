@@ -1,10 +1,27 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
 from src.core.abstract_logic import AbstractLogic
 from src.core.event_type import EventType
 from src.core.validator import ArgumentException
 
 
 class ObserveService:
+    """
+    Рассылка событий наблюдателям.
+    Наблюдатель получает только события из своего набора subscriptions: для каждого типа события
+    хранится готовый кортеж подписчиков, поэтому событие без подписчиков отбрасывается сразу.
+    Параметры события можно передать функцией без аргументов (например, lambda: f"..."), тогда
+    сообщение формируется один раз и только если у события есть подписчики.
+    Наблюдатели с async_events = True получают события в отдельном потоке в порядке их возникновения.
+    """
     observers = []
+    __types = set()
+    __dispatch: Dict[EventType, Tuple[AbstractLogic, ...]] = {}
+    __lock = threading.Lock()
+    __executor: ThreadPoolExecutor = None
 
     @staticmethod
     def append(service: AbstractLogic):
@@ -15,13 +32,59 @@ class ObserveService:
         if not isinstance(service, AbstractLogic):
             raise ArgumentException("Некорректный тип данных!")
 
-        items = list(map(lambda x: type(x).__name__, ObserveService.observers))
-        found = type(service).__name__ in items
-        if not found:
+        with ObserveService.__lock:
+            if type(service).__name__ in ObserveService.__types:
+                return
+            ObserveService.__types.add(type(service).__name__)
             ObserveService.observers.append(service)
+            ObserveService.__rebuild()
+
+    @staticmethod
+    def update_subscriptions():
+        """Перестраивает таблицу рассылки после изменения subscriptions у наблюдателя"""
+        with ObserveService.__lock:
+            ObserveService.__rebuild()
+
+    @staticmethod
+    def has_subscribers(type: EventType) -> bool:
+        return bool(ObserveService.__dispatch.get(type))
 
     @staticmethod
     def raise_event(type: EventType, params):
-        for instance in ObserveService.observers:
-            if instance is not None:
-                instance.handle_event(type, params)
\ No newline at end of file
+        instances = ObserveService.__dispatch.get(type)
+        if not instances:
+            return
+
+        if callable(params):
+            params = params()
+        for instance in instances:
+            if instance.async_events:
+                ObserveService.__get_executor().submit(instance.handle_event, type, params)
+            else:
+                instance.handle_event(type, params)
+
+    @staticmethod
+    def __rebuild():
+        """Таблица рассылки: тип события -> подписчики в порядке регистрации (вызывается под блокировкой)"""
+        ObserveService.__dispatch = {
+            event_type: tuple(instance for instance in ObserveService.observers
+                              if event_type in instance.subscriptions)
+            for event_type in EventType
+        }
+
+    @staticmethod
+    def __get_executor() -> ThreadPoolExecutor:
+        # Один поток сохраняет порядок событий для асинхронных наблюдателей
+        with ObserveService.__lock:
+            if ObserveService.__executor is None:
+                ObserveService.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="observe")
+            return ObserveService.__executor
+
+    @staticmethod
+    def _reset_after_fork():
+        # Поток рассылки не переходит в дочерний процесс
+        ObserveService.__lock = threading.Lock()
+        ObserveService.__executor = None
+
+
+os.register_at_fork(after_in_child=ObserveService._reset_after_fork)
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from io import BytesIO
+from typing import BinaryIO, Iterator, Optional, Union
+
+from docx import Document
+
+from src.core.validator import Validator, ArgumentException
+
+
+class DocxContext:
+    """
+    Файл .docx, прочитанный один раз и общий для всех этапов разбора.
+    Источник - путь к файлу, байты или открытый файловый объект (например, поток загрузки).
+    Дерево python-docx и zip-архив строятся из байтов в памяти по первому требованию и переиспользуются,
+    на диск документ записывается только если dedoc нужен путь к файлу.
+    """
+
+    def __init__(self, docx_file: Union[str, bytes, bytearray, memoryview, BinaryIO]):
+        self.docx_file_path: Optional[str] = None
+
+        if isinstance(docx_file, str):
+            Validator.validate(docx_file, str)
+            self.docx_file_path = docx_file
+            with open(docx_file, "rb") as file:
+                self.raw_bytes = file.read()
+        elif isinstance(docx_file, (bytes, bytearray, memoryview)):
+            self.raw_bytes = docx_file
+        elif hasattr(docx_file, "read"):
+            # getvalue у BytesIO возвращает байты без копирования, остальные потоки читаем с начала
+            if isinstance(docx_file, BytesIO):
+                self.raw_bytes = docx_file.getvalue()
+            else:
+                if docx_file.seekable():
+                    docx_file.seek(0)
+                self.raw_bytes = docx_file.read()
+        else:
+            raise ArgumentException(f"Некорректный тип. Ожидался путь, байты или файл, получен {type(docx_file)}.")
+
+        if not self.raw_bytes:
+            raise ArgumentException("Пустой файл .docx")
+
+        self.__document = None
+        self.__package_parts = None
+        self.__archive = None
+        self.__parts = {}
+
+    @property
+    def document(self) -> Document:
+        """Документ python-docx, построенный из прочитанных байтов"""
+        if self.__document is None:
+            self.__document = Document(BytesIO(self.raw_bytes))
+        return self.__document
+
+    @property
+    def archive(self) -> zipfile.ZipFile:
+        """zip-архив .docx поверх тех же байтов"""
+        if self.__archive is None:
+            self.__archive = zipfile.ZipFile(BytesIO(self.raw_bytes))
+        return self.__archive
+
+    @property
+    def loaded_document(self) -> Optional[Document]:
+        """Документ python-docx, если он уже построен (без загрузки)"""
+        return self.__document
+
+    def read_part(self, name: str) -> bytes:
+        """
+        Содержимое части пакета (например, word/styles.xml). Если документ python-docx уже построен,
+        часть берется из его пакета, иначе распаковывается из архива; результат запоминается
+        """
+        if name not in self.__parts:
+            part = self.package_part(name)
+            self.__parts[name] = part.blob if part is not None else self.archive.read(name)
+        return self.__parts[name]
+
+    def package_part(self, name: str):
+        """Часть уже построенного пакета python-docx по имени в архиве (None, если пакет не построен)"""
+        if self.__document is None:
+            return None
+        if self.__package_parts is None:
+            self.__package_parts = {part.partname.lstrip("/"): part
+                                    for part in self.__document.part.package.iter_parts()}
+        return self.__package_parts.get(name)
+
+    @contextmanager
+    def file_path(self) -> Iterator[str]:
+        """
+        Путь к файлу документа для библиотек, которые читают только с диска (dedoc).
+        Если документ получен не по пути, он записывается во временный файл,
+        который удаляется при выходе из блока, в том числе при ошибке.
+        """
+        if self.docx_file_path is not None:
+            yield self.docx_file_path
+            return
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as temp_file:
+            temp_file.write(self.raw_bytes)
+            temp_file_path = temp_file.name
+        try:
+            yield temp_file_path
+        finally:
+            os.remove(temp_file_path)
+
+    def close(self):
+        if self.__archive is not None:
+            self.__archive.close()
+            self.__archive = None
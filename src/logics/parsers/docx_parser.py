@@ -1,100 +1,120 @@
-import re
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Iterator, Union, BinaryIO
 
-from dedoc import DedocManager
 from docx import Document
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml.ns import qn
 from docx.shared import RGBColor
+from docx.text.run import Run
+
+from src.core.stage_timer import StageTimer
+from src.logics.dedoc_pool import DedocPool
+from src.logics.parsers.docx_context import DocxContext
+from src.logics.parsers.docx_visitors import (StructureVisitor, IntroVisitor, ListsVisitor, PicturesVisitor,
+                                              TablesVisitor, BibliographyVisitor, AppendicesVisitor,
+                                              FontSizeVisitor)
 
 
 class DocxParser:
-    def __init__(self, docx_file_path: str):
-        self.docx_file_path = docx_file_path
-        self.parsed_document = self.run_parse()
-        self.serialised_document = self.init_dedoc()
+    # Размер шрифта по умолчанию в Word, если он не задан ни в стилях, ни в docDefaults
+    DEFAULT_FONT_SIZE = 10.0
+
+    def __init__(self, docx_file: Union[str, bytes, BinaryIO, DocxContext], use_dedoc: bool = True,
+                 timer: StageTimer = None):
+        self.timer = timer if timer is not None else StageTimer("docx")
+        # Файл (путь, байты или поток) читается один раз, все этапы разбора работают с общим контекстом
+        with self.timer.stage("read"):
+            self.context = docx_file if isinstance(docx_file, DocxContext) else DocxContext(docx_file)
+        self.docx_file_path = self.context.docx_file_path
+        # Без dedoc (быстрый режим) размеры шрифта вычисляются по стилям OOXML
+        self.use_dedoc = use_dedoc
+        self.__style_sizes = {}
+        self.__style_elements = None
+        self.__default_size = None
+        with self.timer.stage("parse"):
+            self.parsed_document = self.run_parse()
+        if use_dedoc:
+            with self.timer.stage("dedoc"):
+                self.serialised_document = self.init_dedoc()
+        else:
+            self.serialised_document = None
 
     def init_dedoc(self):
-        manager = DedocManager()
-        result = manager.parse(self.docx_file_path, {"document_type": "diploma"})
+        # dedoc принимает только путь к файлу: документ из памяти записывается во временный файл на время разбора
+        with self.context.file_path() as file_path, DedocPool.acquire() as manager:
+            result = manager.parse(file_path, {"document_type": "diploma"})
         serialised_doc = result.to_api_schema().model_dump()
         return serialised_doc
 
     def run_parse(self) -> Dict[str, Any]:
-        doc = Document(self.docx_file_path)
-
-        return {
-            "structure": self.parse_structure(doc),
-            "bold_intro_words": self.parse_intro(doc),
-            # "text": self.parse_text(doc),
-            "lists": self.parse_lists(doc),
-            "pictures": self.parse_pictures(doc),
-            "tables": self.parse_tables(doc),
-            "appendices": self.parse_appendices(),
-            "bibliography": self.parse_bibliography(doc)
+        with self.timer.stage("load"):
+            doc = self.load_document()
+        with self.timer.stage("extract_tables"):
+            tables = self.extract_tables(doc)
+
+        visitors = {
+            "structure": StructureVisitor(),
+            "bold_intro_words": IntroVisitor(),
+            "lists": ListsVisitor(),
+            "pictures": PicturesVisitor(),
+            "tables": TablesVisitor(tables),
+            "appendices": AppendicesVisitor(),
+            "bibliography": BibliographyVisitor()
         }
-
-    def parse_structure(self, doc: Document) -> Dict[str, Any]:
-        paragraphs = [p for p in doc.paragraphs if p.text.strip()]
-        numbered_chapters = []
-        unnumbered_chapters = []
-        sections = []
-        common_text = []
-        current_chapter = None
-
-        for para in paragraphs:
-            text = para.text.strip()
-
-            # Нумерованные заголовки
-            if re.match(r"^\d+(\.\d+)?", text):
-                if re.match(r"^\d+\s", text):  # Глава, например "1 Введение"
-                    parts = text.split(maxsplit=1)
-                    chapter_number = parts[0]
-                    chapter_title = parts[1] if len(parts) > 1 else ""
-                    formatted_title = f"{chapter_number} глава '{chapter_title}'"
-
-                    para_info = self.extract_paragraph_info(para)
-                    para_info["formatted_title"] = formatted_title
-                    numbered_chapters.append(para_info)
-
-                    current_chapter = chapter_number
-
-                elif re.match(r"^\d+\.\d+", text):  # Раздел, например "1.1 Название"
-                    section_info = self.extract_paragraph_info(para)
-                    section_info["chapter_number"] = current_chapter
-                    sections.append(section_info)
-
-            else:  # Ненумерованные
-                lowered = text.lower()
-                if "выводы по главе" in lowered:
-                    section_info = self.extract_paragraph_info(para)
-                    section_info["chapter_number"] = current_chapter
-                    sections.append(section_info)
-
-                elif "технико-экономическое обоснование" in lowered:
-                    section_info = self.extract_paragraph_info(para)
-                    section_info["chapter_number"] = current_chapter
-                    sections.append(section_info)
-
-
-                elif (text.isupper()
-                      and not re.search(r"[.:;!?–—-]$", text)
-                      and not re.search(r"[–—-]", text)):
-                    unnumbered_chapters.append(self.extract_paragraph_info(para))
-                else:
-                    # Простой абзац
-                    common_text.append(self.extract_paragraph_info(para))
-
-        return {
-            "numbered_chapters": numbered_chapters,
-            "unnumbered_chapters": unnumbered_chapters,
-            "sections": sections,
-            "common_text": common_text
+        if not self.use_dedoc:
+            visitors["font_sizes"] = FontSizeVisitor()
+
+        # Один проход по абзацам: каждая запись передается всем обработчикам.
+        # Время обработчиков суммируется по всем абзацам и записывается вложенными этапами прохода
+        visit_seconds = dict.fromkeys(visitors, 0.0)
+        with self.timer.stage("scan"):
+            for record in self.scan_paragraphs(doc):
+                for name, visitor in visitors.items():
+                    started = time.perf_counter()
+                    visitor.visit(record)
+                    visit_seconds[name] += time.perf_counter() - started
+            for name, seconds in visit_seconds.items():
+                self.timer.add(f"visit_{name}", seconds)
+
+        return {name: visitor.result() for name, visitor in visitors.items()}
+
+    def load_document(self) -> Document:
+        return self.context.document
+
+    def styles_element(self):
+        """Элемент w:styles документа (стили и docDefaults)"""
+        return self.context.document.styles.element
+
+    def scan_paragraphs(self, doc: Document) -> Iterator[Dict[str, Any]]:
+        """Однократно извлекает из каждого непустого абзаца всё, что нужно обработчикам"""
+        for para in doc.paragraphs:
+            record = self.paragraph_record(para)
+            if record is not None:
+                yield record
+
+    def paragraph_record(self, para) -> Optional[Dict[str, Any]]:
+        """Запись абзаца для обработчиков (None для пустого абзаца)"""
+        text = para.text.strip()
+        if not text:
+            return None
+
+        runs = para.runs
+        record = {
+            "text": text,
+            "style": para.style.name if para.style is not None else "",
+            "alignment": para.alignment,
+            "bold_runs": [run.text.strip().lower() for run in runs if run.bold],
+            "info": self.extract_paragraph_info(para, text, runs)
         }
-
-    def extract_paragraph_info(self, para) -> Dict[str, Any]:
-        run = para.runs[0] if para.runs else None
+        if not self.use_dedoc:
+            record["run_sizes"] = self.resolve_run_sizes(para)
+        return record
+
+    def extract_paragraph_info(self, para, text: str = None, runs=None) -> Dict[str, Any]:
+        text = para.text.strip() if text is None else text
+        runs = para.runs if runs is None else runs
+        run = runs[0] if runs else None
         return {
-            "content": para.text.strip(),
+            "content": text,
             "font_size": run.font.size.pt if run and run.font.size else None,
             "font_name": run.font.name if run else None,
             "font_color": self.get_font_color(run),
@@ -102,7 +122,7 @@ class DocxParser:
             "alignment": para.alignment if para.alignment else None,
             "left_indent": para.paragraph_format.left_indent.pt if para.paragraph_format.left_indent else None,
             "bold": run.bold if run else None,
-            "uppercase": para.text.isupper(),
+            "uppercase": text.isupper(),
             "italic": run.italic if run else None,
             "underline": run.underline if run else None
         }
@@ -113,254 +133,107 @@ class DocxParser:
             return str(rgb)
         return None
 
-    def parse_intro(self, doc: Document) -> List[str]:
-        paragraphs = [p for p in doc.paragraphs if p.text.strip()]
-        inside_intro = False
-        bold_words = []
-
-        for para in paragraphs:
-            text = para.text.strip().lower()
-            if "введение" in text:
-                inside_intro = True
+    def resolve_run_sizes(self, para) -> List[str]:
+        """
+        Различные итоговые размеры шрифта фрагментов абзаца в том же порядке наследования, что и у dedoc:
+        фрагмент -> знак абзаца (w:pPr/w:rPr) -> стиль символов фрагмента, а без него стиль абзаца ->
+        стиль абзаца по умолчанию -> docDefaults.
+        Как и dedoc, учитываются все фрагменты w:r абзаца, в том числе внутри гиперссылок и полей.
+        Значения в том же виде, что и аннотации size у dedoc (например, '14.0').
+        """
+        p = para._p
+        mark_size = self.element_font_size(p.find(f"{qn('w:pPr')}/{qn('w:rPr')}"))
+        para_style = p.find(f"{qn('w:pPr')}/{qn('w:pStyle')}")
+
+        sizes = []
+        for r in p.iter(qn("w:r")):
+            if not Run(r, para).text:
                 continue
-            if inside_intro:
-                if para.style.name.lower().startswith('heading'):
-                    break  # Введение закончилось
-                for run in para.runs:
-                    if run.bold:
-                        bold_words.append(run.text.strip().lower())
-
-        return bold_words
-
-    def parse_lists(self, doc: Document) -> List[Dict[str, Any]]:
-        lists = []
-        current_list = None
-        intro_candidate = None
-
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            if not text:
-                continue
-
-            numbered_match = re.match(r"^(\d+)[\.\)]\s+(.+)", text)
-
-            bulleted_match = re.match(r"^[•\-–—]\s+(.+)", text)
-
-            if numbered_match:
-                item = {
-                    "type": "numbered",
-                    "number": int(numbered_match.group(1)),
-                    "text": numbered_match.group(2),
-                    "full": text
-                }
-
-                if current_list is None:
-                    current_list = {
-                        "type": "numbered",
-                        "intro": intro_candidate,
-                        "items": [item]
-                    }
-                else:
-                    current_list["items"].append(item)
-                continue
-
-            elif bulleted_match:
-                item = {
-                    "type": "bulleted",
-                    "text": bulleted_match.group(1),
-                    "full": text
-                }
-
-                if current_list is None:
-                    current_list = {
-                        "type": "bulleted",
-                        "intro": intro_candidate,
-                        "items": [item]
-                    }
-                else:
-                    current_list["items"].append(item)
-                continue
-
-            else:
-                if current_list:
-                    lists.append(current_list)
-                    current_list = None
-
-                if text.endswith(":") or text.endswith("."):
-                    intro_candidate = text
-                else:
-                    intro_candidate = None
-
-        if current_list:
-            lists.append(current_list)
-
-        return lists
 
-    def parse_pictures(self, doc: Document) -> Dict[str, List[Dict[str, str]]]:
-        paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-        picture_references = []
-        picture_captions = []
-
-        # Пары "паттерн — флаг захвата номера рисунка"
-        reference_patterns = [
-            (r"\(рис\.?\s*(\d+)\)", re.IGNORECASE),  # (Рис. 4)
-            (r"\(см\.?\s*рис\.?\s*(\d+)\)", re.IGNORECASE),  # (см. рис. 4)
-            (r"на\s+рисунке\s+(\d+)", re.IGNORECASE),  # на рисунке 4
-        ]
-
-        caption_pattern = r"^Рисунок\s+(\d+)\s*([-–—])\s*(.+)"
-
-        for i, text in enumerate(paragraphs):
-            # Поиск ссылок
-            for pattern, flags in reference_patterns:
-                for match in re.finditer(pattern, text, flags=flags):
-                    picture_references.append({
-                        "ref_text": match.group(0),
-                        "ref_number": match.group(1),
-                        # "paragraph": text
-                    })
-
-            match = re.match(caption_pattern, text)
-            if match:
-                picture_captions.append({
-                    "figure_number": match.group(1),
-                    "dash": match.group(2),
-                    "caption": match.group(3),
-                    "full_text": text
-                })
-
-        return {
-            "references": picture_references,
-            "captions": picture_captions
-        }
-
-    def parse_tables(self, doc: Document) -> Dict[str, List[Dict[str, Any]]]:
-        paragraphs = [p for p in doc.paragraphs if p.text.strip()]
-        table_references = []
-        table_captions = []
-        tables = []
-
-        reference_patterns = [
-            (r"\(табл\.?\s*(\d+)\)", re.IGNORECASE),  # (табл. 1)
-            (r"\(см\.?\s*табл\.?\s*(\d+)\)", re.IGNORECASE),  # (см. табл. 1)
-            (r"в\s+таблице\s+(\d+)", re.IGNORECASE),  # в таблице 1
-            (r"из\s+таблицы\s+(\d+)", re.IGNORECASE),  # из таблицы 1
-        ]
-
-        for para in paragraphs:
-            text = para.text.strip()
-            for pattern, flags in reference_patterns:
-                for match in re.finditer(pattern, text, flags=flags):
-                    table_references.append({
-                        "ref_text": match.group(0),
-                        "ref_number": match.group(1),
-                        # "paragraph": text
-                    })
-
-        for i in range(len(paragraphs) - 1):
-            current = paragraphs[i]
-            next_para = paragraphs[i + 1]
-            if re.match(r"Таблица\s+\d+", current.text.strip(), re.IGNORECASE):
-                if current.alignment == WD_PARAGRAPH_ALIGNMENT.RIGHT and next_para.alignment == WD_PARAGRAPH_ALIGNMENT.CENTER:
-                    table_captions.append({
-                        "table_number": re.findall(r"\d+", current.text)[0],
-                        "title": next_para.text.strip(),
-                        "raw_text": f"{current.text.strip()} / {next_para.text.strip()}"
-                    })
-
-        for table in doc.tables:
-            table_data = []
-            for row in table.rows:
-                row_data = [cell.text.strip() for cell in row.cells]
-                table_data.append(row_data)
-            tables.append({"table": table_data})
-
-        return {
-            "references": table_references,
-            "captions": table_captions,
-            "tables": tables
-        }
-
-    def parse_bibliography(self, doc: Document) -> Dict[str, Any]:
-        references = set()
-        bibliography_items = []
-        paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-
-        in_bibliography = False
-        counter = 1
-
-        for para in paragraphs:
-            # Сбор ссылок вида [1], [2]
-            refs = re.findall(r"\[\d{1,2}\]", para)
-            references.update(refs)
-
-            lowered = para.lower()
-
-            # Запуск сбора библиографии
-            if not in_bibliography and "список использованных источников" in lowered:
-                in_bibliography = True
-                continue
-
-            # Сбор элементов библиографии
-            if in_bibliography:
-                if para == para.upper():  # Новый заголовок = выход
-                    in_bibliography = False
-                    continue
-
-                number = para[0] if para and para[0].isdigit() else None
-                bibliography_items.append({
-                    "number": counter,
-                    "content": para
-                })
-                counter += 1
-
-        return {
-            "references_in_text": list(references),
-            "bibliography": bibliography_items
-        }
-
-    def parse_appendices(self) -> Dict[str, List[Dict[str, str]]]:
-        doc = Document(self.docx_file_path)
-        paragraphs = [p for p in doc.paragraphs if p.text.strip()]
-        appendix_references = []
-        appendix_titles = []
-
-        # Ссылки на приложения в тексте
-        reference_patterns = [
-            (r"\(прил\.?\s*([А-ЯA-Z])\)", re.IGNORECASE),  # (прил. А)
-            (r"\(см\.?\s*прил\.?\s*([А-ЯA-Z])\)", re.IGNORECASE),  # (см. прил. А)
-            (r"в\s+приложении\s+([А-ЯA-Z])", re.IGNORECASE),  # в приложении А
-            (r"из\s+приложения\s+([А-ЯA-Z])", re.IGNORECASE),  # из приложения А
-        ]
-
-        for para in paragraphs:
-            text = para.text.strip()
-            for pattern, flags in reference_patterns:
-                for match in re.finditer(pattern, text, flags=flags):
-                    appendix_references.append({
-                        "ref_text": match.group(0),
-                        "ref_letter": match.group(1).upper(),
-                        "paragraph": text
-                    })
-
-        # Названия приложений
-        for i in range(len(paragraphs) - 1):
-            current = paragraphs[i]
-            next_para = paragraphs[i + 1]
-            match = re.match(r"Приложение\s+([А-ЯA-Z])", current.text.strip(), re.IGNORECASE)
-
-            if match:
-                if current.alignment == WD_PARAGRAPH_ALIGNMENT.RIGHT and next_para.alignment == WD_PARAGRAPH_ALIGNMENT.CENTER:
-                    appendix_titles.append({
-                        "appendix_letter": match.group(1).upper(),
-                        "title": next_para.text.strip(),
-                        "raw_text": f"{current.text.strip()} / {next_para.text.strip()}"
-                    })
-
-        return {
-            "references": appendix_references,
-            "titles": appendix_titles
-        }
+            r_pr = r.find(qn("w:rPr"))
+            size = self.element_font_size(r_pr)
+            if size is None:
+                size = mark_size
+            if size is None:
+                run_style = r_pr.find(qn("w:rStyle")) if r_pr is not None else None
+                style = run_style if run_style is not None else para_style
+                size = self.style_font_size(style.get(qn("w:val")) if style is not None else None)
+
+            value = str(float(size))
+            if value not in sizes:
+                sizes.append(value)
+        return sizes
+
+    @staticmethod
+    def element_font_size(r_pr) -> Optional[float]:
+        """Размер шрифта из w:sz элемента свойств w:rPr (None, если не задан)"""
+        sz = r_pr.find(qn("w:sz")) if r_pr is not None else None
+        if sz is None or not sz.get(qn("w:val")):
+            return None
+        return int(sz.get(qn("w:val"))) / 2
+
+    def style_font_size(self, style_id: Optional[str]) -> float:
+        """
+        Размер шрифта стиля style_id с учетом цепочки базовых стилей,
+        а если он нигде не задан - стиля абзаца по умолчанию и docDefaults
+        """
+        if style_id not in self.__style_sizes:
+            styles = self.style_elements()
+            size = None
+            current_id = style_id
+            visited = set()
+            while current_id in styles and current_id not in visited and size is None:
+                visited.add(current_id)
+                current = styles[current_id]
+                size = self.element_font_size(current.find(qn("w:rPr")))
+                if size is None:
+                    size = self.element_font_size(current.find(f"{qn('w:pPr')}/{qn('w:rPr')}"))
+                based_on = current.find(qn("w:basedOn"))
+                current_id = based_on.get(qn("w:val")) if based_on is not None else None
+            if size is None:
+                size = self.default_style_font_size()
+            self.__style_sizes[style_id] = size
+        return self.__style_sizes[style_id]
+
+    def style_elements(self) -> Dict[str, Any]:
+        """Элементы w:style документа по w:styleId"""
+        if self.__style_elements is None:
+            self.__style_elements = {style.get(qn("w:styleId")): style
+                                     for style in self.styles_element().iterfind(qn("w:style"))}
+        return self.__style_elements
+
+    def default_style_font_size(self) -> float:
+        """
+        Размер шрифта стиля абзаца по умолчанию (без его базовых стилей, как у dedoc),
+        если он не задан - из docDefaults
+        """
+        for style in self.style_elements().values():
+            if style.get(qn("w:type")) == "paragraph" and style.get(qn("w:default")) in ("1", "true"):
+                size = self.element_font_size(style.find(qn("w:rPr")))
+                if size is None:
+                    size = self.element_font_size(style.find(f"{qn('w:pPr')}/{qn('w:rPr')}"))
+                if size is not None:
+                    return size
+                break
+        return self.default_font_size()
+
+    def default_font_size(self) -> float:
+        """Размер шрифта из w:docDefaults документа"""
+        if self.__default_size is None:
+            self.__default_size = self.DEFAULT_FONT_SIZE
+            sz = self.styles_element().find(
+                f"{qn('w:docDefaults')}/{qn('w:rPrDefault')}/{qn('w:rPr')}/{qn('w:sz')}")
+            if sz is not None and sz.get(qn("w:val")):
+                self.__default_size = int(sz.get(qn("w:val"))) / 2
+        return self.__default_size
+
+    @classmethod
+    def extract_tables(cls, doc: Document) -> List[List[List[str]]]:
+        return [cls.table_rows(table) for table in doc.tables]
+
+    @staticmethod
+    def table_rows(table) -> List[List[str]]:
+        return [[cell.text.strip() for cell in row.cells] for row in table.rows]
 
 # import re
 # from typing import Dict, Any, List
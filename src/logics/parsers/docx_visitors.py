@@ -0,0 +1,338 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+from src.logics.parsers import patterns
+
+
+class ParagraphVisitor(ABC):
+    """
+    Обработчик непустых абзацев документа.
+    DocxParser обходит абзацы один раз и передает каждую запись всем обработчикам.
+    Запись абзаца - словарь с ключами text, style, alignment, bold_runs, info.
+    """
+
+    @abstractmethod
+    def visit(self, record: Dict[str, Any]) -> None:
+        """Обработка очередного непустого абзаца"""
+        pass
+
+    @abstractmethod
+    def result(self):
+        """Результат после обхода всех абзацев"""
+        pass
+
+
+class StructureVisitor(ParagraphVisitor):
+    """Главы, разделы и обычный текст"""
+
+    def __init__(self):
+        self.numbered_chapters = []
+        self.unnumbered_chapters = []
+        self.sections = []
+        self.common_text = []
+        self.current_chapter = None
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        text = record["text"]
+
+        # Нумерованные заголовки
+        if patterns.DOCX_NUMBERED_HEADING.match(text):
+            if patterns.DOCX_CHAPTER.match(text):  # Глава, например "1 Введение"
+                parts = text.split(maxsplit=1)
+                chapter_number = parts[0]
+                chapter_title = parts[1] if len(parts) > 1 else ""
+
+                para_info = dict(record["info"])
+                para_info["formatted_title"] = f"{chapter_number} глава '{chapter_title}'"
+                self.numbered_chapters.append(para_info)
+
+                self.current_chapter = chapter_number
+
+            elif patterns.DOCX_SECTION.match(text):  # Раздел, например "1.1 Название"
+                section_info = dict(record["info"])
+                section_info["chapter_number"] = self.current_chapter
+                self.sections.append(section_info)
+
+        else:  # Ненумерованные
+            lowered = text.lower()
+            if "выводы по главе" in lowered or "технико-экономическое обоснование" in lowered:
+                section_info = dict(record["info"])
+                section_info["chapter_number"] = self.current_chapter
+                self.sections.append(section_info)
+
+            elif (text.isupper()
+                  and not patterns.DOCX_HEADING_END_PUNCTUATION.search(text)
+                  and not patterns.DOCX_DASH.search(text)):
+                self.unnumbered_chapters.append(dict(record["info"]))
+            else:
+                # Простой абзац
+                self.common_text.append(dict(record["info"]))
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "numbered_chapters": self.numbered_chapters,
+            "unnumbered_chapters": self.unnumbered_chapters,
+            "sections": self.sections,
+            "common_text": self.common_text
+        }
+
+
+class IntroVisitor(ParagraphVisitor):
+    """Слова, выделенные жирным во введении"""
+
+    def __init__(self):
+        self.inside_intro = False
+        self.finished = False
+        self.bold_words = []
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        if self.finished:
+            return
+
+        if "введение" in record["text"].lower():
+            self.inside_intro = True
+            return
+        if self.inside_intro:
+            if record["style"].lower().startswith('heading'):
+                self.finished = True  # Введение закончилось
+                return
+            self.bold_words.extend(record["bold_runs"])
+
+    def result(self) -> List[str]:
+        return self.bold_words
+
+
+class ListsVisitor(ParagraphVisitor):
+    """Нумерованные и маркированные списки с вводной фразой"""
+
+    def __init__(self):
+        self.lists = []
+        self.current_list = None
+        self.intro_candidate = None
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        text = record["text"]
+
+        numbered_match = patterns.DOCX_NUMBERED_ITEM.match(text)
+        bulleted_match = patterns.DOCX_BULLETED_ITEM.match(text)
+
+        if numbered_match:
+            item = {
+                "type": "numbered",
+                "number": int(numbered_match.group(1)),
+                "text": numbered_match.group(2),
+                "full": text
+            }
+            self._append_item("numbered", item)
+
+        elif bulleted_match:
+            item = {
+                "type": "bulleted",
+                "text": bulleted_match.group(1),
+                "full": text
+            }
+            self._append_item("bulleted", item)
+
+        else:
+            if self.current_list:
+                self.lists.append(self.current_list)
+                self.current_list = None
+
+            if text.endswith(":") or text.endswith("."):
+                self.intro_candidate = text
+            else:
+                self.intro_candidate = None
+
+    def _append_item(self, list_type: str, item: Dict[str, Any]) -> None:
+        if self.current_list is None:
+            self.current_list = {
+                "type": list_type,
+                "intro": self.intro_candidate,
+                "items": [item]
+            }
+        else:
+            self.current_list["items"].append(item)
+
+    def result(self) -> List[Dict[str, Any]]:
+        lists = list(self.lists)
+        if self.current_list:
+            lists.append(self.current_list)
+        return lists
+
+
+class PicturesVisitor(ParagraphVisitor):
+    """Ссылки на рисунки и подписи к ним"""
+
+    def __init__(self):
+        self.references = []
+        self.captions = []
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        text = record["text"]
+
+        for pattern in patterns.DOCX_PICTURE_REFERENCES:
+            for match in pattern.finditer(text):
+                self.references.append({
+                    "ref_text": match.group(0),
+                    "ref_number": match.group(1),
+                })
+
+        match = patterns.DOCX_PICTURE_CAPTION.match(text)
+        if match:
+            self.captions.append({
+                "figure_number": match.group(1),
+                "dash": match.group(2),
+                "caption": match.group(3),
+                "full_text": text
+            })
+
+    def result(self) -> Dict[str, List[Dict[str, str]]]:
+        return {
+            "references": self.references,
+            "captions": self.captions
+        }
+
+
+class TablesVisitor(ParagraphVisitor):
+    """Ссылки на таблицы, подписи к ним и содержимое таблиц"""
+
+    def __init__(self, tables: List[List[List[str]]]):
+        self.tables = tables
+        self.references = []
+        self.captions = []
+        self.previous: Optional[Dict[str, Any]] = None
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        text = record["text"]
+        for pattern in patterns.DOCX_TABLE_REFERENCES:
+            for match in pattern.finditer(text):
+                self.references.append({
+                    "ref_text": match.group(0),
+                    "ref_number": match.group(1),
+                })
+
+        # Подпись - "Таблица N" справа, название по центру в следующем абзаце
+        current = self.previous
+        if current and patterns.DOCX_TABLE_CAPTION.match(current["text"]):
+            if (current["alignment"] == WD_PARAGRAPH_ALIGNMENT.RIGHT
+                    and record["alignment"] == WD_PARAGRAPH_ALIGNMENT.CENTER):
+                self.captions.append({
+                    "table_number": patterns.DOCX_NUMBER.findall(current["text"])[0],
+                    "title": text,
+                    "raw_text": f"{current['text']} / {text}"
+                })
+        self.previous = record
+
+    def result(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            "references": self.references,
+            "captions": self.captions,
+            "tables": [{"table": table_data} for table_data in self.tables]
+        }
+
+
+class BibliographyVisitor(ParagraphVisitor):
+    """Ссылки вида [1] и элементы списка использованных источников"""
+
+    def __init__(self):
+        self.references = set()
+        self.bibliography_items = []
+        self.in_bibliography = False
+        self.counter = 1
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        para = record["text"]
+
+        # Сбор ссылок вида [1], [2]
+        self.references.update(patterns.DOCX_BIBLIOGRAPHY_REFERENCE.findall(para))
+
+        # Запуск сбора библиографии
+        if not self.in_bibliography and "список использованных источников" in para.lower():
+            self.in_bibliography = True
+            return
+
+        # Сбор элементов библиографии
+        if self.in_bibliography:
+            if para == para.upper():  # Новый заголовок = выход
+                self.in_bibliography = False
+                return
+
+            self.bibliography_items.append({
+                "number": self.counter,
+                "content": para
+            })
+            self.counter += 1
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "references_in_text": list(self.references),
+            "bibliography": self.bibliography_items
+        }
+
+
+class AppendicesVisitor(ParagraphVisitor):
+    """Ссылки на приложения и заголовки приложений"""
+
+    def __init__(self):
+        self.references = []
+        self.titles = []
+        self.previous: Optional[Dict[str, Any]] = None
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        text = record["text"]
+        for pattern in patterns.DOCX_APPENDIX_REFERENCES:
+            for match in pattern.finditer(text):
+                self.references.append({
+                    "ref_text": match.group(0),
+                    "ref_letter": match.group(1).upper(),
+                    "paragraph": text
+                })
+
+        # Заголовок - "Приложение X" справа, название по центру в следующем абзаце
+        current = self.previous
+        if current:
+            match = patterns.DOCX_APPENDIX_TITLE.match(current["text"])
+            if match and (current["alignment"] == WD_PARAGRAPH_ALIGNMENT.RIGHT
+                          and record["alignment"] == WD_PARAGRAPH_ALIGNMENT.CENTER):
+                self.titles.append({
+                    "appendix_letter": match.group(1).upper(),
+                    "title": text,
+                    "raw_text": f"{current['text']} / {text}"
+                })
+        self.previous = record
+
+    def result(self) -> Dict[str, List[Dict[str, str]]]:
+        return {
+            "references": self.references,
+            "titles": self.titles
+        }
+
+
+class FontSizeVisitor(ParagraphVisitor):
+    """
+    Итоговые размеры шрифта в абзацах (быстрый режим без dedoc).
+    Строки оглавления после заголовка "СОДЕРЖАНИЕ" пропускаются так же,
+    как вложенные элементы этого заголовка при проверке по дереву dedoc.
+    """
+
+    def __init__(self):
+        self.inside_toc = False
+        self.font_sizes = []
+
+    def visit(self, record: Dict[str, Any]) -> None:
+        text = record["text"]
+
+        if self.inside_toc:
+            if record["style"].lower().startswith("toc") or text[-1].isdigit():
+                return
+            self.inside_toc = False
+
+        if text.upper() == "СОДЕРЖАНИЕ":
+            self.inside_toc = True
+
+        self.font_sizes.append({"text": text, "sizes": record["run_sizes"]})
+
+    def result(self) -> List[Dict[str, Any]]:
+        return self.font_sizes
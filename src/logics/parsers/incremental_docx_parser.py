@@ -0,0 +1,131 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional
+
+from docx import Document
+from lxml import etree
+
+from src.core.stage_timer import StageTimer
+from src.logics.parsers.docx_parser import DocxParser
+
+
+class IncrementalDocxParser(DocxParser):
+    """
+    Разбор .docx, который повторно загружается на проверку в рамках сессии (session_id).
+    Записи абзацев и содержимое таблиц кэшируются по хэшу XML элемента (текст и прямое форматирование),
+    поэтому при повторной проверке python-docx разбирает только измененные абзацы и таблицы.
+    Обработчики абзацев (структура, ссылки на рисунки, таблицы, приложения и источники) выполняются
+    по всем записям документа, как при полном разборе.
+
+    Записи зависят от стилей документа, поэтому кэш сессии используется, только если стили (word/styles.xml)
+    и режим проверки (с dedoc или быстрый) не изменились. dedoc разбирает документ только целиком:
+    его результат переиспользуется, если не изменилось содержимое документа (части архива
+    кроме свойств docProps, которые Word обновляет при каждом сохранении).
+    Кэш хранится в процессе проверки; для сессии хранятся данные последней версии документа.
+    Сервис направляет все проверки сессии в один процесс (WorkerPool, route_key), кэш теряется
+    при перезапуске этого процесса и при изменении количества процессов.
+    """
+    SESSION_CACHE_SIZE = 32
+
+    __sessions: OrderedDict = OrderedDict()  # session_id -> данные последней версии документа
+    __lock = threading.Lock()
+    __hits = 0
+    __misses = 0
+    __dedoc_reused = 0
+
+    def __init__(self, docx_file, use_dedoc: bool = True, timer: StageTimer = None, session_id: str = ""):
+        self.session_id = session_id
+        self.__previous: Dict[str, Any] = {}
+        self.__current: Dict[str, Any] = {"paragraphs": {}, "tables": {}}
+        super().__init__(docx_file, use_dedoc, timer)
+
+        with self.__lock:
+            self.__sessions[session_id] = self.__current
+            self.__sessions.move_to_end(session_id)
+            while len(self.__sessions) > self.SESSION_CACHE_SIZE:
+                self.__sessions.popitem(last=False)
+
+    @staticmethod
+    def element_key(element) -> bytes:
+        return hashlib.sha256(etree.tostring(element)).digest()
+
+    def content_digest(self) -> str:
+        """Хэш содержимого документа по контрольным суммам частей архива (без распаковки)"""
+        digest = hashlib.sha256()
+        for info in sorted(self.context.archive.infolist(), key=lambda item: item.filename):
+            if not info.filename.startswith("docProps/"):
+                digest.update(f"{info.filename}:{info.CRC}:{info.file_size};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def run_parse(self) -> Dict[str, Any]:
+        styles = self.element_key(self.context.document.styles.element).hex()
+        self.__current.update(styles=styles, use_dedoc=self.use_dedoc)
+
+        with self.__lock:
+            previous = self.__sessions.get(self.session_id)
+        if previous and previous["styles"] == styles and previous["use_dedoc"] == self.use_dedoc:
+            self.__previous = previous
+        return super().run_parse()
+
+    def scan_paragraphs(self, doc: Document) -> Iterator[Dict[str, Any]]:
+        previous = self.__previous.get("paragraphs", {})
+        current = self.__current["paragraphs"]
+        hits = misses = 0
+        for para in doc.paragraphs:
+            key = self.element_key(para._p)
+            if key in current:
+                record = current[key]
+            elif key in previous:
+                record = current[key] = previous[key]
+                hits += 1
+            else:
+                record = current[key] = self.paragraph_record(para)
+                misses += 1
+            if record is not None:
+                yield record
+        self.__count(hits, misses)
+
+    def extract_tables(self, doc: Document) -> List[List[List[str]]]:
+        previous = self.__previous.get("tables", {})
+        current = self.__current["tables"]
+        tables = []
+        for table in doc.tables:
+            key = self.element_key(table._tbl)
+            if key not in current:
+                current[key] = previous[key] if key in previous else self.table_rows(table)
+            tables.append(current[key])
+        return tables
+
+    def init_dedoc(self) -> Optional[Dict[str, Any]]:
+        digest = self.content_digest()
+        self.__current["content"] = digest
+        if self.__previous.get("content") == digest and self.__previous.get("dedoc") is not None:
+            with self.__lock:
+                IncrementalDocxParser.__dedoc_reused += 1
+            self.__current["dedoc"] = self.__previous["dedoc"]
+        else:
+            self.__current["dedoc"] = super().init_dedoc()
+        return self.__current["dedoc"]
+
+    @classmethod
+    def __count(cls, hits: int, misses: int):
+        with cls.__lock:
+            cls.__hits += hits
+            cls.__misses += misses
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Состояние кэша в текущем процессе: сессии, переиспользованные (hits) и заново разобранные (misses)
+        абзацы и таблицы, переиспользованные результаты dedoc. Значения относятся только к этому процессу проверки
+        """
+        with cls.__lock:
+            return {"sessions": len(cls.__sessions), "hits": cls.__hits, "misses": cls.__misses,
+                    "dedoc_reused": cls.__dedoc_reused}
+
+    @classmethod
+    def clear(cls):
+        with cls.__lock:
+            cls.__sessions.clear()
+            cls.__hits = cls.__misses = cls.__dedoc_reused = 0
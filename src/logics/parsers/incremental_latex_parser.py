@@ -0,0 +1,157 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from src.core.stage_timer import StageTimer
+from src.logics.parsers import patterns
+from src.logics.parsers.latex_parser import LatexParser
+from src.logics.parsers.latex_tokenizer import LatexTokenizer
+
+
+class LatexChunk(LatexParser):
+    """
+    Фрагмент документа от строки с \\chapter до следующей такой строки.
+    Содержит разбор фрагмента и результаты поиска по его тексту (списки, ссылки на приложения,
+    команды выделения); позиции отсчитываются от начала фрагмента.
+    Полный разбор LatexParser не выполняется - используются только его методы поиска по тексту.
+    """
+
+    def __init__(self, raw_text: str):
+        self.tex_content = self.remove_comments(raw_text)
+        self.tokens = LatexTokenizer(self.tex_content)
+        self.lists: Dict[str, List[str]] = {}
+        self.appendix_links: List[List[Dict[str, str]]] = []
+        self.formatting: Dict[str, Tuple[List[int], List[int]]] = {}
+
+    def collect(self) -> "LatexChunk":
+        """Поиск по тексту фрагмента; выполняется один раз для фрагмента, который попадет в кэш"""
+        self.lists = self.parse_lists()
+        self.appendix_links = [self.find_appendix_links(pattern) for pattern in patterns.LATEX_APPENDIX_LINKS]
+        self.formatting = {name: self.formatting_position_groups(name)
+                           for name, _ in patterns.LATEX_FORMATTING_COMMANDS}
+        return self
+
+
+class IncrementalLatexParser(LatexParser):
+    """
+    Разбор документа, который повторно загружается на проверку в рамках сессии (session_id).
+    Документ делится на фрагменты по строкам с \\chapter, для каждого фрагмента кэшируются
+    разбор и результаты поиска по тексту. При повторной проверке заново разбираются только
+    измененные главы, остальные берутся из кэша сессии со сдвигом позиций. Структура,
+    подписи, ссылки, введение, кавычки и все проверки документа выполняются по всему тексту.
+
+    Фрагмент переиспользуется, только если его скобки и списки закрыты внутри него; иначе
+    он объединяется со всем оставшимся текстом, поэтому результат совпадает с LatexParser.
+    Кэш хранится в процессе проверки; для сессии хранятся фрагменты последней версии документа.
+    Сервис направляет все проверки сессии в один процесс (WorkerPool, route_key), кэш теряется
+    при перезапуске этого процесса и при изменении количества процессов.
+    """
+    SESSION_CACHE_SIZE = 32
+
+    __sessions: OrderedDict = OrderedDict()  # session_id -> {sha256 текста фрагмента: LatexChunk}
+    __lock = threading.Lock()
+    __hits = 0
+    __misses = 0
+
+    def __init__(self, tex_file, timer: StageTimer = None, source_map=None, session_id: str = ""):
+        self.session_id = session_id
+        self.chunks: List[Tuple[int, LatexChunk]] = []  # (смещение в тексте документа, фрагмент)
+        super().__init__(tex_file, timer, source_map)
+
+    @staticmethod
+    def split(content: str) -> List[int]:
+        """Позиции начала фрагментов: начало текста и строки, начинающиеся с \\chapter"""
+        starts = [match.start() for match in patterns.LATEX_CHAPTER_LINE.finditer(content)]
+        return [0] + [start for start in starts if start > 0]
+
+    @staticmethod
+    def reusable(chunk: LatexChunk) -> bool:
+        """
+        Разбор фрагмента совпадает с разбором в составе документа: скобки закрыты внутри фрагмента,
+        списки не переходят через границу (окружения вроде document сопоставляются по всему документу)
+        """
+        return chunk.tokens.balanced and not chunk.tokens.unpaired_environments.intersection(patterns.LATEX_LIST_TYPES)
+
+    def read_content(self, tex_file) -> str:
+        content = tex_file.read().decode("utf-8")
+        with self.__lock:
+            previous = self.__sessions.get(self.session_id, {})
+
+        current: Dict[bytes, LatexChunk] = {}
+        hits = offset = 0
+        bounds = self.split(content) + [len(content)]
+        index = 0
+        while index < len(bounds) - 1:
+            start, end = bounds[index], bounds[index + 1]
+            key, chunk = self.__lookup(content[start:end], previous, current)
+            if not self.reusable(chunk) and end < len(content):
+                # Незакрытая скобка или окружение: оставшийся текст разбирается одним фрагментом
+                end = len(content)
+                key, chunk = self.__lookup(content[start:end], previous, current)
+                index = len(bounds) - 2
+
+            if key in previous:
+                hits += 1
+            elif key not in current:
+                chunk.collect()
+            current[key] = chunk
+            self.chunks.append((offset, chunk))
+            offset += len(chunk.tex_content)
+            index += 1
+
+        with self.__lock:
+            self.__sessions[self.session_id] = current
+            self.__sessions.move_to_end(self.session_id)
+            while len(self.__sessions) > self.SESSION_CACHE_SIZE:
+                self.__sessions.popitem(last=False)
+            IncrementalLatexParser.__hits += hits
+            IncrementalLatexParser.__misses += len(self.chunks) - hits
+
+        return "".join(chunk.tex_content for _, chunk in self.chunks)
+
+    @staticmethod
+    def __lookup(text: str, *caches: Dict[bytes, LatexChunk]) -> Tuple[bytes, LatexChunk]:
+        """Фрагмент из кэша по хэшу текста или новый разбор фрагмента"""
+        key = hashlib.sha256(text.encode("utf-8")).digest()
+        for cache in caches:
+            if key in cache:
+                return key, cache[key]
+        return key, LatexChunk(text)
+
+    def tokenize(self) -> LatexTokenizer:
+        return LatexTokenizer.merge(self.tex_content, [(offset, chunk.tokens) for offset, chunk in self.chunks])
+
+    def parse_lists(self):
+        lists = {list_type: [] for list_type in patterns.LATEX_LIST_TYPES}
+        for _, chunk in self.chunks:
+            for list_type, blocks in chunk.lists.items():
+                lists[list_type] += blocks
+        return lists
+
+    def find_appendix_links(self, pattern) -> List[Dict[str, str]]:
+        index = patterns.LATEX_APPENDIX_LINKS.index(pattern)
+        return [link for _, chunk in self.chunks for link in chunk.appendix_links[index]]
+
+    def formatting_position_groups(self, command_name: str) -> Tuple[List[int], List[int]]:
+        by_command, by_group = [], []
+        for offset, chunk in self.chunks:
+            chunk_by_command, chunk_by_group = chunk.formatting[command_name]
+            by_command += [pos + offset for pos in chunk_by_command]
+            by_group += [pos + offset for pos in chunk_by_group]
+        return by_command, by_group
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Состояние кэша фрагментов в текущем процессе: сессии, переиспользованные (hits)
+        и заново разобранные (misses) фрагменты. Значения относятся только к этому процессу проверки
+        """
+        with cls.__lock:
+            return {"sessions": len(cls.__sessions), "hits": cls.__hits, "misses": cls.__misses}
+
+    @classmethod
+    def clear(cls):
+        with cls.__lock:
+            cls.__sessions.clear()
+            cls.__hits = cls.__misses = 0
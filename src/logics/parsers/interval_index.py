@@ -0,0 +1,35 @@
+from bisect import bisect_right
+from typing import Iterable, List, Tuple
+
+
+class IntervalIndex:
+    """
+    Набор отрезков [start, end] (границы включаются) с поиском по позиции за O(log n).
+    Пересекающиеся и соприкасающиеся отрезки объединяются при построении.
+    """
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        self.__starts: List[int] = []
+        self.__ends: List[int] = []
+
+        for start, end in sorted(ranges):
+            if self.__ends and start <= self.__ends[-1]:
+                self.__ends[-1] = max(self.__ends[-1], end)
+            else:
+                self.__starts.append(start)
+                self.__ends.append(end)
+
+    def __contains__(self, pos: int) -> bool:
+        index = bisect_right(self.__starts, pos) - 1
+        return index >= 0 and pos <= self.__ends[index]
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.__starts)
+
+    @property
+    def ranges(self) -> List[Tuple[int, int]]:
+        """Объединенные отрезки в порядке возрастания"""
+        return list(zip(self.__starts, self.__ends))
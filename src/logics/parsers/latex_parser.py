@@ -1,41 +1,72 @@
-import re
-from typing import Dict, Any, List
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.core.stage_timer import StageTimer
+from src.logics.parsers import patterns
+from src.logics.parsers.latex_tokenizer import LatexTokenizer
+from src.logics.parsers.quote_scanner import QuoteScanner
 
 
 class LatexParser:
-    def __init__(self, tex_file):
-        self.tex_content = self.remove_comments(tex_file.read().decode("utf-8"))
+    def __init__(self, tex_file, timer: StageTimer = None, source_map=None):
+        self.timer = timer if timer is not None else StageTimer("latex")
+        # Для проекта из нескольких файлов - карта позиций собранного текста (LatexProject.expand)
+        self.source_map = source_map
+        with self.timer.stage("read"):
+            self.tex_content = self.read_content(tex_file)
+        # Один проход по тексту: все parse_* и check_* работают с готовым индексом команд и окружений
+        with self.timer.stage("tokenize"):
+            self.tokens = self.tokenize()
         self.errors = []
-        self.parsed_document = self.run_parse()
-        self.run_checks()
+        with self.timer.stage("parse"):
+            self.parsed_document = self.run_parse()
+        with self.timer.stage("parser_checks"):
+            self.run_checks()
+
+    def read_content(self, tex_file) -> str:
+        return self.remove_comments(tex_file.read().decode("utf-8"))
+
+    def tokenize(self) -> LatexTokenizer:
+        return LatexTokenizer(self.tex_content)
 
     @staticmethod
     def remove_comments(content: str) -> str:
         """Удаляет строки, начинающиеся с %, и текст после % в строках"""
-        return re.sub(r'(?<!\\)%.*', '', content)
+        return patterns.LATEX_COMMENT.sub('', content)
+
+    def location(self, pos: int) -> str:
+        """Ссылка на файл и строку проекта для позиции в тексте; для одиночного файла - пустая строка"""
+        if self.source_map is None:
+            return ""
+        located = self.source_map.locate(pos)
+        return f" [{located[0]}:{located[1]}]" if located else ""
 
     def run_parse(self):
-        return {"structure": self.parse_structure(),
-                "introduction": self.parse_introduction(),
-                "lists": self.parse_lists(),
-                "pictures": self.parse_pictures(),
-                "tables": self.parse_all_tables(),
-                "appendices": self.parse_appendices(),
-                "bibliography": self.parse_bibliography()}
+        stages = {"structure": self.parse_structure,
+                  "introduction": self.parse_introduction,
+                  "lists": self.parse_lists,
+                  "pictures": self.parse_pictures,
+                  "tables": self.parse_all_tables,
+                  "appendices": self.parse_appendices,
+                  "bibliography": self.parse_bibliography}
+        parsed = {}
+        for key, parse in stages.items():
+            with self.timer.stage(parse.__name__):
+                parsed[key] = parse()
+        return parsed
 
     def run_checks(self):
-        self.parse_title_and_toc()
-        self.parse_addcontentsline()
-        self.check_text_formatting_outside_introduction()
-        self.check_quotes_usage()
+        for check in (self.parse_title_and_toc, self.parse_addcontentsline,
+                      self.check_text_formatting_outside_introduction, self.check_quotes_usage):
+            with self.timer.stage(check.__name__):
+                check()
 
     def parse_structure(self) -> Dict[str, Any]:
-        chapter_titles = re.findall(r'\\chapter\{(.+?)\}', self.tex_content)
-        chapters = list(re.finditer(r'\\chapter\{(.+?)\}', self.tex_content))
-        numbered_chapters_formatted = [f"{i + 1} глава" for i in range(len(chapter_titles))]
+        chapters = [ch for ch in self.tokens.find("chapter", star=False) if ch.args]
+        numbered_chapters_formatted = [f"{i + 1} глава" for i in range(len(chapters))]
 
-        sections = list(re.finditer(r'\\section\{(.+?)\}', self.tex_content))
-        unnumbered_sections = list(re.finditer(r'\\section\*\{(.+?)\}', self.tex_content))
+        sections = [sec for sec in self.tokens.find("section", star=False) if sec.args]
+        unnumbered_sections = [sec for sec in self.tokens.find("section", star=True) if sec.args]
 
         numbered_sections = {chapter: [] for chapter in numbered_chapters_formatted}
         unnumbered_sections_dict = {chapter: [] for chapter in numbered_chapters_formatted}
@@ -43,10 +74,10 @@ class LatexParser:
         chapter_index = -1
         section_counter = 0
         for section in sections:
-            section_title = section.group(1)
-            section_pos = section.start()
+            section_title = self.tokens.arg(section)
+            section_pos = section.start
 
-            while chapter_index + 1 < len(chapters) and chapters[chapter_index + 1].start() < section_pos:
+            while chapter_index + 1 < len(chapters) and chapters[chapter_index + 1].start < section_pos:
                 chapter_index += 1
                 section_counter = 0
 
@@ -56,35 +87,24 @@ class LatexParser:
                 numbered_sections[chapter_name].append(
                     f"{chapter_index + 1}.{section_counter} раздел '{section_title}'")
 
+        chapter_starts = [chap.start for chap in chapters]
         for section in unnumbered_sections:
-            section_title = section.group(1)
-            section_pos = section.start()
-
-            chapter_idx = -1
-            for idx, chap in enumerate(chapters):
-                if chap.start() > section_pos:
-                    break
-                chapter_idx = idx
-
+            chapter_idx = bisect_right(chapter_starts, section.start) - 1
             if chapter_idx >= 0:
                 chapter_name = numbered_chapters_formatted[chapter_idx]
-                unnumbered_sections_dict[chapter_name].append(section_title)
+                unnumbered_sections_dict[chapter_name].append(self.tokens.arg(section))
 
         return {
             "numbered_chapters": numbered_chapters_formatted,
-            "unnumbered_chapters": re.findall(r'\\chapter\*\{(.+?)\}', self.tex_content),
+            "unnumbered_chapters": [self.tokens.arg(ch) for ch in self.tokens.find("chapter", star=True) if ch.args],
             "numbered_sections": numbered_sections,
             "unnumbered_sections": unnumbered_sections_dict,
         }
 
     def parse_title_and_toc(self):
-        title_pattern = r"\\includepdf.*\{.*?\}"
-        toc_pattern = r"\\tableofcontents"
-        begin_doc_pattern = r"\\begin\{document\}"
-
-        begin_match = re.search(begin_doc_pattern, self.tex_content)
-        title_match = re.search(title_pattern, self.tex_content)
-        toc_match = re.search(toc_pattern, self.tex_content)
+        begin_match = next((cmd for cmd in self.tokens.find("begin") if self.tokens.arg(cmd) == "document"), None)
+        title_match = next((cmd for cmd in self.tokens.find("includepdf") if cmd.args), None)
+        toc_match = self.tokens.first("tableofcontents")
 
         # Добавляем титульный лист в структуру, если найден
         if title_match:
@@ -101,42 +121,73 @@ class LatexParser:
             self.errors.append("Отсутствует \\tableofcontents после титульного листа.")
 
         # Проверяем порядок следования команд
-        if title_match and begin_match and title_match.start() < begin_match.start():
+        if title_match and begin_match and title_match.start < begin_match.start:
             self.errors.append("Титульный лист должен подключаться после \\begin{document}.")
         if title_match and toc_match:
-            between_text = self.tex_content[title_match.end():toc_match.start()]
-            allowed_text = re.sub(r'%.+?\n', '', between_text).strip()
+            between_text = self.tex_content[title_match.end:toc_match.start]
+            allowed_text = patterns.LATEX_LINE_COMMENT.sub('', between_text).strip()
             if allowed_text and allowed_text != "\\setcounter{page}{2}":
                 self.errors.append(
                     "Между \\includepdf и \\tableofcontents допускаются только комментарии или \\setcounter{page}{2}.")
 
     def parse_addcontentsline(self):
-        chapter_star_pattern = re.finditer(r"\\chapter\*\{(.+?)\}", self.tex_content)
-        addcontents_pattern = r"\\addcontentsline\{toc\}\{chapter\}\{(.+?)\}"
-
-        for match in chapter_star_pattern:
-            start_pos = match.end()
-            following_text = self.tex_content[start_pos:]
-            add_match = re.search(addcontents_pattern, following_text)
-            if not add_match or add_match.start() > 100:
+        addcontents = [cmd for cmd in self.tokens.find("addcontentsline")
+                       if len(cmd.args) >= 3 and self.tokens.arg(cmd, 0) == "toc" and self.tokens.arg(cmd, 1) == "chapter"]
+        addcontents_starts = [cmd.start for cmd in addcontents]
+
+        for chapter in self.tokens.find("chapter", star=True):
+            if not chapter.args:
+                continue
+            start_pos = chapter.end
+            index = bisect_left(addcontents_starts, start_pos)
+            if index == len(addcontents) or addcontents[index].start - start_pos > 100:
                 self.errors.append(
-                    f"После \\chapter*{{{match.group(1)}}} отсутствует соответствующая команда \\addcontentsline."
+                    f"После \\chapter*{{{self.tokens.arg(chapter)}}} отсутствует соответствующая команда \\addcontentsline."
+                    f"{self.location(chapter.start)}"
                 )
 
+    def introduction_range(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Границы введения: начало \\chapter*{ВВЕДЕНИЕ}, начало его текста
+        и конец (сразу после имени следующей команды \\chapter)
+        """
+        for chapter in self.tokens.find("chapter", star=True):
+            if chapter.args and self.tokens.arg(chapter).lower() == "введение":
+                next_chapter = self.tokens.first("chapter", start=chapter.end)
+                if next_chapter is None:
+                    return None
+                return chapter.start, chapter.end, next_chapter.start + len("\\chapter")
+        return None
+
+    def bold_groups(self, start: int = 0, end: int = None) -> List[Tuple[int, int]]:
+        """Содержимое групп вида {\\bf ...} в диапазоне [start, end)"""
+        groups = []
+        for command in self.tokens.find("bf", start=start, end=end):
+            open_pos = command.start - 1
+            close_pos = self.tokens.group_end(open_pos) if open_pos >= start else None
+            if close_pos is None or command.name_end >= len(self.tex_content):
+                continue
+            if self.tex_content[open_pos] == "{" and self.tex_content[command.name_end].isspace():
+                groups.append((command.name_end, close_pos))
+        return groups
+
     def parse_introduction(self):
         # Ищем содержимое главы "ВВЕДЕНИЕ"
-        match = re.search(r'\\chapter\*{ВВЕДЕНИЕ}([\s\S]*?)\\chapter', self.tex_content, re.DOTALL | re.IGNORECASE)
-        if not match:
+        intro = self.introduction_range()
+        if not intro:
             self.errors.append("Не удалось найти текст введения.")
             return []
 
-        introduction_text = match.group(1)
+        _, intro_start, intro_end = intro
+        body_end = intro_end - len("\\chapter")
 
         # Ищем жирные фразы в \textbf{...}
-        bold_phrases = re.findall(r'\\textbf\{([^}]*)\}', introduction_text)
+        bold_phrases = [self.tokens.arg(cmd) for cmd in self.tokens.find("textbf", start=intro_start, end=body_end)
+                        if cmd.args and cmd.args[0][0] == cmd.name_end + 1 and cmd.end <= body_end]
 
         # Ищем жирные фразы в {\bf ...}
-        bold_phrases += re.findall(r'\{\\bf\s+([^}]*)\}', introduction_text)
+        bold_phrases += [self.tex_content[start:end] for start, end in self.bold_groups(intro_start, body_end)
+                         if end < body_end]
 
         # Удаляем лишние пробелы и фильтруем пустые строки
         bold_phrases = [phrase.strip() for phrase in bold_phrases if phrase.strip()]
@@ -144,39 +195,42 @@ class LatexParser:
         return bold_phrases
 
     def parse_lists(self):
-        list_types = ['enumarabic', 'enumasbuk', 'enummarker']  # +nested maybe
+        list_types = patterns.LATEX_LIST_TYPES  # +nested maybe
         lists = {list_type: [] for list_type in list_types}
 
-        def find_environment_blocks(content, env_name):
-            pattern = re.compile(rf'\\begin\{{{env_name}\}}|\\end\{{{env_name}\}}')
-            matches = list(pattern.finditer(content))
-            blocks = []
-
-            stack = []
-            for match in matches:
-                if match.group() == f'\\begin{{{env_name}}}':
-                    stack.append(match.start())
-                elif match.group() == f'\\end{{{env_name}}}' and stack:
-                    start = stack.pop()
-                    end = match.end()
-                    block = content[start:end]
-
-                    # before = content[:start].rsplit('.', 1)[-1]
-                    before_match = re.search(
-                        r'((?:\\textbf\{[^}]+?\}|\\bf\s*\{[^}]+?\}|{\\bf\s+[^}]+?}|[^.?!:\n]+[.?!:]))\s*$',
-                        content[:start])
-                    before_text = before_match.group(1).strip() if before_match else ""
-                    full_block = f"{before_text}\n{block}".strip()
-                    blocks.append(full_block)
-
-            return blocks
-
         for list_type in list_types:
-            env_blocks = find_environment_blocks(self.tex_content, list_type)
-            lists[list_type].extend(env_blocks)
+            for env in self.tokens.find_environments(list_type):
+                block = self.tex_content[env.start:env.end]
+                before_text = self.find_list_intro(self.tex_content, env.start)
+                lists[list_type].append(f"{before_text}\n{block}".strip())
 
         return lists
 
+    @staticmethod
+    def find_list_intro(content: str, start: int) -> str:
+        """
+        Вводная фраза, непосредственно предшествующая списку.
+        Фраза заканчивается на последнем непробельном символе перед списком, поэтому
+        шаблон LATEX_LIST_INTRO ищется только в окне после ближайшего разделителя,
+        а не во всем тексте до списка.
+        """
+        end = start
+        while end > 0 and content[end - 1].isspace():
+            end -= 1
+        if end == 0:
+            return ""
+
+        last_char = content[end - 1]
+        if last_char in ".?!:":
+            window_start = max(content.rfind(char, 0, end - 1) for char in ".?!:\n") + 1
+        elif last_char == "}":
+            window_start = content.rfind("}", 0, end - 1) + 1
+        else:
+            return ""
+
+        before_match = patterns.LATEX_LIST_INTRO.search(content, window_start, start)
+        return before_match.group(1).strip() if before_match else ""
+
     def parse_pictures(self):
         return {
             "labels": self.parse_picture_labels(),
@@ -187,154 +241,139 @@ class LatexParser:
         labels = []
 
         # Собираем \label внутри \begin{figure}...\end{figure}
-        figure_envs = re.finditer(r'\\begin\{figure\}.*?\\end\{figure\}', self.tex_content, re.DOTALL)
-        for env in figure_envs:
-            content = env.group(0)
-            start_pos = env.start()
+        for env in self.tokens.find_environments_by_start("figure"):
+            for label in self.tokens.find("label", start=env.start, end=env.end):
+                if label.args and label.end <= env.end:
+                    labels.append({
+                        "label": self.tokens.arg(label),
+                        "position": label.start
+                    })
 
-            for match in re.finditer(r'\\label\{([^\}]+)\}', content):
+        # Добавляем \label из \myfigure
+        for figure in self.tokens.find("myfigure"):
+            if len(figure.args) >= 4:
                 labels.append({
-                    "label": match.group(1),
-                    "position": start_pos + match.start()
+                    "label": self.tokens.arg(figure, 3),
+                    "position": figure.start
                 })
 
-        # Добавляем \label из \myfigure
-        for match in re.finditer(r'\\myfigure\{.*?\}\{.*?\}\{.*?\}\{([^\}]+)\}', self.tex_content):
-            labels.append({
-                "label": match.group(1),
-                "position": match.start()
-            })
-
         return labels
 
     def parse_picture_refs(self):
-        refs = []
-
-        for match in re.finditer(r'\\ref\{fig:([^\}]+)\}', self.tex_content):
-            refs.append({
-                "label": match.group(1),
-                "position": match.start()
-            })
+        return self.find_refs("fig:")
 
+    def find_refs(self, prefix: str) -> List[Dict[str, Any]]:
+        """Ссылки \\ref{<prefix>метка}"""
+        refs = []
+        for ref in self.tokens.find("ref"):
+            target = self.tokens.arg(ref)
+            if target and target.startswith(prefix) and len(target) > len(prefix):
+                refs.append({
+                    "label": target[len(prefix):],
+                    "position": ref.start
+                })
         return refs
 
     def parse_all_tables(self):
-        tables_data = {
-            "tables": {
-                "labels": [],
-                "refs": [],
-                "contents": []
-            },
-            "longtables": {
+        tables_data = {}
+
+        # Обычные таблицы (table) и длинные таблицы (longtable)
+        for env_name, key in [("table", "tables"), ("longtable", "longtables")]:
+            prefix = f"{env_name}:"
+            data = {
                 "labels": [],
-                "refs": [],
+                "refs": self.find_refs(prefix),
                 "contents": []
             }
-        }
-
-        # Ссылки на обычные таблицы
-        for match in re.finditer(r'\\ref\{table:([^\}]+)\}', self.tex_content):
-            tables_data["tables"]["refs"].append({
-                "label": match.group(1),
-                "position": match.start()
-            })
 
-        # Ссылки на длинные таблицы
-        for match in re.finditer(r'\\ref\{longtable:([^\}]+)\}', self.tex_content):
-            tables_data["longtables"]["refs"].append({
-                "label": match.group(1),
-                "position": match.start()
-            })
-
-        # Обычные таблицы
-        for env in re.finditer(r'\\begin\{table\}.*?\\end\{table\}', self.tex_content, re.DOTALL):
-            block = env.group(0)
-            start_pos = env.start()
-            tables_data["tables"]["contents"].append({
-                "content": block,
-                "position": start_pos
-            })
-            for label_match in re.finditer(r'\\label\{table:([^\}]+)\}', block):
-                tables_data["tables"]["labels"].append({
-                    "label": label_match.group(1),
-                    "position": start_pos + label_match.start()
+            for env in self.tokens.find_environments_by_start(env_name):
+                data["contents"].append({
+                    "content": self.tex_content[env.start:env.end],
+                    "position": env.start
                 })
+                for label in self.tokens.find("label", start=env.start, end=env.end):
+                    target = self.tokens.arg(label)
+                    if target and target.startswith(prefix) and len(target) > len(prefix) and label.end <= env.end:
+                        data["labels"].append({
+                            "label": target[len(prefix):],
+                            "position": label.start
+                        })
 
-        # Длинные таблицы
-        for env in re.finditer(r'\\begin\{longtable\}.*?\\end\{longtable\}', self.tex_content, re.DOTALL):
-            block = env.group(0)
-            start_pos = env.start()
-            tables_data["longtables"]["contents"].append({
-                "content": block,
-                "position": start_pos
-            })
-            for label_match in re.finditer(r'\\label\{longtable:([^\}]+)\}', block):
-                tables_data["longtables"]["labels"].append({
-                    "label": label_match.group(1),
-                    "position": start_pos + label_match.start()
-                })
+            tables_data[key] = data
 
         return tables_data
 
+    def formatting_positions(self, command_name: str) -> List[int]:
+        """Позиции команд выделения: \\name{ , \\name { и {\\name ...}"""
+        by_command, by_group = self.formatting_position_groups(command_name)
+        return by_command + by_group
+
+    def formatting_position_groups(self, command_name: str) -> Tuple[List[int], List[int]]:
+        """Позиции команд выделения вида \\name{ и \\name { и отдельно - групп вида {\\name ...}"""
+        by_command = []
+        by_group = []
+        for command in self.tokens.find(command_name):
+            rest = self.tex_content[command.name_end:command.name_end + 1]
+            if command_name in ("bf", "it"):
+                # \bf{...} и \bf {...}
+                pos = command.name_end
+                while pos < len(self.tex_content) and self.tex_content[pos].isspace():
+                    pos += 1
+                if self.tex_content[pos:pos + 1] == "{":
+                    by_command.append(command.start)
+                # {\bf ...}
+                if command.start > 0 and self.tex_content[command.start - 1] == "{" and rest.isspace():
+                    by_group.append(command.start - 1)
+            elif rest == "{":
+                by_command.append(command.start)
+        return by_command, by_group
+
     def check_text_formatting_outside_introduction(self):
-        intro_match = re.search(r'\\chapter\*{ВВЕДЕНИЕ}([\s\S]*?)\\chapter', self.tex_content, re.IGNORECASE)
-        if not intro_match:
+        intro = self.introduction_range()
+        if not intro:
             return
 
-        intro_start = intro_match.start()
-        intro_end = intro_match.end()
+        intro_start, _, intro_end = intro
 
         # Исключим блоки с оформлением заголовков приложений (flushright, center)
-        skip_ranges = []
-        for env in ['flushright', 'center']:
-            for match in re.finditer(rf'\\begin\{{{env}\}}([\s\S]*?)\\end\{{{env}\}}', self.tex_content):
-                skip_ranges.append((match.start(), match.end()))
-
-        def in_skipped(pos):
-            return any(start <= pos <= end for start, end in skip_ranges)
+        skip_ranges = self.tokens.environment_index(*patterns.LATEX_FORMATTING_SKIP_ENVIRONMENTS)
 
         # Форматирование и их типы ошибок
-        patterns = {
-            r'\\textbf\{': ('жирный текст', 'вне введения'),
-            r'\\bf\s*\{': ('жирный текст', 'вне введения'),
-            r'{\\bf\s+': ('жирный текст', 'вне введения'),
-            r'\\textit\{': ('курсив', 'в тексте работы'),
-            r'\\it\s*\{': ('курсив', 'в тексте работы'),
-            r'{\\it\s+': ('курсив', 'в тексте работы'),
-            r'\\underline\{': ('подчёркивание', 'в тексте работы'),
-            r'\\emph\{': ('курсив/выделение', 'в тексте работы')
-        }
-
-        for pattern, (desc, error_scope) in patterns.items():
-            for match in re.finditer(pattern, self.tex_content):
-                pos = match.start()
+        for command_name, (desc, error_scope) in patterns.LATEX_FORMATTING_COMMANDS:
+            for pos in self.formatting_positions(command_name):
                 if intro_start <= pos <= intro_end:
                     continue
-                if in_skipped(pos):
+                if pos in skip_ranges:
                     continue
 
                 context = self.tex_content[max(0, pos - 40):pos + 40].replace('\n', ' ')
-                self.errors.append(f"Запрещено использовать команды для '{desc}' {error_scope} --> '...{context}...'")
+                self.errors.append(f"Запрещено использовать команды для '{desc}' {error_scope} --> '...{context}...'"
+                                   f"{self.location(pos)}")
 
     def parse_appendices(self) -> Dict[str, List[Dict[str, str]]]:
-        text = self.tex_content
-
-        # Удалим жирность и похожее форматирование
-        cleaned_text = re.sub(r'{\s*\\bf\s+([^}]*)}', r'\1', text)
-        cleaned_text = re.sub(r'\\textbf{([^}]*)}', r'\1', cleaned_text)
-        cleaned_text = re.sub(r'\\bf\s+', '', cleaned_text)
-
         # --- Парсинг заголовков приложений ---
         appendix_titles = []
-        title_matches = re.findall(
-            r'\\addcontentsline\{toc\}\{section\}\{Приложение\s+([А-Я])(?:\s+([^\}]+))?\}', cleaned_text)
-
-        seen_letters = set()
-        for match in title_matches:
-            letter = match[0]
-            title = match[1].strip() if match[1] else ''
+        appendix_starts = []
+        for command in self.tokens.find("addcontentsline"):
+            if len(command.args) < 3 or self.tokens.arg(command, 0) != "toc" or self.tokens.arg(command, 1) != "section":
+                continue
+
+            # Удалим жирность и похожее форматирование
+            title_text = patterns.LATEX_BF_GROUP_SPACED.sub(r'\1', self.tokens.arg(command, 2))
+            title_text = patterns.LATEX_TEXTBF_GROUP.sub(r'\1', title_text)
+            title_text = patterns.LATEX_BF_SWITCH.sub('', title_text)
+
+            start_match = patterns.LATEX_APPENDIX_HEADING_START.match(title_text)
+            if not start_match:
+                continue
+            appendix_starts.append((start_match.group(1), command.start))
+
+            match = patterns.LATEX_APPENDIX_HEADING.fullmatch(title_text)
+            if not match:
+                continue
+            letter = match.group(1)
+            title = match.group(2).strip() if match.group(2) else ''
 
-            seen_letters.add(letter)
             appendix_titles.append({
                 "letter": letter,
                 "title": title,
@@ -343,17 +382,13 @@ class LatexParser:
 
         # --- Поиск PDF-файлов, включённых через \includepdf ---
         # Привязываем \includepdf к ближайшему предыдущему приложению
-        pdf_matches = list(re.finditer(r'\\includepdf\[.*?\]\{(.*?)\}', cleaned_text))
-        app_matches = list(re.finditer(r'\\addcontentsline\{toc\}\{section\}\{Приложение\s+([А-Я])', cleaned_text))
+        pdf_positions = [cmd.start for cmd in self.tokens.find("includepdf") if cmd.options and cmd.args]
+        last_pdf = pdf_positions[-1] if pdf_positions else -1
 
         pdf_by_letter = set()
-        for app_match in app_matches:
-            app_letter = app_match.group(1)
-            app_pos = app_match.start()
-            for pdf_match in pdf_matches:
-                if pdf_match.start() > app_pos:
-                    pdf_by_letter.add(app_letter)
-                    break  # Привязываем только первое включение PDF к приложению
+        for app_letter, app_pos in appendix_starts:
+            if last_pdf > app_pos:
+                pdf_by_letter.add(app_letter)
 
         # Добавим информацию в appendix_titles
         for app in appendix_titles:
@@ -361,41 +396,37 @@ class LatexParser:
 
         # --- Поиск ссылок на приложения ---
         appendix_links = []
-        link_patterns = [
-            r'\(\s*прил\.?\s*([А-Я])\s*\)',  # (прил. Б)
-            r'\bв\s+приложении\s+([А-Я])\b',  # в приложении Б
-            r'\bиз\s+приложения\s+([А-Я])\b',  # из приложения Б
-            r'\(см\.?\s*прил\.?\s*([А-Я])\)',  # (см. прил. Б)
-        ]
-
-        for pattern in link_patterns:
-            for match in re.finditer(pattern, text, flags=re.IGNORECASE):
-                letter = match.group(1).upper()
-                appendix_links.append({
-                    "letter": letter,
-                    "raw_text": match.group(0)
-                })
+        for pattern in patterns.LATEX_APPENDIX_LINKS:
+            appendix_links += self.find_appendix_links(pattern)
 
         return {
             "appendix_titles": appendix_titles,
             "appendix_links": appendix_links
         }
 
+    def find_appendix_links(self, pattern) -> List[Dict[str, str]]:
+        """Ссылки на приложения по одному из шаблонов LATEX_APPENDIX_LINKS"""
+        return [{"letter": match.group(1).upper(), "raw_text": match.group(0)}
+                for match in pattern.finditer(self.tex_content)]
+
     def parse_bibliography(self):
         # 1. Найти все ссылки на источники вида \cite{ключ}
-        cite_keys = re.findall(r'\\cite\{(.*?)\}', self.tex_content)
+        cite_keys = [self.tokens.arg(cmd) for cmd in self.tokens.find("cite") if cmd.args]
 
         # 2. Найти блок библиографии
-        bib_match = re.search(r'\\begin{thebibliography}.*?\\end{thebibliography}', self.tex_content, re.DOTALL)
+        environments = self.tokens.find_environments_by_start("thebibliography")
         bibliography_items = []
 
-        if bib_match:
-            bib_block = bib_match.group(0)
+        if environments:
+            bib_env = environments[0]
 
             # 3. Извлечь каждый элемент \bibitem{ключ} текст
-            for match in re.finditer(r'\\bibitem\{(.*?)\}\s*([\s\S]*?)(?=\\bibitem|\Z)', bib_block):
-                key = match.group(1).strip()
-                content = match.group(2).strip().replace('\n', ' ').replace('\\break', '').strip()
+            items = [item for item in self.tokens.find("bibitem", start=bib_env.start, end=bib_env.end) if item.args]
+            for index, item in enumerate(items):
+                key = self.tokens.arg(item).strip()
+                content_end = items[index + 1].start if index + 1 < len(items) else bib_env.end
+                content = self.tex_content[item.end:content_end]
+                content = content.strip().replace('\n', ' ').replace('\\break', '').strip()
                 bibliography_items.append({'key': key, 'text': content})
 
         return {
@@ -411,31 +442,8 @@ class LatexParser:
         3. «„...”» (вложенные лапки внутри елочек)
         Все остальные виды кавычек считаются ошибочными.
         """
-        allowed_patterns = [
-            r'«[^«»„“”"\'<<>>]*?»',               # простые елочки
-            r'<<[^«»„“”"\'<<>>]*?>>',             # альтернативные елочки
-            r'«[^«»„“”"\'<<>>]*?„[^«»„“”"\'<<>>]+?“[^«»„“”"\'<<>>]*?»',               # вложенные лапки в елочках
-            r'<<[^«»„“”"\'<<>>]*?„[^«»„“”"\'<<>>]+?“[^«»„“”"\'<<>>]*?>>',
-        ]
-
-        # Объединяем допустимые шаблоны
-        allowed_combined = "|".join(f"({p})" for p in allowed_patterns)
-        allowed_regex = re.compile(allowed_combined)
-
-        # Удалим все допустимые кавычки
-        clean_text = re.sub(allowed_regex, '', self.tex_content)
-
-        disallowed_patterns = [
-            r'"[^"]+?"',         # английские двойные
-            r"'[^']+?'",         # английские одинарные
-            r'“[^”]+?”',         # типографские двойные
-            r'”[^“]+?“',         # перевернутые типографские
-            r'„[^“]+?“',         # немецкие кавычки без внешних елочек
-            r'“[^„]+?“',         # вложенные без внешних
-        ]
-
-        for pattern in disallowed_patterns:
-            for match in re.finditer(pattern, clean_text):
-                context = self.tex_content[max(0, match.start()-20):match.end()+20]
-                self.errors.append(f"Найдены недопустимые кавычки --> ...{match.group()}. Разрешены «...» и вложенные «„...“».")
+        for start, end in QuoteScanner.scan(self.tex_content):
+            self.errors.append(
+                f"Найдены недопустимые кавычки --> ...{self.tex_content[start:end]}. Разрешены «...» и вложенные «„...“»."
+                f"{self.location(start)}")
 
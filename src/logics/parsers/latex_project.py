@@ -0,0 +1,180 @@
+import hashlib
+import posixpath
+import threading
+import zipfile
+from bisect import bisect_right
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import Callable, List, Optional, Tuple
+
+from src.core.validator import OperationException
+from src.logics.parsers import patterns
+
+
+class SourceMap:
+    """
+    Соответствие позиций в собранном тексте проекта файлам и строкам.
+    Хранится только начало каждого непрерывного фрагмента файла: (позиция в тексте, файл, номер строки);
+    строка внутри фрагмента вычисляется подсчетом переводов строк.
+    """
+
+    def __init__(self):
+        self.__offsets: List[int] = []
+        self.__segments: List[Tuple[str, int]] = []
+        self.text = ""
+
+    def add(self, offset: int, file_name: str, line: int):
+        if self.__offsets and self.__offsets[-1] == offset:
+            # Пустой фрагмент заменяется следующим
+            self.__segments[-1] = (file_name, line)
+            return
+        self.__offsets.append(offset)
+        self.__segments.append((file_name, line))
+
+    def locate(self, pos: int) -> Optional[Tuple[str, int]]:
+        """Файл и номер строки для позиции в собранном тексте"""
+        index = bisect_right(self.__offsets, pos) - 1
+        if index < 0:
+            return None
+        file_name, line = self.__segments[index]
+        return file_name, line + self.text.count("\n", self.__offsets[index], pos)
+
+    def __len__(self):
+        return len(self.__offsets)
+
+
+class LatexProject:
+    """
+    LaTeX-проект из нескольких файлов (zip-архив или каталог).
+    Основной файл собирается в один текст: \\input и \\include заменяются содержимым подключаемых файлов,
+    файлы читаются только при подключении. Комментарии удаляются до разбора подключений,
+    поэтому закомментированные \\input не учитываются. Для \\includepdf проверяется наличие файла.
+    Подготовленный текст каждого файла кэшируется по хэшу содержимого.
+    """
+    MAIN_FILE = "main.tex"
+    CACHE_SIZE = 256
+
+    __prepared: OrderedDict = OrderedDict()  # sha256 содержимого -> (текст без комментариев, подключения)
+    __lock = threading.Lock()
+
+    def __init__(self, names: List[str], reader: Callable[[str], bytes], main: str = None):
+        self.names = {PurePosixPath(name).as_posix() for name in names}
+        self.__reader = reader
+        self.main = main if main is not None else self.find_main()
+
+    @classmethod
+    def from_zip(cls, content: bytes, main: str = None) -> "LatexProject":
+        try:
+            archive = zipfile.ZipFile(BytesIO(content))
+        except zipfile.BadZipFile as ex:
+            raise OperationException(f"Некорректный zip-архив: {ex}")
+        names = [info.filename for info in archive.infolist()
+                 if not info.is_dir() and "__MACOSX" not in PurePosixPath(info.filename).parts]
+        return cls(names, archive.read, main)
+
+    @classmethod
+    def from_directory(cls, directory: str, main: str = None) -> "LatexProject":
+        root = Path(directory)
+        names = [path.relative_to(root).as_posix() for path in root.rglob("*") if path.is_file()]
+        return cls(names, lambda name: (root / name).read_bytes(), main)
+
+    def read(self, name: str) -> bytes:
+        return self.__reader(name)
+
+    def find_main(self) -> str:
+        """Основной файл: .tex с \\documentclass; при нескольких - main.tex или файл ближе к корню"""
+        candidates = sorted((name for name in self.names if name.lower().endswith(".tex")),
+                            key=lambda name: (PurePosixPath(name).name != self.MAIN_FILE, name.count("/"), name))
+        for name in candidates:
+            text, _ = self.prepare(self.read(name))
+            if patterns.LATEX_DOCUMENTCLASS.search(text):
+                return name
+        raise OperationException("В проекте не найден основной .tex файл (с \\documentclass)")
+
+    def find_sty(self) -> Optional[bytes]:
+        """Файл стиля проекта: settings.sty или единственный .sty"""
+        sty_names = sorted(name for name in self.names if name.lower().endswith(".sty"))
+        preferred = [name for name in sty_names if PurePosixPath(name).name == "settings.sty"]
+        if preferred or len(sty_names) == 1:
+            return self.read((preferred or sty_names)[0])
+        return None
+
+    @classmethod
+    def prepare(cls, content: bytes) -> Tuple[str, Tuple[Tuple[int, int, str, str], ...]]:
+        """
+        Текст файла без комментариев и его подключения (начало, конец, команда, путь).
+        Результат кэшируется по хэшу содержимого, поэтому общий файл разбирается один раз.
+        """
+        key = hashlib.sha256(content).hexdigest()
+        with cls.__lock:
+            if key in cls.__prepared:
+                cls.__prepared.move_to_end(key)
+                return cls.__prepared[key]
+
+        # Комментарии удаляются до конца строки, переводы строк сохраняются - номера строк не меняются
+        text = patterns.LATEX_COMMENT.sub('', content.decode("utf-8"))
+        includes = tuple((match.start(), match.end(), match.group(1), match.group(2).strip())
+                         for match in patterns.LATEX_FILE_INCLUDE.finditer(text))
+
+        with cls.__lock:
+            cls.__prepared[key] = (text, includes)
+            while len(cls.__prepared) > cls.CACHE_SIZE:
+                cls.__prepared.popitem(last=False)
+        return text, includes
+
+    def resolve(self, target: str, command: str, current: str) -> Optional[str]:
+        """Файл проекта для пути из \\input/\\include: относительно основного файла, затем текущего"""
+        candidates = [target]
+        if command != "includepdf" and not target.lower().endswith(".tex"):
+            candidates = [f"{target}.tex"] if command == "include" else [f"{target}.tex", target]
+
+        bases = [posixpath.dirname(self.main), posixpath.dirname(current)]
+        for base in dict.fromkeys(bases):
+            for candidate in candidates:
+                name = posixpath.normpath(posixpath.join(base, candidate))
+                if name in self.names:
+                    return name
+        return None
+
+    def expand(self) -> Tuple[str, SourceMap, List[str]]:
+        """Собранный текст проекта, карта исходных позиций и ошибки подключения файлов"""
+        parts: List[str] = []
+        source_map = SourceMap()
+        errors: List[str] = []
+        self.__expand(self.main, [], parts, source_map, errors, 0)
+        source_map.text = "".join(parts)
+        return source_map.text, source_map, errors
+
+    def __expand(self, name: str, stack: List[str], parts: List[str], source_map: SourceMap,
+                 errors: List[str], offset: int) -> int:
+        text, includes = self.prepare(self.read(name))
+        stack.append(name)
+
+        cursor, line = 0, 1
+        for start, end, command, target in includes:
+            source_map.add(offset, name, line)
+            if command == "includepdf":
+                # PDF не разбирается: команда остается в тексте, проверяется только наличие файла
+                if self.resolve(target, command, name) is None:
+                    errors.append(f"Не найден файл {target}, подключенный в {name} через \\includepdf")
+                parts.append(text[cursor:end])
+                offset += end - cursor
+            else:
+                parts.append(text[cursor:start])
+                offset += start - cursor
+                included = self.resolve(target, command, name)
+                if included is None:
+                    errors.append(f"Не найден файл {target}, подключенный в {name} через \\{command}")
+                elif included in stack:
+                    errors.append(f"Циклическое подключение {included} в {name}")
+                else:
+                    offset = self.__expand(included, stack, parts, source_map, errors, offset)
+            line += text.count("\n", cursor, end)
+            cursor = end
+
+        source_map.add(offset, name, line)
+        parts.append(text[cursor:])
+        offset += len(text) - cursor
+        stack.pop()
+        return offset
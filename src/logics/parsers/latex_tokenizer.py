@@ -0,0 +1,204 @@
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, NamedTuple, Tuple
+
+from src.logics.parsers.interval_index import IntervalIndex
+
+# Команды (\name, \name*, управляющие символы вроде \{ и \\) и фигурные скобки
+_TOKEN = re.compile(r'\\(?:([a-zA-Z]+)(\*?)|.)|[{}]', re.DOTALL)
+
+
+class LatexCommand(NamedTuple):
+    """Команда LaTeX с аргументами, идущими сразу за ней"""
+    name: str
+    star: bool
+    start: int
+    end: int  # конец команды вместе с аргументами
+    name_end: int  # конец имени команды (и звездочки)
+    args: Tuple[Tuple[int, int], ...]  # содержимое аргументов {...} без скобок
+    options: Tuple[Tuple[int, int], ...]  # содержимое необязательных аргументов [...]
+
+
+class LatexEnvironment(NamedTuple):
+    """Окружение \\begin{name} ... \\end{name}"""
+    name: str
+    start: int  # начало \begin
+    end: int  # конец \end{name}
+    body_start: int
+    body_end: int
+
+
+class LatexTokenizer:
+    """
+    Однопроходный разбор текста LaTeX на команды, окружения и группы в фигурных скобках.
+    Все позиции - смещения в исходной строке, вложенные скобки учитываются.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.groups: Dict[int, int] = {}  # позиция "{" -> позиция парной "}"
+        self.commands: List[LatexCommand] = []
+        self.environments: List[LatexEnvironment] = []  # в порядке закрытия
+        # Все скобки и необязательные аргументы закрыты внутри текста: команды и группы фрагмента
+        # совпадают с разбором того же фрагмента в составе документа (см. merge)
+        self.balanced = True
+        # Имена окружений, у которых в тексте нет парной \begin или \end
+        self.unpaired_environments = set()
+        self.__tokenize()
+        self.__index()
+
+    @classmethod
+    def merge(cls, content: str, parts: List[Tuple[int, "LatexTokenizer"]]) -> "LatexTokenizer":
+        """
+        Разбор документа из разборов его последовательных фрагментов (смещение фрагмента, разбор).
+        Окружения сопоставляются заново по всему документу. Совпадает с LatexTokenizer(content),
+        если все фрагменты, кроме последнего, сбалансированы (balanced).
+        """
+        tokenizer = cls.__new__(cls)
+        tokenizer.content = content
+        tokenizer.groups = {}
+        tokenizer.commands = []
+        tokenizer.balanced = all(part.balanced for _, part in parts)
+        for offset, part in parts:
+            if not offset:
+                tokenizer.groups.update(part.groups)
+                tokenizer.commands += part.commands
+                continue
+            tokenizer.groups.update((start + offset, end + offset) for start, end in part.groups.items())
+            tokenizer.commands += [
+                LatexCommand(command.name, command.star, command.start + offset, command.end + offset,
+                             command.name_end + offset, cls.__shift_spans(command.args, offset),
+                             cls.__shift_spans(command.options, offset))
+                for command in part.commands]
+        tokenizer.__index()
+        return tokenizer
+
+    @staticmethod
+    def __shift_spans(spans: Tuple[Tuple[int, int], ...], offset: int) -> Tuple[Tuple[int, int], ...]:
+        return tuple((start + offset, end + offset) for start, end in spans)
+
+    def __tokenize(self):
+        content = self.content
+        stack = []
+        raw_commands = []
+
+        for match in _TOKEN.finditer(content):
+            token = match.group()
+            if token == "{":
+                stack.append(match.start())
+            elif token == "}":
+                if stack:
+                    self.groups[stack.pop()] = match.start()
+            elif match.group(1):
+                raw_commands.append((match.group(1), bool(match.group(2)), match.start(), match.end()))
+        if stack:
+            self.balanced = False
+
+        # Аргументы читаются после сопоставления всех скобок
+        self.commands = [self.__read_arguments(*command) for command in raw_commands]
+
+    def __index(self):
+        """Индекс команд по имени и окружения по парам \\begin и \\end"""
+        self.__by_name: Dict[str, List[LatexCommand]] = {}
+        for command in self.commands:
+            self.__by_name.setdefault(command.name, []).append(command)
+
+        self.environments = []
+        self.unpaired_environments = set()
+        environment_stack: Dict[str, List[LatexCommand]] = {}
+        markers = heapq.merge(self.__by_name.get("begin", []), self.__by_name.get("end", []),
+                              key=lambda command: command.start)
+        for command in markers:
+            if not command.args:
+                continue
+            env_name = self.text(command.args[0])
+            if command.name == "begin":
+                environment_stack.setdefault(env_name, []).append(command)
+                continue
+            opened = environment_stack.get(env_name)
+            if opened:
+                begin = opened.pop()
+                self.environments.append(LatexEnvironment(env_name, begin.start, command.end, begin.end,
+                                                          command.start))
+            else:
+                self.unpaired_environments.add(env_name)
+        self.unpaired_environments.update(name for name, opened in environment_stack.items() if opened)
+
+        self.__environments_by_name: Dict[str, List[LatexEnvironment]] = {}
+        for environment in self.environments:
+            self.__environments_by_name.setdefault(environment.name, []).append(environment)
+
+        # Окружения одного типа в порядке начала (для поиска по позиции)
+        self.__environment_starts = {
+            name: sorted(envs, key=lambda env: env.start) for name, envs in self.__environments_by_name.items()
+        }
+
+    def __read_arguments(self, name: str, star: bool, start: int, name_end: int) -> LatexCommand:
+        """Аргументы {...} и [...], идущие непосредственно за командой"""
+        content = self.content
+        args = []
+        options = []
+        pos = name_end
+
+        while pos < len(content):
+            char = content[pos]
+            if char == "{":
+                close = self.groups.get(pos)
+                if close is None:
+                    break
+                args.append((pos + 1, close))
+                pos = close + 1
+            elif char == "[" and not args:
+                close = content.find("]", pos)
+                if close == -1:
+                    self.balanced = False
+                    break
+                options.append((pos + 1, close))
+                pos = close + 1
+            else:
+                break
+
+        return LatexCommand(name, star, start, pos, name_end, tuple(args), tuple(options))
+
+    def text(self, span: Tuple[int, int]) -> str:
+        return self.content[span[0]:span[1]]
+
+    def arg(self, command: LatexCommand, index: int = 0) -> Optional[str]:
+        """Текст аргумента команды или None, если аргумента нет"""
+        if index < len(command.args):
+            return self.text(command.args[index])
+        return None
+
+    def find(self, name: str, star: Optional[bool] = None, start: int = 0, end: int = None) -> List[LatexCommand]:
+        """Команды с указанным именем в диапазоне [start, end) в порядке следования"""
+        commands = self.__by_name.get(name, [])
+        if start or end is not None:
+            low = bisect_left(commands, start, key=lambda command: command.start)
+            high = len(commands) if end is None else bisect_left(commands, end, key=lambda command: command.start)
+            commands = commands[low:high]
+        if star is not None:
+            commands = [command for command in commands if command.star == star]
+        return commands
+
+    def first(self, name: str, star: Optional[bool] = None, start: int = 0) -> Optional[LatexCommand]:
+        commands = self.find(name, star, start)
+        return commands[0] if commands else None
+
+    def find_environments(self, name: str) -> List[LatexEnvironment]:
+        """Окружения с указанным именем в порядке закрытия (вложенные раньше внешних)"""
+        return self.__environments_by_name.get(name, [])
+
+    def find_environments_by_start(self, name: str) -> List[LatexEnvironment]:
+        """Окружения с указанным именем в порядке следования в тексте"""
+        return self.__environment_starts.get(name, [])
+
+    def environment_index(self, *names: str) -> IntervalIndex:
+        """Индекс отрезков, занятых окружениями с указанными именами (от \\begin до конца \\end)"""
+        return IntervalIndex(
+            (env.start, env.end) for name in names for env in self.__environments_by_name.get(name, [])
+        )
+
+    def group_end(self, open_pos: int) -> Optional[int]:
+        """Позиция закрывающей скобки для "{" в позиции open_pos"""
+        return self.groups.get(open_pos)
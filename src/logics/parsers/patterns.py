@@ -0,0 +1,110 @@
+"""
+Предкомпилированные регулярные выражения, общие для парсеров и проверок.
+Шаблоны компилируются один раз при импорте модуля и не зависят от внутреннего кэша re.
+"""
+import re
+
+# --- LaTeX: общие ---
+# Команды, окружения и их аргументы разбирает LatexTokenizer, здесь - шаблоны для текста
+LATEX_COMMENT = re.compile(r'(?<!\\)%.*')
+LATEX_LINE_COMMENT = re.compile(r'%.+?\n')
+LATEX_COMMAND = re.compile(r"\\[a-zA-Z]+\s*")
+LATEX_BRACES = re.compile(r"{|}")
+
+# --- LaTeX: проекты из нескольких файлов ---
+# \input{file}, \include{file}, \includepdf[...]{file.pdf}
+LATEX_FILE_INCLUDE = re.compile(r'\\(input|include|includepdf)(?![a-zA-Z])\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}')
+LATEX_DOCUMENTCLASS = re.compile(r'\\documentclass(?![a-zA-Z])')
+
+# --- LaTeX: повторная проверка по главам ---
+# Начало строки, с которой начинается \chapter (граница фрагмента документа)
+LATEX_CHAPTER_LINE = re.compile(r'^(?=[ \t]*\\chapter(?![a-zA-Z]))', re.MULTILINE)
+
+# --- LaTeX: выделение текста ---
+LATEX_TEXTBF_GROUP = re.compile(r'\\textbf\{([^}]*)\}')
+LATEX_BF_GROUP_NONEMPTY = re.compile(r"{\\bf\s+([^}]+)}")
+LATEX_TEXTBF_GROUP_NONEMPTY = re.compile(r"\\textbf\{([^}]+)\}")
+LATEX_BF_GROUP_SPACED = re.compile(r'{\s*\\bf\s+([^}]*)}')
+LATEX_BF_SWITCH = re.compile(r'\\bf\s+')
+
+# Команды форматирования, запрещенные вне введения, и тип ошибки для каждой
+LATEX_FORMATTING_COMMANDS = [
+    ('textbf', ('жирный текст', 'вне введения')),
+    ('bf', ('жирный текст', 'вне введения')),
+    ('textit', ('курсив', 'в тексте работы')),
+    ('it', ('курсив', 'в тексте работы')),
+    ('underline', ('подчёркивание', 'в тексте работы')),
+    ('emph', ('курсив/выделение', 'в тексте работы')),
+]
+
+# Окружения с оформлением заголовков приложений, в которых форматирование разрешено
+LATEX_FORMATTING_SKIP_ENVIRONMENTS = ['flushright', 'center']
+
+# --- LaTeX: списки ---
+LATEX_LIST_TYPES = ['enumarabic', 'enumasbuk', 'enummarker']
+LATEX_LIST_INTRO = re.compile(
+    r'((?:\\textbf\{[^}]+?\}|\\bf\s*\{[^}]+?\}|{\\bf\s+[^}]+?}|[^.?!:\n]+[.?!:]))\s*$')
+LATEX_NESTED_LIST = re.compile(r"\\begin\{enum[a-z]+\}.*?\\begin\{enum[a-z]+\}", re.DOTALL)
+LATEX_LIST_BEFORE = re.compile(r"(.+?)\\begin\{enum[a-z]+\}", re.DOTALL)
+LATEX_LIST_ITEM = re.compile(r"\\item (.+?)(?=(\\item|\\end\{))", re.DOTALL)
+LATEX_ITEM = re.compile(r"\\item")
+
+# --- LaTeX: приложения ---
+# Применяются к третьему аргументу \addcontentsline{toc}{section}{...}
+LATEX_APPENDIX_HEADING = re.compile(r'Приложение\s+([А-Я])(?:\s+([^\}]+))?')
+LATEX_APPENDIX_HEADING_START = re.compile(r'Приложение\s+([А-Я])')
+LATEX_APPENDIX_LINKS = [
+    re.compile(r'\(\s*прил\.?\s*([А-Я])\s*\)', re.IGNORECASE),  # (прил. Б)
+    re.compile(r'\bв\s+приложении\s+([А-Я])\b', re.IGNORECASE),  # в приложении Б
+    re.compile(r'\bиз\s+приложения\s+([А-Я])\b', re.IGNORECASE),  # из приложения Б
+    re.compile(r'\(см\.?\s*прил\.?\s*([А-Я])\)', re.IGNORECASE),  # (см. прил. Б)
+]
+
+# --- LaTeX: кавычки ---
+# Символы, с которых начинаются любые кавычки (включая допустимые «...» и <<...>>)
+LATEX_QUOTE_CANDIDATE = re.compile(r'[«<„“”"\']')
+# Символы, которые не могут встречаться внутри допустимых кавычек
+LATEX_QUOTE_SPECIAL = re.compile(r'[«»„“”"\'<>]')
+# Недопустимые кавычки: (открывающая, закрывающая, символы, запрещенные внутри)
+LATEX_DISALLOWED_QUOTE_PAIRS = [
+    ('"', '"', '"'),  # английские двойные
+    ("'", "'", "'"),  # английские одинарные
+    ('“', '”', '”'),  # типографские двойные
+    ('”', '“', '“'),  # перевернутые типографские
+    ('„', '“', '“'),  # немецкие кавычки без внешних елочек
+    ('“', '“', '„'),  # вложенные без внешних
+]
+
+# --- DOCX: структура и списки ---
+DOCX_NUMBERED_HEADING = re.compile(r"^\d+(\.\d+)?")
+DOCX_CHAPTER = re.compile(r"^\d+\s")
+DOCX_SECTION = re.compile(r"^\d+\.\d+")
+DOCX_HEADING_END_PUNCTUATION = re.compile(r"[.:;!?–—-]$")
+DOCX_DASH = re.compile(r"[–—-]")
+DOCX_NUMBERED_ITEM = re.compile(r"^(\d+)[\.\)]\s+(.+)")
+DOCX_BULLETED_ITEM = re.compile(r"^[•\-–—]\s+(.+)")
+
+# --- DOCX: ссылки и подписи ---
+DOCX_PICTURE_REFERENCES = [
+    re.compile(r"\(рис\.?\s*(\d+)\)", re.IGNORECASE),  # (Рис. 4)
+    re.compile(r"\(см\.?\s*рис\.?\s*(\d+)\)", re.IGNORECASE),  # (см. рис. 4)
+    re.compile(r"на\s+рисунке\s+(\d+)", re.IGNORECASE),  # на рисунке 4
+]
+DOCX_PICTURE_CAPTION = re.compile(r"^Рисунок\s+(\d+)\s*([-–—])\s*(.+)")
+DOCX_TABLE_REFERENCES = [
+    re.compile(r"\(табл\.?\s*(\d+)\)", re.IGNORECASE),  # (табл. 1)
+    re.compile(r"\(см\.?\s*табл\.?\s*(\d+)\)", re.IGNORECASE),  # (см. табл. 1)
+    re.compile(r"в\s+таблице\s+(\d+)", re.IGNORECASE),  # в таблице 1
+    re.compile(r"из\s+таблицы\s+(\d+)", re.IGNORECASE),  # из таблицы 1
+]
+DOCX_TABLE_CAPTION = re.compile(r"Таблица\s+\d+", re.IGNORECASE)
+DOCX_NUMBER = re.compile(r"\d+")
+DOCX_APPENDIX_REFERENCES = [
+    re.compile(r"\(прил\.?\s*([А-ЯA-Z])\)", re.IGNORECASE),  # (прил. А)
+    re.compile(r"\(см\.?\s*прил\.?\s*([А-ЯA-Z])\)", re.IGNORECASE),  # (см. прил. А)
+    re.compile(r"в\s+приложении\s+([А-ЯA-Z])", re.IGNORECASE),  # в приложении А
+    re.compile(r"из\s+приложения\s+([А-ЯA-Z])", re.IGNORECASE),  # из приложения А
+]
+DOCX_APPENDIX_TITLE = re.compile(r"Приложение\s+([А-ЯA-Z])", re.IGNORECASE)
+DOCX_BIBLIOGRAPHY_REFERENCE = re.compile(r"\[\d{1,2}\]")
+DOCX_NON_DIGITS = re.compile(r"[^\d]")
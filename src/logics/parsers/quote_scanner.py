@@ -0,0 +1,112 @@
+from typing import List, Optional, Tuple
+
+from src.logics.parsers import patterns
+
+
+class _QuotePairState:
+    """Состояние поиска одного вида недопустимых кавычек: открывающая, закрывающая и запрещенные внутри символы"""
+
+    def __init__(self, opening: str, closing: str, forbidden: str):
+        self.opening = opening
+        self.closing = closing
+        self.forbidden = forbidden
+        self.start: Optional[int] = None
+        self.has_body = False
+        self.spans: List[Tuple[int, int]] = []
+
+    def feed(self, char: str, pos: int) -> None:
+        if self.start is not None:
+            if char == self.closing and self.has_body:
+                self.spans.append((self.start, pos + 1))
+                self.start = None
+                return
+            if char not in self.forbidden:
+                self.has_body = True
+                return
+            # Пара не сложилась, ищем следующую открывающую кавычку
+            self.start = None
+
+        if char == self.opening:
+            self.start = pos
+            self.has_body = False
+
+
+class QuoteScanner:
+    """
+    Однопроходный поиск недопустимых кавычек.
+    Допустимые кавычки «...», <<...>> и вложенные «„...“» пропускаются целиком,
+    остальные кавычки передаются автоматам для каждого вида недопустимых пар.
+    Текст не копируется, позиции указывают на исходную строку.
+    """
+
+    @staticmethod
+    def allowed_end(text: str, pos: int) -> int:
+        """Конец допустимых кавычек, начинающихся в позиции pos, или -1"""
+        if text.startswith("«", pos):
+            closing = "»"
+            pos += 1
+        elif text.startswith("<<", pos):
+            closing = ">>"
+            pos += 2
+        else:
+            return -1
+
+        # Текст без кавычек до закрывающей елочки или до открывающей лапки
+        special = patterns.LATEX_QUOTE_SPECIAL.search(text, pos)
+        if not special:
+            return -1
+        if text.startswith(closing, special.start()):
+            return special.start() + len(closing)
+        if special.group() != "„":
+            return -1
+
+        # Вложенные лапки „...“ с непустым содержимым
+        inner_start = special.end()
+        special = patterns.LATEX_QUOTE_SPECIAL.search(text, inner_start)
+        if not special or special.start() == inner_start or special.group() != "“":
+            return -1
+
+        special = patterns.LATEX_QUOTE_SPECIAL.search(text, special.end())
+        if not special or not text.startswith(closing, special.start()):
+            return -1
+        return special.start() + len(closing)
+
+    @classmethod
+    def scan(cls, text: str) -> List[Tuple[int, int]]:
+        """
+        Отрезки недопустимых кавычек в исходном тексте.
+        Порядок: по видам кавычек из LATEX_DISALLOWED_QUOTE_PAIRS, внутри вида - по позиции.
+        """
+        states = [_QuotePairState(*pair) for pair in patterns.LATEX_DISALLOWED_QUOTE_PAIRS]
+
+        cursor = 0
+        candidate = patterns.LATEX_QUOTE_CANDIDATE.search(text)
+        while candidate:
+            pos = candidate.start()
+            char = candidate.group()
+
+            end = cls.allowed_end(text, pos) if char in "«<" else -1
+            if end != -1:
+                # Допустимые кавычки из текста исключаются, как будто их нет
+                if pos > cursor:
+                    cls.__mark_body(states)
+                cursor = end
+                candidate = patterns.LATEX_QUOTE_CANDIDATE.search(text, end)
+                continue
+
+            if pos > cursor or char in "«<":
+                cls.__mark_body(states)
+            if char not in "«<":
+                for state in states:
+                    state.feed(char, pos)
+            cursor = pos + 1
+            candidate = patterns.LATEX_QUOTE_CANDIDATE.search(text, cursor)
+
+        return [span for state in states for span in state.spans]
+
+    @staticmethod
+    def __mark_body(states: List[_QuotePairState]) -> None:
+        """Между кавычками есть обычный текст"""
+        for state in states:
+            if state.start is not None:
+                state.has_body = True
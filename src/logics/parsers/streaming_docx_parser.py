@@ -0,0 +1,152 @@
+import posixpath
+from typing import Dict, Any, Iterator, List, Optional
+
+from docx.oxml.ns import qn
+try:
+    from docx.oxml.parser import element_class_lookup, parse_xml
+except ImportError:
+    # python-docx 0.8.x: парсер и таблица классов элементов объявлены в docx.oxml
+    from docx.oxml import element_class_lookup, parse_xml
+from docx.styles.styles import Styles
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+from src.core.stage_timer import StageTimer
+from src.logics.parsers.docx_context import DocxContext
+from src.logics.parsers.docx_parser import DocxParser
+from src.logics.parsers.streaming_threshold import StreamingThreshold
+
+_RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+
+class _StylesPart:
+    """
+    Часть документа для абзацев и таблиц python-docx, построенных из потока:
+    дает доступ только к стилям, весь пакет документа не загружается
+    """
+
+    def __init__(self, styles: Styles):
+        self.styles = styles
+
+    @property
+    def part(self) -> "_StylesPart":
+        return self
+
+    def get_style(self, style_id: Optional[str], style_type):
+        return self.styles.get_by_id(style_id, style_type)
+
+
+class StreamingDocxParser(DocxParser):
+    """
+    Разбор больших .docx без построения дерева всего документа.
+    word/document.xml читается из архива потоково (lxml XMLPullParser) частями по CHUNK_SIZE байт;
+    абзацы и таблицы верхнего уровня (как doc.paragraphs и doc.tables в python-docx) обрабатываются
+    по мере закрытия элемента и сразу удаляются из дерева, поэтому память не зависит от длины документа.
+    Элементы создаются классами python-docx, записи абзацев и таблиц строятся теми же методами,
+    что и в DocxParser, поэтому результат разбора совпадает. dedoc (если включен) читает файл целиком.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, docx_file, use_dedoc: bool = True, timer: StageTimer = None):
+        self.__styles: Optional[Styles] = None
+        self.__tables: List[List[List[str]]] = []
+        super().__init__(docx_file, use_dedoc, timer)
+
+    @classmethod
+    def suits(cls, context: DocxContext) -> bool:
+        """
+        Документ достаточно большой для потокового разбора (по размеру document.xml без распаковки).
+        Порог задается через StreamingThreshold.configure
+        """
+        threshold = StreamingThreshold.get()
+        if not threshold or context.loaded_document is not None:
+            # Дерево документа уже построено - потоковый разбор только распаковал бы document.xml повторно
+            return False
+        try:
+            info = context.archive.getinfo(cls.document_part(context))
+        except KeyError:
+            return False
+        return info.file_size >= threshold
+
+    @staticmethod
+    def related_part(context: DocxContext, source: str, rel_type: str) -> Optional[str]:
+        """Имя части архива, связанной с частью source отношением rel_type (по файлу .rels)"""
+        directory, name = posixpath.split(source)
+        rels_name = posixpath.join(directory, "_rels", f"{name}.rels")
+        try:
+            rels = etree.fromstring(context.read_part(rels_name))
+        except KeyError:
+            return None
+        for rel in rels.iter(_RELATIONSHIPS):
+            if rel.get("Type", "").endswith(f"/{rel_type}") and rel.get("TargetMode") != "External":
+                target = rel.get("Target", "")
+                if target.startswith("/"):
+                    return target.lstrip("/")
+                return posixpath.normpath(posixpath.join(directory, target))
+        return None
+
+    @classmethod
+    def document_part(cls, context: DocxContext) -> str:
+        return cls.related_part(context, "", "officeDocument") or "word/document.xml"
+
+    def load_document(self) -> _StylesPart:
+        return _StylesPart(self.styles())
+
+    def styles(self) -> Styles:
+        """Стили документа из word/styles.xml; без стилей - стили по умолчанию python-docx"""
+        if self.__styles is None and self.context.loaded_document is not None:
+            # Дерево документа уже построено - стили берутся из него без повторного разбора styles.xml
+            self.__styles = self.context.loaded_document.styles
+        if self.__styles is None:
+            name = self.related_part(self.context, self.document_part(self.context), "styles")
+            if name is not None and name in self.context.archive.namelist():
+                self.__styles = Styles(parse_xml(self.context.read_part(name)))
+            else:
+                self.__styles = self.context.document.styles
+        return self.__styles
+
+    def styles_element(self):
+        return self.styles().element
+
+    def extract_tables(self, doc: _StylesPart) -> List[List[List[str]]]:
+        # Таблицы заполняются во время прохода по document.xml (scan_paragraphs),
+        # обработчик таблиц читает список только при получении результата
+        return self.__tables
+
+    def scan_paragraphs(self, doc: _StylesPart) -> Iterator[Dict[str, Any]]:
+        for element in self.iter_body(doc):
+            if element.tag == qn("w:tbl"):
+                self.__tables.append(self.table_rows(Table(element, doc)))
+                continue
+            record = self.paragraph_record(Paragraph(element, doc))
+            if record is not None:
+                yield record
+
+    def iter_body(self, doc: _StylesPart) -> Iterator[Any]:
+        """Абзацы и таблицы верхнего уровня document.xml в порядке следования; обработанные удаляются"""
+        parser = etree.XMLPullParser(events=("end",), tag=(qn("w:p"), qn("w:tbl")),
+                                     remove_blank_text=True, resolve_entities=False)
+        parser.set_element_class_lookup(element_class_lookup)
+        body_tag = qn("w:body")
+
+        with self.context.archive.open(self.document_part(self.context)) as stream:
+            while True:
+                chunk = stream.read(self.CHUNK_SIZE)
+                if chunk:
+                    parser.feed(chunk)
+                else:
+                    parser.close()
+                for _, element in parser.read_events():
+                    body = element.getparent()
+                    # Абзацы внутри таблиц и других элементов обрабатываются вместе с ними
+                    if body is None or body.tag != body_tag:
+                        continue
+                    yield element
+                    element.clear()
+                    # Удаляются обработанный элемент и все предшествующие ему элементы тела документа
+                    while element.getprevious() is not None:
+                        del body[0]
+                    body.remove(element)
+                if not chunk:
+                    return
@@ -0,0 +1,25 @@
+import threading
+
+from src.core.validator import Validator
+
+
+class StreamingThreshold:
+    """
+    Порог потокового разбора .docx (размер распакованного word/document.xml).
+    Хранится отдельно от StreamingDocxParser, чтобы настройка при запуске
+    не загружала python-docx и lxml до первой проверки .docx.
+    """
+    __threshold_bytes: int = 10 * 1024 * 1024
+    __lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, threshold_bytes: int):
+        """Размер word/document.xml, начиная с которого используется потоковый разбор (0 - не использовать)"""
+        Validator.validate(threshold_bytes, int)
+        with cls.__lock:
+            cls.__threshold_bytes = max(0, threshold_bytes)
+
+    @classmethod
+    def get(cls) -> int:
+        with cls.__lock:
+            return cls.__threshold_bytes
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from src.core.abstract_logic import AbstractLogic
+from src.core.doc_type import DocType
+from src.core.event_type import EventType
+from src.core.validator import Validator
+from src.logics.observe_service import ObserveService
+from src.logics.rule_service import RuleService
+
+
+class ResultCache(AbstractLogic):
+    """
+    Кэш результатов проверки для повторно загружаемых документов.
+    Ключ - хэш содержимого файлов, тип документа, режим проверки и отпечаток правил,
+    поэтому результат, полученный по старым правилам, не может быть выдан повторно.
+    Вытеснение - по давности использования (LRU) с ограничением количества и суммарного размера записей.
+    Если задан каталог, записи дополнительно сохраняются на диск и переживают перезапуск сервиса.
+    """
+    __entries: OrderedDict = OrderedDict()  # ключ -> (результат, размер в байтах)
+    __lock = threading.Lock()
+    __max_entries: int = 256
+    __max_bytes: int = 64 * 1024 * 1024
+    __total_bytes: int = 0
+    __directory: Optional[Path] = None
+    __hits: int = 0
+    __misses: int = 0
+    __evictions: int = 0
+
+    def __init__(self):
+        ObserveService.append(self)
+
+    @classmethod
+    def configure(cls, max_entries: int, max_bytes: int, directory: str = ""):
+        """Задает ограничения кэша и каталог для хранения на диске (пустая строка - только в памяти)"""
+        Validator.validate(max_entries, int)
+        Validator.validate(max_bytes, int)
+        with cls.__lock:
+            cls.__max_entries = max(0, max_entries)
+            cls.__max_bytes = max(0, max_bytes)
+            cls.__directory = Path(directory) if directory else None
+            if cls.__directory is not None:
+                cls.__directory.mkdir(parents=True, exist_ok=True)
+                cls.__prune_directory()
+            cls.__evict()
+
+    @classmethod
+    def make_key(cls, doc_type: DocType, fast: bool, *contents: bytes) -> str:
+        """Ключ записи: содержимое файлов, тип документа, режим и отпечаток текущих правил"""
+        digest = hashlib.sha256()
+        for content in contents:
+            digest.update(hashlib.sha256(content).digest())
+        digest.update(f"|{doc_type.name}|{int(fast)}|{RuleService.get_rules_fingerprint(doc_type)}".encode())
+        return f"{doc_type.name.lower()}-{digest.hexdigest()}"
+
+    @classmethod
+    def get(cls, key: str) -> Optional[dict]:
+        with cls.__lock:
+            if cls.__max_entries == 0:
+                return None
+            entry = cls.__entries.get(key)
+            if entry is not None:
+                cls.__entries.move_to_end(key)
+                cls.__hits += 1
+                return entry[0]
+
+            result = cls.__read_file(key)
+            if result is None:
+                cls.__misses += 1
+                return None
+            cls.__hits += 1
+            cls.__store(key, result, persist=False)
+            return result
+
+    @classmethod
+    def put(cls, key: str, result: dict):
+        with cls.__lock:
+            if cls.__max_entries == 0:
+                return
+            cls.__store(key, result, persist=True)
+
+    @classmethod
+    def invalidate(cls, doc_type: DocType = None):
+        """Удаляет записи для типа документа (или все записи)"""
+        prefix = f"{doc_type.name.lower()}-" if doc_type else ""
+        with cls.__lock:
+            for key in [key for key in cls.__entries if key.startswith(prefix)]:
+                cls.__remove(key)
+            if cls.__directory is not None:
+                for path in cls.__directory.glob(f"{prefix}*.json"):
+                    path.unlink(missing_ok=True)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls.__lock:
+            return {
+                "entries": len(cls.__entries),
+                "bytes": cls.__total_bytes,
+                "hits": cls.__hits,
+                "misses": cls.__misses,
+                "evictions": cls.__evictions,
+            }
+
+    @classmethod
+    def __store(cls, key: str, result: dict, persist: bool):
+        serialized = json.dumps(result, ensure_ascii=False)
+        size = len(serialized.encode("utf-8"))
+        if size > cls.__max_bytes:
+            return
+
+        if key in cls.__entries:
+            cls.__remove(key, delete_file=False)
+        cls.__entries[key] = (result, size)
+        cls.__total_bytes += size
+        if persist:
+            cls.__write_file(key, serialized)
+        cls.__evict()
+
+    @classmethod
+    def __evict(cls):
+        while cls.__entries and (len(cls.__entries) > cls.__max_entries or cls.__total_bytes > cls.__max_bytes):
+            key = next(iter(cls.__entries))
+            cls.__remove(key)
+            cls.__evictions += 1
+
+    @classmethod
+    def __remove(cls, key: str, delete_file: bool = True):
+        _, size = cls.__entries.pop(key)
+        cls.__total_bytes -= size
+        if delete_file and cls.__directory is not None:
+            (cls.__directory / f"{key}.json").unlink(missing_ok=True)
+
+    @classmethod
+    def __read_file(cls, key: str) -> Optional[dict]:
+        if cls.__directory is None:
+            return None
+        try:
+            with open(cls.__directory / f"{key}.json", "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def __write_file(cls, key: str, serialized: str):
+        if cls.__directory is None:
+            return
+        path = cls.__directory / f"{key}.json"
+        temp_path = path.with_suffix(".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(serialized)
+            os.replace(temp_path, path)
+        except OSError as ex:
+            ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Не удалось сохранить результат в кэш: {ex}")
+
+    @classmethod
+    def __prune_directory(cls):
+        """Оставляет на диске не больше max_entries самых свежих записей"""
+        files = sorted(cls.__directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in files[cls.__max_entries:]:
+            path.unlink(missing_ok=True)
+
+    def set_exception(self, ex: Exception):
+        super().set_exception(ex)
+
+    @property
+    def subscriptions(self) -> frozenset:
+        return frozenset({EventType.RULES_CHANGED})
+
+    def handle_event(self, event_type: EventType, params):
+        super().handle_event(event_type, params)
+
+        # Правила изменились - результаты по старым правилам больше не понадобятся
+        if event_type == EventType.RULES_CHANGED:
+            self.invalidate(params)
@@ -1,9 +1,13 @@
+import hashlib
 import json
+import os
+import threading
 from pathlib import Path
 
 from src.core.abstract_logic import AbstractLogic
 from src.core.doc_type import DocType
 from src.core.event_type import EventType
+from src.core.frozen_dict import freeze, thaw
 from src.core.rule_type import RuleType
 from src.logics.observe_service import ObserveService
 from src.core.validator import OperationException
@@ -12,6 +16,12 @@ from src.core.validator import OperationException
 class RuleService(AbstractLogic):
     RULES_PATH = Path(__file__).resolve().parent.parent.parent / "rules"
 
+    # Кэш правил на процесс: тип документа -> (отпечаток файла, снимок правил только для чтения, хэш правил)
+    __cache: dict = {}
+    __cache_lock = threading.Lock()
+    __hits: int = 0
+    __misses: int = 0
+
     def __init__(self):
         ObserveService.append(self)
 
@@ -20,16 +30,68 @@ class RuleService(AbstractLogic):
         """Возвращает путь к файлу с правилами для указанного типа документа."""
         return f"{cls.RULES_PATH}/{doc_type.name.lower()}_rules.json"
 
+    @staticmethod
+    def file_fingerprint(file_path: str):
+        """Отпечаток файла для проверки актуальности кэша: inode, время изменения и размер"""
+        stat = os.stat(file_path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
     @classmethod
     def load_rules(cls, doc_type: DocType):
+        """
+        Правила для типа документа.
+        Возвращается общий снимок только для чтения (FrozenDict, списки - кортежи);
+        файл перечитывается, только если он изменился с момента последней загрузки.
+        """
         file_path = cls.get_rules_path(doc_type)
         try:
+            fingerprint = cls.file_fingerprint(file_path)
+            with cls.__cache_lock:
+                cached = cls.__cache.get(doc_type)
+                if cached and cached[0] == fingerprint:
+                    cls.__hits += 1
+                    return cached[1]
+                cls.__misses += 1
+
             with open(file_path, 'r', encoding='utf-8') as file:
-                return json.load(file)
+                data = json.load(file)
+            rules = freeze(data)
+            digest = hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+            with cls.__cache_lock:
+                cls.__cache[doc_type] = (fingerprint, rules, digest)
+            return rules
         except Exception as e:
             print(f"Ошибка загрузки правил: {e}")
             return {}
 
+    @classmethod
+    def get_rules_fingerprint(cls, doc_type: DocType) -> str:
+        """Хэш содержимого текущих правил (меняется при любом изменении правил)"""
+        cls.load_rules(doc_type)
+        with cls.__cache_lock:
+            cached = cls.__cache.get(doc_type)
+            return cached[2] if cached else ""
+
+    @classmethod
+    def invalidate_cache(cls, doc_type: DocType = None):
+        """Сбрасывает кэш правил для типа документа (или для всех типов)"""
+        with cls.__cache_lock:
+            if doc_type is None:
+                cls.__cache.clear()
+            else:
+                cls.__cache.pop(doc_type, None)
+
+    @classmethod
+    def get_cache_stats(cls) -> dict:
+        """Состояние кэша правил: количество попаданий, промахов и загруженных типов"""
+        with cls.__cache_lock:
+            return {
+                "hits": cls.__hits,
+                "misses": cls.__misses,
+                "cached": sorted(doc_type.name.lower() for doc_type in cls.__cache),
+            }
+
     @staticmethod
     def get_rule_types():
         return [{"name": rule.name, "value": rule.value} for rule in RuleType]
@@ -40,14 +102,19 @@ class RuleService(AbstractLogic):
         try:
             with open(file_path, 'w', encoding='utf-8') as file:
                 json.dump(rules_data, file, ensure_ascii=False, indent=2)
-            return True
         except Exception as e:
             print(f"Ошибка при сохранении правил: {e}")
             return False
+        finally:
+            cls.invalidate_cache(doc_type)
+
+        ObserveService.raise_event(EventType.RULES_CHANGED, doc_type)
+        return True
 
     @classmethod
     def update_rule(cls, doc_type: DocType, rule_path: str, new_value):
-        rules_data = cls.load_rules(doc_type)
+        # Снимок из кэша только для чтения, изменяем его копию
+        rules_data = thaw(cls.load_rules(doc_type))
 
         keys = rule_path.split(".")  # Разбиваем путь по точкам
         current = rules_data
@@ -83,5 +150,10 @@ class RuleService(AbstractLogic):
     def set_exception(self, ex: Exception):
         super().set_exception(ex)
 
+    @property
+    def subscriptions(self) -> frozenset:
+        # События сервису не нужны
+        return frozenset()
+
     def handle_event(self, event_type: EventType, params):
         super().handle_event(event_type, params)
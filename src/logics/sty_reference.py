@@ -0,0 +1,116 @@
+import difflib
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.logics.rule_service import RuleService
+
+
+class StyReference:
+    """
+    Сравнение загруженного .sty с эталонным docs/settings.sty.
+    Эталон читается и нормализуется (без комментариев и пустых строк) один раз и перечитывается
+    только при изменении файла. Совпадающие после нормализации файлы распознаются по хэшу,
+    отличающиеся сравниваются построчно (difflib), и в отчет попадают все расхождения.
+    Результаты сравнения кэшируются по хэшу загруженного файла.
+    """
+    REFERENCE_PATH = os.path.join(os.path.dirname(__file__), "../..", "docs", "settings.sty")
+    CACHE_SIZE = 128
+
+    __lock = threading.Lock()
+    # (отпечаток файла, нормализованные строки, хэш нормализованных строк)
+    __reference: Optional[Tuple[tuple, Tuple[str, ...], str]] = None
+    __results: OrderedDict = OrderedDict()  # хэш загруженного файла и эталона -> ошибки
+
+    @staticmethod
+    def normalize(lines: List[str]) -> List[Tuple[int, str]]:
+        """Значимые строки с номерами в исходном файле: комментарии и пустые строки удаляются"""
+        normalized = []
+        for number, line in enumerate(lines, start=1):
+            line = line.split('%', 1)[0].strip()
+            if line:
+                normalized.append((number, line))
+        return normalized
+
+    @staticmethod
+    def digest(lines) -> str:
+        return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def compare(cls, sty_content: bytes) -> Optional[Tuple[str, ...]]:
+        """
+        Ошибки расхождения загруженного .sty с эталоном (пустой кортеж - файлы совпадают).
+        None - эталона docs/settings.sty нет, проверка не выполняется
+        """
+        reference = cls.__load_reference()
+        if reference is None:
+            return None
+        _, reference_lines, reference_digest = reference
+
+        key = hashlib.sha256(sty_content).hexdigest() + reference_digest
+        with cls.__lock:
+            if key in cls.__results:
+                cls.__results.move_to_end(key)
+                return cls.__results[key]
+
+        uploaded = cls.normalize(sty_content.decode("utf-8").splitlines())
+        uploaded_lines = [line for _, line in uploaded]
+        if cls.digest(uploaded_lines) == reference_digest:
+            errors = ()
+        else:
+            errors = tuple(cls.__diff(reference_lines, uploaded))
+
+        with cls.__lock:
+            cls.__results[key] = errors
+            while len(cls.__results) > cls.CACHE_SIZE:
+                cls.__results.popitem(last=False)
+        return errors
+
+    @classmethod
+    def __load_reference(cls) -> Optional[Tuple[tuple, Tuple[str, ...], str]]:
+        try:
+            fingerprint = RuleService.file_fingerprint(cls.REFERENCE_PATH)
+        except FileNotFoundError:
+            return None
+
+        with cls.__lock:
+            if cls.__reference is not None and cls.__reference[0] == fingerprint:
+                return cls.__reference
+
+        with open(cls.REFERENCE_PATH, "r", encoding="utf-8") as file:
+            lines = tuple(line for _, line in cls.normalize(file.read().splitlines()))
+        reference = (fingerprint, lines, cls.digest(lines))
+        with cls.__lock:
+            cls.__reference = reference
+        return reference
+
+    @staticmethod
+    def __block(lines: List[str]) -> str:
+        return lines[0] if len(lines) == 1 else f"{lines[0]} ... (строк: {len(lines)})"
+
+    @classmethod
+    def __diff(cls, reference_lines: Tuple[str, ...], uploaded: List[Tuple[int, str]]) -> List[str]:
+        """Расхождения по блокам; номера строк указываются по загруженному файлу"""
+        uploaded_lines = [line for _, line in uploaded]
+        matcher = difflib.SequenceMatcher(None, reference_lines, uploaded_lines, autojunk=False)
+
+        def line_number(index: int) -> int:
+            # Номер строки в загруженном файле для позиции среди значимых строк
+            if index < len(uploaded):
+                return uploaded[index][0]
+            return uploaded[-1][0] + 1 if uploaded else 1
+
+        errors = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            expected = cls.__block(list(reference_lines[i1:i2])) if i2 > i1 else ""
+            received = cls.__block(uploaded_lines[j1:j2]) if j2 > j1 else ""
+            if tag == "replace":
+                errors.append(f"Несовпадение в settings.sty (строка {line_number(j1)}): "
+                              f"ожидалось '{expected}', получено '{received}'")
+            elif tag == "delete":
+                errors.append(f"В settings.sty отсутствуют строки (перед строкой {line_number(j1)}): '{expected}'")
+            elif tag == "insert":
+                errors.append(f"В settings.sty лишние строки (строка {line_number(j1)}): '{received}'")
+        return errors
@@ -0,0 +1,59 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Any, Optional
+
+from src.core.stage_timer import StageTimer
+
+
+class TimingStats:
+    """
+    Гистограммы времени этапов проверки, накопленные в основном процессе сервиса.
+    Проверки выполняются в дочерних процессах, поэтому замеры приходят вместе с результатом
+    (ключ timings) и учитываются здесь через collect.
+    """
+    # Верхние границы интервалов гистограммы в секундах
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+    __stages: Dict[str, Dict[str, Any]] = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def collect(cls, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Извлекает замеры из результата проверки, учитывает их в гистограммах и возвращает"""
+        timings = result.pop("timings", None) if isinstance(result, dict) else None
+        if timings:
+            cls.record(timings)
+        return timings
+
+    @classmethod
+    def record(cls, timings: Dict[str, Any]):
+        with cls.__lock:
+            for stage, seconds in StageTimer.flatten(timings).items():
+                histogram = cls.__stages.get(stage)
+                if histogram is None:
+                    histogram = {"count": 0, "sum": 0.0, "buckets": [0] * (len(cls.BUCKETS) + 1)}
+                    cls.__stages[stage] = histogram
+                histogram["count"] += 1
+                histogram["sum"] += seconds
+                histogram["buckets"][bisect_left(cls.BUCKETS, seconds)] += 1
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """
+        Гистограммы по этапам: количество, суммарное время и накопленные счетчики
+        по границам интервалов (как в Prometheus: le -> количество замеров не дольше le секунд)
+        """
+        with cls.__lock:
+            stats = {}
+            for stage, histogram in sorted(cls.__stages.items()):
+                cumulative, buckets = 0, {}
+                for bound, count in zip(cls.BUCKETS + ("+Inf",), histogram["buckets"]):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                stats[stage] = {"count": histogram["count"], "sum": round(histogram["sum"], 6), "buckets": buckets}
+            return stats
+
+    @classmethod
+    def reset(cls):
+        with cls.__lock:
+            cls.__stages.clear()
@@ -0,0 +1,106 @@
+"""
+Задачи проверки документов для выполнения в пуле процессов.
+Функции объявлены на уровне модуля и принимают только байты и строки,
+чтобы их можно было передать в дочерний процесс.
+Результат содержит замеры этапов (timings), количество ошибок по проверкам (check_errors)
+и счетчики пула dedoc и кэша правил процесса (worker_stats), которые основной процесс забирает
+через TimingStats.collect и MetricsService.observe_validation.
+"""
+import time
+from io import BytesIO
+from typing import Dict, Any
+
+
+def with_worker_stats(result: Dict[str, Any]) -> Dict[str, Any]:
+    from src.logics.worker_stats import WorkerStats
+
+    result["worker_stats"] = WorkerStats.snapshot()
+    return result
+
+
+def validate_latex(tex_content: bytes, sty_content: bytes, doc_type: str, session_id: str = None) -> Dict[str, Any]:
+    from src.logics.checkers.latex_checker import LatexChecker
+
+    checker = LatexChecker(BytesIO(tex_content), BytesIO(sty_content), doc_type, timings=True, error_stats=True,
+                           session_id=session_id)
+    return with_worker_stats(checker.check_document())
+
+
+def validate_latex_project(archive_content: bytes, sty_content: bytes, doc_type: str,
+                           session_id: str = None) -> Dict[str, Any]:
+    """Проверка LaTeX-проекта из zip-архива; sty_content пустой - используется .sty из архива"""
+    from src.core.validator import OperationException
+    from src.logics.checkers.latex_checker import LatexChecker
+    from src.logics.parsers.latex_project import LatexProject
+
+    try:
+        project = LatexProject.from_zip(archive_content)
+    except OperationException as ex:
+        return with_worker_stats({"valid": False, "found": {}, "errors": [str(ex)]})
+    checker = LatexChecker.from_project(project, BytesIO(sty_content) if sty_content else None, doc_type,
+                                        timings=True, error_stats=True, session_id=session_id)
+    return with_worker_stats(checker.check_document())
+
+
+def validate_docx(docx_content: bytes, doc_type: str, fast: bool = False, session_id: str = None) -> Dict[str, Any]:
+    # Стек DOCX (python-docx, dedoc) загружается в процессе при первой проверке .docx
+    from src.logics.checkers.docx_checker import DocxChecker
+
+    # Документ разбирается из памяти; временный файл создается только на время разбора dedoc
+    checker = DocxChecker(docx_content, doc_type, fast=fast, timings=True, error_stats=True, session_id=session_id)
+    return with_worker_stats(checker.check_document())
+
+
+def document_format(task) -> str:
+    """Формат документа задачи проверки (метка для метрик)"""
+    return "latex" if task in (validate_latex, validate_latex_project) else "docx"
+
+
+def warm_up_worker(warm_dedoc: bool = True, dedoc_pool_size: int = 1, streaming_threshold: int = None) -> None:
+    """
+    Инициализация дочернего процесса проверки (пул сервиса и массовая проверка): парсеры импортируются
+    и правила загружаются один раз на процесс, пул dedoc и порог потокового разбора .docx настраиваются
+    как в основном процессе. Если warm_dedoc, заранее создается один DedocManager -
+    процесс выполняет одну проверку за раз.
+    """
+    from src.core.doc_type import DocType
+    from src.core.event_type import EventType
+    from src.logics.checkers import latex_checker, docx_checker  # noqa: F401
+    from src.logics.dedoc_pool import DedocPool
+    from src.logics.observe_service import ObserveService
+    from src.logics.parsers.streaming_threshold import StreamingThreshold
+    from src.logics.rule_service import RuleService
+
+    if streaming_threshold is not None:
+        StreamingThreshold.configure(streaming_threshold)
+    for doc_type in DocType:
+        RuleService.load_rules(doc_type)
+
+    if warm_dedoc:
+        try:
+            DedocPool.warm_up(1)
+        except Exception as ex:
+            # dedoc будет загружен при первой проверке .docx, ошибка попадет в ее результат
+            ObserveService.raise_event(EventType.LOG_ERROR, lambda: f"Не удалось прогреть dedoc: {ex}")
+    DedocPool.configure(dedoc_pool_size)
+
+
+def validate_file(file_path: str, doc_type: str, fast: bool = False, sty_path: str = None) -> Dict[str, Any]:
+    """
+    Проверка документа по пути к файлу с замером времени.
+    Возвращает словарь с ключами file, seconds и result (или error).
+    """
+    started = time.perf_counter()
+    line = {"file": file_path}
+    try:
+        if file_path.lower().endswith(".docx"):
+            from src.logics.checkers.docx_checker import DocxChecker
+            line["result"] = DocxChecker(file_path, doc_type, fast=fast).check_document()
+        else:
+            from src.logics.checkers.latex_checker import LatexChecker
+            with open(file_path, "rb") as tex_file, open(sty_path, "rb") as sty_file:
+                line["result"] = LatexChecker(tex_file, sty_file, doc_type).check_document()
+    except Exception as ex:
+        line["error"] = str(ex) or type(ex).__name__
+    line["seconds"] = round(time.perf_counter() - started, 4)
+    return line
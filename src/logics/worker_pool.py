@@ -0,0 +1,172 @@
+import asyncio
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from src.core.validator import Validator, OverloadException, OperationException
+
+
+def _ready() -> int:
+    """Пустая задача: дожидается инициализации дочернего процесса"""
+    return os.getpid()
+
+
+class WorkerPool:
+    """
+    Общий для процесса пул дочерних процессов для разбора и проверки документов.
+    Проверка не занимает цикл событий и не упирается в GIL основного процесса.
+    Количество принятых задач (выполняемых и ожидающих) ограничено размером очереди,
+    при переполнении задача отклоняется с OverloadException.
+    При размере пула 0 задачи выполняются в пуле потоков основного процесса.
+    initializer вызывается в каждом дочернем процессе при его запуске (настройка и прогрев парсеров).
+
+    У каждого процесса своя очередь. Задачи с route_key (например, session_id повторных проверок)
+    всегда выполняются одним и тем же процессом, поэтому кэши сессий процесса проверки
+    (IncrementalLatexParser, IncrementalDocxParser) переиспользуются между запросами.
+    Остальные задачи передаются наименее загруженному процессу.
+    """
+    __max_workers: int = 2
+    __executors: List[Optional[ProcessPoolExecutor]] = [None] * __max_workers
+    __loads: List[int] = [0] * __max_workers  # принятые задачи каждого процесса
+    __lock = threading.Lock()
+    __max_queue: int = 8
+    __initializer = None
+    __initargs: tuple = ()
+    __active: int = 0
+    __completed: int = 0
+    __failed: int = 0
+    __rejected: int = 0
+
+    @classmethod
+    def configure(cls, workers: int, queue_size: int, initializer=None, initargs: tuple = ()):
+        """
+        Задает количество процессов, максимальное количество принятых задач
+        и функцию инициализации дочерних процессов initializer(*initargs)
+        """
+        Validator.validate(workers, int)
+        Validator.validate(queue_size, int)
+        cls.shutdown()
+        with cls.__lock:
+            cls.__max_workers = max(0, workers)
+            cls.__max_queue = max(1, queue_size)
+            cls.__initializer = initializer
+            cls.__initargs = tuple(initargs)
+            cls.__executors = [None] * cls.__max_workers
+            cls.__loads = [0] * cls.__max_workers
+
+    @classmethod
+    def __get_executor(cls, index: int) -> ProcessPoolExecutor:
+        """Процесс с номером index (вызывается под блокировкой)"""
+        if cls.__executors[index] is None:
+            cls.__executors[index] = ProcessPoolExecutor(max_workers=1, initializer=cls.__initializer,
+                                                         initargs=cls.__initargs)
+        return cls.__executors[index]
+
+    @classmethod
+    def __acquire(cls, route_key: Optional[str]) -> Tuple[Optional[int], Optional[ProcessPoolExecutor]]:
+        """Выбирает процесс для задачи и учитывает ее в загрузке (вызывается под блокировкой)"""
+        cls.__active += 1
+        if cls.__max_workers == 0:
+            return None, None
+        if route_key is not None:
+            index = zlib.crc32(route_key.encode("utf-8")) % cls.__max_workers
+        else:
+            index = min(range(cls.__max_workers), key=cls.__loads.__getitem__)
+        cls.__loads[index] += 1
+        return index, cls.__get_executor(index)
+
+    @classmethod
+    def start(cls):
+        """
+        Запускает все дочерние процессы и дожидается их инициализации,
+        чтобы первые проверки не ждали загрузки парсеров
+        """
+        with cls.__lock:
+            executors = [cls.__get_executor(index) for index in range(cls.__max_workers)]
+        wait([executor.submit(_ready) for executor in executors])
+
+    @classmethod
+    async def run(cls, func, *args, route_key: str = None):
+        """Выполняет func(*args) в пуле и возвращает результат (route_key - см. описание класса)"""
+        with cls.__lock:
+            if cls.__active >= cls.__max_queue:
+                cls.__rejected += 1
+                raise OverloadException(f"Очередь проверки заполнена ({cls.__max_queue} задач), повторите запрос позже.")
+            index, executor = cls.__acquire(route_key)
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool as ex:
+            cls.__finish(index, False)
+            cls.__reset(index, executor)
+            raise OperationException(f"Процесс проверки аварийно завершился: {ex}")
+        except BaseException:
+            cls.__finish(index, False)
+            raise
+        cls.__finish(index, True)
+        return result
+
+    @classmethod
+    def execute(cls, func, *args, route_key: str = None):
+        """
+        Синхронно выполняет func(*args) в пуле (для фоновых задач).
+        Ограничение очереди не применяется: количество фоновых задач ограничивает их собственный планировщик.
+        """
+        with cls.__lock:
+            index, executor = cls.__acquire(route_key)
+
+        try:
+            result = func(*args) if executor is None else executor.submit(func, *args).result()
+        except BrokenProcessPool as ex:
+            cls.__finish(index, False)
+            cls.__reset(index, executor)
+            raise OperationException(f"Процесс проверки аварийно завершился: {ex}")
+        except BaseException:
+            cls.__finish(index, False)
+            raise
+        cls.__finish(index, True)
+        return result
+
+    @classmethod
+    def __finish(cls, index: Optional[int], success: bool):
+        with cls.__lock:
+            cls.__active -= 1
+            if index is not None and index < len(cls.__loads):
+                cls.__loads[index] -= 1
+            if success:
+                cls.__completed += 1
+            else:
+                cls.__failed += 1
+
+    @classmethod
+    def __reset(cls, index: int, executor):
+        """Дочерний процесс аварийно завершился - следующая задача для него создаст новый процесс"""
+        with cls.__lock:
+            if index < len(cls.__executors) and cls.__executors[index] is executor:
+                cls.__executors[index] = None
+        executor.shutdown(wait=False)
+
+    @classmethod
+    def shutdown(cls):
+        """Останавливает дочерние процессы"""
+        with cls.__lock:
+            executors = [executor for executor in cls.__executors if executor is not None]
+            cls.__executors = [None] * len(cls.__executors)
+        for executor in executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Состояние пула: размер, загрузка очереди и количество выполненных и отклоненных задач"""
+        with cls.__lock:
+            return {
+                "workers": cls.__max_workers,
+                "queue_size": cls.__max_queue,
+                "active": cls.__active,
+                "completed": cls.__completed,
+                "failed": cls.__failed,
+                "rejected": cls.__rejected,
+            }
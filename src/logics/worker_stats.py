@@ -0,0 +1,65 @@
+import os
+import threading
+from typing import Dict, Any, Tuple
+
+from src.logics.dedoc_pool import DedocPool
+from src.logics.rule_service import RuleService
+
+
+class WorkerStats:
+    """
+    Счетчики и состояние пула dedoc и кэша правил процессов проверки.
+    Проверки выполняются в дочерних процессах, поэтому их значения приходят вместе с результатом
+    (ключ worker_stats, накопленные значения процесса) и учитываются в основном процессе через collect.
+    Для каждого процесса хранятся последние значения, итог - сумма по процессам.
+    Текущие значения (GAUGES) сняты в момент завершения последней проверки процесса.
+    """
+    # Счетчики, которые передаются из процесса проверки
+    COUNTERS = {
+        "dedoc_pool": ("warm_parses", "cold_parses"),
+        "rule_cache": ("hits", "misses"),
+    }
+    # Текущие значения, которые передаются из процесса проверки
+    GAUGES = {
+        "dedoc_pool": ("created", "in_use"),
+        "rule_cache": (),
+    }
+
+    __processes: Dict[int, Dict[str, Dict[str, int]]] = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        """Счетчики текущего процесса (добавляются к результату проверки в дочернем процессе)"""
+        sources = {"dedoc_pool": DedocPool.get_stats(), "rule_cache": RuleService.get_cache_stats()}
+        stats = {name: {field: sources[name][field] for field in cls.fields(name)} for name in cls.COUNTERS}
+        return {"pid": os.getpid(), **stats}
+
+    @classmethod
+    def collect(cls, result: Dict[str, Any]):
+        """Извлекает счетчики процесса проверки из результата и запоминает их"""
+        stats = result.pop("worker_stats", None) if isinstance(result, dict) else None
+        if not stats:
+            return
+        pid = stats.pop("pid")
+        with cls.__lock:
+            cls.__processes[pid] = stats
+
+    @classmethod
+    def fields(cls, name: str) -> Tuple[str, ...]:
+        """Поля name (dedoc_pool, rule_cache), которые передаются из процесса проверки"""
+        return cls.COUNTERS[name] + cls.GAUGES[name]
+
+    @classmethod
+    def get_stats(cls, name: str) -> Dict[str, int]:
+        """
+        Сумма значений name (dedoc_pool, rule_cache) по всем процессам проверки
+        и количество процессов, от которых получены значения (processes)
+        """
+        with cls.__lock:
+            totals = dict.fromkeys(cls.fields(name), 0)
+            for stats in cls.__processes.values():
+                for field, value in stats.get(name, {}).items():
+                    totals[field] = totals.get(field, 0) + value
+            totals["processes"] = len(cls.__processes)
+            return totals
@@ -5,6 +5,25 @@ from src.core.validator import Validator, ArgumentException
 class SettingsModel:
     """Настройки"""
     __logging_level: LoggingLevel = LoggingLevel.DEBUG
+    __dedoc_pool_size: int = 2
+    __dedoc_warm_up: bool = False
+    __worker_pool_size: int = 2
+    __worker_queue_size: int = 8
+    __job_workers: int = 2
+    __job_queue_size: int = 100
+    __job_result_ttl: int = 3600
+    __job_max_finished: int = 1000
+    __batch_max_files: int = 200
+    __batch_max_file_mb: int = 50
+    __batch_max_total_mb: int = 200
+    __result_cache_size: int = 256
+    __result_cache_max_mb: int = 64
+    __result_cache_dir: str = ""
+    __log_queue_size: int = 10000
+    __log_max_mb: int = 10
+    __log_rotate_hours: int = 24
+    __log_backup_count: int = 5
+    __docx_streaming_threshold_mb: int = 10
 
     @property
     def logging_level(self):
@@ -17,3 +36,217 @@ class SettingsModel:
             self.__logging_level = LoggingLevel(value)
         except Exception:
             ArgumentException("logging_level - valid format integer (1-3)")
+
+    @property
+    def dedoc_pool_size(self):
+        return self.__dedoc_pool_size
+
+    @dedoc_pool_size.setter
+    def dedoc_pool_size(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("dedoc_pool_size - valid format integer (>= 1)")
+        self.__dedoc_pool_size = value
+
+    @property
+    def dedoc_warm_up(self):
+        return self.__dedoc_warm_up
+
+    @dedoc_warm_up.setter
+    def dedoc_warm_up(self, value: bool):
+        Validator.validate(value, bool)
+        self.__dedoc_warm_up = value
+
+    @property
+    def worker_pool_size(self):
+        return self.__worker_pool_size
+
+    @worker_pool_size.setter
+    def worker_pool_size(self, value: int):
+        Validator.validate(value, int)
+        if value < 0:
+            raise ArgumentException("worker_pool_size - valid format integer (>= 0)")
+        self.__worker_pool_size = value
+
+    @property
+    def worker_queue_size(self):
+        return self.__worker_queue_size
+
+    @worker_queue_size.setter
+    def worker_queue_size(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("worker_queue_size - valid format integer (>= 1)")
+        self.__worker_queue_size = value
+
+    @property
+    def job_workers(self):
+        return self.__job_workers
+
+    @job_workers.setter
+    def job_workers(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("job_workers - valid format integer (>= 1)")
+        self.__job_workers = value
+
+    @property
+    def job_queue_size(self):
+        return self.__job_queue_size
+
+    @job_queue_size.setter
+    def job_queue_size(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("job_queue_size - valid format integer (>= 1)")
+        self.__job_queue_size = value
+
+    @property
+    def job_result_ttl(self):
+        return self.__job_result_ttl
+
+    @job_result_ttl.setter
+    def job_result_ttl(self, value: int):
+        Validator.validate(value, int)
+        if value < 0:
+            raise ArgumentException("job_result_ttl - valid format integer (>= 0)")
+        self.__job_result_ttl = value
+
+    @property
+    def job_max_finished(self):
+        """Максимальное количество хранимых завершенных фоновых задач (самые старые удаляются первыми)"""
+        return self.__job_max_finished
+
+    @job_max_finished.setter
+    def job_max_finished(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("job_max_finished - valid format integer (>= 1)")
+        self.__job_max_finished = value
+
+    @property
+    def batch_max_files(self):
+        """Максимальное количество файлов .docx, .tex и .sty в zip-архиве пакетной проверки"""
+        return self.__batch_max_files
+
+    @batch_max_files.setter
+    def batch_max_files(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("batch_max_files - valid format integer (>= 1)")
+        self.__batch_max_files = value
+
+    @property
+    def batch_max_file_mb(self):
+        """Максимальный размер распакованного файла в zip-архиве пакетной проверки"""
+        return self.__batch_max_file_mb
+
+    @batch_max_file_mb.setter
+    def batch_max_file_mb(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("batch_max_file_mb - valid format integer (>= 1)")
+        self.__batch_max_file_mb = value
+
+    @property
+    def batch_max_total_mb(self):
+        """Максимальный суммарный размер распакованных файлов zip-архива пакетной проверки"""
+        return self.__batch_max_total_mb
+
+    @batch_max_total_mb.setter
+    def batch_max_total_mb(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("batch_max_total_mb - valid format integer (>= 1)")
+        self.__batch_max_total_mb = value
+
+    @property
+    def result_cache_size(self):
+        return self.__result_cache_size
+
+    @result_cache_size.setter
+    def result_cache_size(self, value: int):
+        Validator.validate(value, int)
+        if value < 0:
+            raise ArgumentException("result_cache_size - valid format integer (>= 0)")
+        self.__result_cache_size = value
+
+    @property
+    def result_cache_max_mb(self):
+        return self.__result_cache_max_mb
+
+    @result_cache_max_mb.setter
+    def result_cache_max_mb(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("result_cache_max_mb - valid format integer (>= 1)")
+        self.__result_cache_max_mb = value
+
+    @property
+    def result_cache_dir(self):
+        """Каталог для хранения кэша результатов на диске (пустая строка - только в памяти)"""
+        return self.__result_cache_dir
+
+    @result_cache_dir.setter
+    def result_cache_dir(self, value: str):
+        if not isinstance(value, str):
+            raise ArgumentException("result_cache_dir - valid format string")
+        self.__result_cache_dir = value.strip()
+
+    @property
+    def log_queue_size(self):
+        return self.__log_queue_size
+
+    @log_queue_size.setter
+    def log_queue_size(self, value: int):
+        Validator.validate(value, int)
+        if value < 1:
+            raise ArgumentException("log_queue_size - valid format integer (>= 1)")
+        self.__log_queue_size = value
+
+    @property
+    def log_max_mb(self):
+        """Размер application.log для ротации (0 - без ротации по размеру)"""
+        return self.__log_max_mb
+
+    @log_max_mb.setter
+    def log_max_mb(self, value: int):
+        Validator.validate(value, int)
+        if value < 0:
+            raise ArgumentException("log_max_mb - valid format integer (>= 0)")
+        self.__log_max_mb = value
+
+    @property
+    def log_rotate_hours(self):
+        """Период ротации application.log в часах (0 - без ротации по времени)"""
+        return self.__log_rotate_hours
+
+    @log_rotate_hours.setter
+    def log_rotate_hours(self, value: int):
+        Validator.validate(value, int)
+        if value < 0:
+            raise ArgumentException("log_rotate_hours - valid format integer (>= 0)")
+        self.__log_rotate_hours = value
+
+    @property
+    def log_backup_count(self):
+        return self.__log_backup_count
+
+    @log_backup_count.setter
+    def log_backup_count(self, value: int):
+        Validator.validate(value, int)
+        if value < 0:
+            raise ArgumentException("log_backup_count - valid format integer (>= 0)")
+        self.__log_backup_count = value
+
+    @property
+    def docx_streaming_threshold_mb(self):
+        """Размер word/document.xml, начиная с которого .docx разбирается потоково (0 - не использовать)"""
+        return self.__docx_streaming_threshold_mb
+
+    @docx_streaming_threshold_mb.setter
+    def docx_streaming_threshold_mb(self, value: int):
+        Validator.validate(value, int)
+        if value < 0:
+            raise ArgumentException("docx_streaming_threshold_mb - valid format integer (>= 0)")
+        self.__docx_streaming_threshold_mb = value
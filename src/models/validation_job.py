@@ -0,0 +1,122 @@
+import time
+
+from src.core.abstract_model import AbstractModel
+from src.core.doc_type import DocType
+from src.core.job_status import JobStatus
+from src.core.validator import Validator
+
+
+class ValidationJob(AbstractModel):
+    """Фоновая проверка документа"""
+    __doc_type: DocType = None
+    __status: JobStatus = JobStatus.QUEUED
+    __priority: int = 0
+    __result: dict = None
+    __error: str = None
+    __created_at: float = 0.0
+    __started_at: float = None
+    __finished_at: float = None
+
+    def __init__(self):
+        super().__init__()
+        self.__created_at = time.time()
+
+    @property
+    def doc_type(self):
+        return self.__doc_type
+
+    @doc_type.setter
+    def doc_type(self, value):
+        Validator.validate(value, DocType)
+        self.__doc_type = value
+
+    @property
+    def status(self):
+        return self.__status
+
+    @status.setter
+    def status(self, value):
+        Validator.validate(value, JobStatus)
+        self.__status = value
+        if value == JobStatus.RUNNING:
+            self.__started_at = time.time()
+        elif value in (JobStatus.DONE, JobStatus.FAILED):
+            self.__finished_at = time.time()
+
+    @property
+    def priority(self):
+        """Приоритет: задачи с большим значением выполняются раньше"""
+        return self.__priority
+
+    @priority.setter
+    def priority(self, value):
+        Validator.validate(value, int)
+        self.__priority = value
+
+    @property
+    def result(self):
+        """Результат check_document() после успешной проверки"""
+        return self.__result
+
+    @result.setter
+    def result(self, value):
+        Validator.validate(value, dict)
+        self.__result = value
+
+    @property
+    def error(self):
+        return self.__error
+
+    @error.setter
+    def error(self, value):
+        Validator.validate(value, str)
+        self.__error = value
+
+    @property
+    def created_at(self):
+        return self.__created_at
+
+    @property
+    def started_at(self):
+        return self.__started_at
+
+    @property
+    def finished_at(self):
+        return self.__finished_at
+
+    @property
+    def is_finished(self) -> bool:
+        return self.__status in (JobStatus.DONE, JobStatus.FAILED)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "doc_type": self.doc_type.name if self.doc_type else None,
+            "status": self.status.name,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    def from_dict(self, data: dict):
+        super().from_dict(data)
+
+        if data.get("doc_type"):
+            self.doc_type = DocType[data["doc_type"]]
+        if data.get("status"):
+            self.__status = JobStatus[data["status"]]
+        self.priority = data.get("priority", 0)
+        if data.get("result") is not None:
+            self.result = data["result"]
+        if data.get("error"):
+            self.error = data["error"]
+        self.__created_at = data.get("created_at", self.__created_at)
+        self.__started_at = data.get("started_at")
+        self.__finished_at = data.get("finished_at")
+
+    def __str__(self):
+        return f"{self.name} ({self.id}) - {self.status.name}"
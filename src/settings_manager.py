@@ -66,7 +66,26 @@ class SettingsManager(AbstractLogic):
         file_path = os.path.join(os.curdir, self.__file_name)
 
         settings_data = {
-            "logging_level": self.__settings.logging_level.value
+            "logging_level": self.__settings.logging_level.value,
+            "dedoc_pool_size": self.__settings.dedoc_pool_size,
+            "dedoc_warm_up": self.__settings.dedoc_warm_up,
+            "worker_pool_size": self.__settings.worker_pool_size,
+            "worker_queue_size": self.__settings.worker_queue_size,
+            "job_workers": self.__settings.job_workers,
+            "job_queue_size": self.__settings.job_queue_size,
+            "job_result_ttl": self.__settings.job_result_ttl,
+            "job_max_finished": self.__settings.job_max_finished,
+            "batch_max_files": self.__settings.batch_max_files,
+            "batch_max_file_mb": self.__settings.batch_max_file_mb,
+            "batch_max_total_mb": self.__settings.batch_max_total_mb,
+            "result_cache_size": self.__settings.result_cache_size,
+            "result_cache_max_mb": self.__settings.result_cache_max_mb,
+            "result_cache_dir": self.__settings.result_cache_dir,
+            "log_queue_size": self.__settings.log_queue_size,
+            "log_max_mb": self.__settings.log_max_mb,
+            "log_rotate_hours": self.__settings.log_rotate_hours,
+            "log_backup_count": self.__settings.log_backup_count,
+            "docx_streaming_threshold_mb": self.__settings.docx_streaming_threshold_mb
         }
 
         try:
@@ -75,10 +94,10 @@ class SettingsManager(AbstractLogic):
             with open(file_path, 'w', encoding='utf-8') as stream:
                 json.dump(settings_data, stream, ensure_ascii=False, indent=4)
 
-            ObserveService.raise_event(EventType.LOG_INFO, params=f"Настройки успешно сохранены в файл: {file_path}")
+            ObserveService.raise_event(EventType.LOG_INFO, params=lambda: f"Настройки успешно сохранены в файл: {file_path}")
 
         except Exception as ex:
-            ObserveService.raise_event(EventType.LOG_ERROR, params=f"Ошибка при сохранении настроек: {str(ex)}")
+            ObserveService.raise_event(EventType.LOG_ERROR, params=lambda: f"Ошибка при сохранении настроек: {str(ex)}")
 
             self.set_exception(ex)
             raise
@@ -86,6 +105,11 @@ class SettingsManager(AbstractLogic):
     def set_exception(self, ex: Exception):
         self._inner_set_exception(ex)
 
+    @property
+    def subscriptions(self) -> frozenset:
+        # События сервису не нужны
+        return frozenset()
+
     def handle_event(self, event_type: EventType, params):
         super().handle_event(event_type, params)
 
@@ -0,0 +1,46 @@
+# Размеры шрифта dedoc (аннотации size) для образцов .docx - эталон для тестов быстрого режима.
+# Нужен установленный dedoc; используется только читатель .docx, модели dedoc не загружаются.
+#
+# Запуск из корня репозитория:
+# python tests/fixtures/make_dedoc_sizes.py docs/diploma_lib.docx
+
+import argparse
+import json
+from pathlib import Path
+
+from dedoc.readers.docx_reader.docx_reader import DocxReader
+
+FIXTURES = Path(__file__).resolve().parent
+# Начало строки, по которому тест сопоставляет ее с абзацем
+TEXT_LENGTH = 100
+
+
+def dedoc_sizes(docx_file_path: str) -> list:
+    """Непустые строки документа и различные значения size в порядке следования"""
+    lines = []
+    for line in DocxReader().read(docx_file_path).lines:
+        text = line.line.strip()[:TEXT_LENGTH]
+        if not text:
+            continue
+        sizes = []
+        for annotation in sorted(line.annotations, key=lambda item: item.start):
+            if annotation.name == "size" and annotation.value not in sizes:
+                sizes.append(annotation.value)
+        lines.append({"text": text, "sizes": sizes})
+    return lines
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Эталонные размеры шрифта dedoc для образцов .docx")
+    arg_parser.add_argument("docx_files", nargs="+")
+    args = arg_parser.parse_args()
+
+    for docx_file_path in args.docx_files:
+        output = FIXTURES / f"{Path(docx_file_path).stem}_dedoc_sizes.json"
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(dedoc_sizes(docx_file_path), file, ensure_ascii=False, indent=1)
+        print(f"{docx_file_path} -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
+import json
+import time
 import unittest
+import zipfile
+from io import BytesIO
 from unittest import mock
 
 from fastapi.testclient import TestClient
 
 from main import app
 from src.core.doc_type import DocType
-from src.core.validator import OperationException
+from src.core.validator import OperationException, OverloadException
 from src.settings_manager import SettingsManager
 
 
@@ -24,6 +28,13 @@ class TestAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200, "Ошибка при запросе списка документов")
         self.assertTrue(response.json(), "Список документов пуст")
 
+    def test_health(self):
+        """Тест /api/health"""
+        response = self.client.get("/api/health")
+        self.assertEqual(response.status_code, 200, "Ошибка при запросе состояния сервиса")
+        self.assertIn("warm_parses", response.json()["dedoc_pool"], "Нет статистики пула dedoc")
+        self.assertIn("hits", response.json()["rule_cache"], "Нет статистики кэша правил")
+
     # def test_rules_options(self):
     #     """Тест /api/rules/options"""
     #     response = self.client.get("/api/rules/options")
@@ -127,4 +138,105 @@ class TestAPI(unittest.TestCase):
         pass
 
     def test_validate_document_latex(self):
-        pass
+        """Тест /api/documents/validate/latex: проверка выполняется в пуле процессов"""
+        with open("../docs/my.tex", "rb") as tex_file, open("../docs/settings.sty", "rb") as sty_file:
+            response = self.client.post("/api/documents/validate/latex",
+                                        files={"tex_file": ("my.tex", tex_file), "sty_file": ("settings.sty", sty_file)},
+                                        data={"doc_type": "diploma"})
+        self.assertEqual(response.status_code, 200, "Ошибка при проверке LaTeX-документа")
+        self.assertTrue(response.json()["valid"], "Документ не прошел проверку")
+
+    def test_validate_document_timings(self):
+        """Тест замеров этапов: timings в ответе по запросу и гистограммы в /api/health/timings"""
+        with open("../docs/my.tex", "rb") as tex_file, open("../docs/settings.sty", "rb") as sty_file:
+            # Комментарий делает содержимое уникальным, чтобы результат не был взят из кэша
+            tex_content = tex_file.read() + f"\n% {time.time()}".encode()
+            response = self.client.post("/api/documents/validate/latex",
+                                        files={"tex_file": ("my.tex", tex_content),
+                                               "sty_file": ("settings.sty", sty_file)},
+                                        data={"doc_type": "diploma", "timings": "true"})
+        self.assertEqual(response.status_code, 200, "Ошибка при проверке LaTeX-документа")
+        stages = response.json()["timings"]["latex"]["stages"]
+        self.assertIn("check_structure", stages["check"]["stages"])
+
+        histograms = self.client.get("/api/health/timings").json()
+        self.assertGreaterEqual(histograms["latex.parse.parse_structure"]["count"], 1)
+        self.assertEqual(histograms["latex"]["buckets"]["+Inf"], histograms["latex"]["count"])
+
+    def test_metrics(self):
+        """Тест /metrics: счетчики запросов и проверок в формате Prometheus"""
+        with open("../docs/my.tex", "rb") as tex_file, open("../docs/settings.sty", "rb") as sty_file:
+            self.client.post("/api/documents/validate/latex",
+                             files={"tex_file": ("my.tex", tex_file), "sty_file": ("settings.sty", sty_file)},
+                             data={"doc_type": "diploma"})
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200, "Ошибка при получении метрик")
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        text = response.text
+        self.assertIn('doccheck_http_requests_total{route="/api/documents/validate/latex",method="POST",status="200"}',
+                      text)
+        self.assertIn('doccheck_validations_total{format="latex",doc_type="diploma",valid="true"', text)
+        self.assertIn("doccheck_worker_pool_active ", text)
+        self.assertIn("doccheck_result_cache_hit_ratio ", text)
+
+    def test_validation_job(self):
+        """Тест фоновой проверки: постановка в очередь и получение результата"""
+        with open("../docs/my.tex", "rb") as tex_file, open("../docs/settings.sty", "rb") as sty_file:
+            response = self.client.post("/api/documents/validate/jobs",
+                                        files={"file": ("my.tex", tex_file), "sty_file": ("settings.sty", sty_file)},
+                                        data={"doc_type": "diploma", "priority": "5"})
+        self.assertEqual(response.status_code, 202, "Ошибка при постановке проверки в очередь")
+        job_id = response.json()["job_id"]
+
+        for _ in range(100):
+            job = self.client.get(f"/api/documents/validate/jobs/{job_id}").json()
+            if job["status"] in ("DONE", "FAILED"):
+                break
+            time.sleep(0.1)
+        self.assertEqual(job["status"], "DONE", "Фоновая проверка не завершилась")
+        self.assertTrue(job["result"]["valid"], "Документ не прошел проверку")
+
+        response = self.client.get("/api/documents/validate/jobs/unknown")
+        self.assertEqual(response.status_code, 404, "Неизвестная задача должна возвращать 404")
+
+    def test_validate_documents_batch(self):
+        """Тест пакетной проверки: zip-архив, результаты построчно в NDJSON"""
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            zip_file.write("../docs/my.tex", "group/my.tex")
+            zip_file.write("../docs/main.tex", "group/main.tex")
+            zip_file.write("../docs/settings.sty", "group/settings.sty")
+
+        response = self.client.post("/api/documents/validate/batch",
+                                    files={"archive": ("group.zip", archive.getvalue())},
+                                    data={"doc_type": "diploma"})
+        self.assertEqual(response.status_code, 200, "Ошибка при пакетной проверке")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        results = {line["file"]: line for line in lines if "file" in line}
+        self.assertEqual(set(results), {"group/my.tex", "group/main.tex"})
+        self.assertTrue(results["group/my.tex"]["result"]["valid"])
+        self.assertEqual(lines[-1]["summary"], {"total": 2, "valid": 1, "invalid": 1, "failed": 0})
+
+    def test_validate_documents_batch_overload(self):
+        """Тест пакетной проверки при заполненной очереди: документы получают ошибку перегрузки"""
+        with open("../docs/my.tex", "rb") as tex_file, open("../docs/settings.sty", "rb") as sty_file:
+            # Комментарий делает содержимое уникальным, чтобы результат не был взят из кэша
+            tex_content = tex_file.read() + f"\n% {time.time()}".encode()
+            files = [("files", ("my.tex", tex_content)), ("files", ("settings.sty", sty_file.read()))]
+        with mock.patch("src.logics.worker_pool.WorkerPool.run", side_effect=OverloadException("Очередь заполнена")):
+            response = self.client.post("/api/documents/validate/batch", files=files, data={"doc_type": "diploma"})
+        self.assertEqual(response.status_code, 200)
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(lines[0], {"file": "my.tex", "error": "Очередь заполнена"})
+        self.assertEqual(lines[-1]["summary"], {"total": 1, "valid": 0, "invalid": 0, "failed": 1})
+
+    def test_validate_document_overload(self):
+        """Тест ответа 429 при переполненной очереди проверки"""
+        with mock.patch("src.logics.worker_pool.WorkerPool.run", side_effect=OverloadException("Очередь заполнена")):
+            response = self.client.post("/api/documents/validate/latex",
+                                        files={"tex_file": ("a.tex", b""), "sty_file": ("a.sty", b"")},
+                                        data={"doc_type": "diploma"})
+        self.assertEqual(response.status_code, 429, "Переполнение очереди не вернуло 429")
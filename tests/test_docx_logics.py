@@ -1,8 +1,23 @@
+import json
+import os
 import unittest
+import zipfile
+from io import BytesIO
 from pprint import pprint
+from unittest import mock
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from lxml import etree
 
 from src.logics.checkers.docx_checker import DocxChecker
+from src.logics.dedoc_pool import DedocPool
+from src.logics.parsers.docx_context import DocxContext
 from src.logics.parsers.docx_parser import DocxParser
+from src.logics.parsers.incremental_docx_parser import IncrementalDocxParser
+from src.logics.parsers.streaming_docx_parser import StreamingDocxParser
+from src.logics.parsers.streaming_threshold import StreamingThreshold
 from src.settings_manager import SettingsManager
 
 
@@ -28,3 +43,193 @@ class TestDocxLogics(unittest.TestCase):
 
         self.assertFalse(result["valid"], "Структура документа не прошла проверку")
         self.assertTrue(checker.errors, "Ошибки не были найдены")
+
+    def test_dedoc_pool_reuses_managers(self):
+        with mock.patch("src.logics.dedoc_pool.DedocPool._create_manager") as manager_cls:
+            before = DedocPool.get_stats()
+            with DedocPool.acquire() as first:
+                pass
+            with DedocPool.acquire() as second:
+                pass
+            after = DedocPool.get_stats()
+
+        self.assertIs(first, second, "Менеджер dedoc не был возвращен в пул")
+        self.assertLessEqual(manager_cls.call_count, 1, "Менеджер dedoc создается на каждый разбор")
+        self.assertEqual(after["warm_parses"] + after["cold_parses"],
+                         before["warm_parses"] + before["cold_parses"] + 2)
+
+
+class TestDocxFastMode(unittest.TestCase):
+    """Паритет быстрого режима (без dedoc) и полной проверки размера шрифта"""
+    sample_docs = ["../docs/diploma_lib.docx"]
+
+    def setUp(self):
+        self.manager = SettingsManager()
+        self.manager.open("../settings.json")
+
+    @staticmethod
+    def font_size_errors(checker: DocxChecker) -> set:
+        checker.check_font_size()
+        return {error for error in checker.errors if error.startswith("Неверный размер шрифта")}
+
+    def test_fast_mode_does_not_use_dedoc(self):
+        with mock.patch("src.logics.dedoc_pool.DedocPool.acquire") as acquire:
+            checker = DocxChecker("../docs/diploma_lib.docx", "diploma", fast=True)
+            result = checker.check_document()
+
+        acquire.assert_not_called()
+        self.assertIsNone(checker.serialized_document)
+        self.assertIn("errors", result)
+
+    def test_fast_mode_from_stream(self):
+        """Документ из байтов и потока разбирается так же, как по пути, без временных файлов"""
+        with open("../docs/diploma_lib.docx", "rb") as file:
+            content = file.read()
+        expected = DocxChecker("../docs/diploma_lib.docx", "diploma", fast=True).check_document()
+
+        with mock.patch("tempfile.NamedTemporaryFile") as temp_file:
+            self.assertEqual(DocxChecker(content, "diploma", fast=True).check_document(), expected)
+            self.assertEqual(DocxChecker(BytesIO(content), "diploma", fast=True).check_document(), expected)
+        temp_file.assert_not_called()
+
+    def test_context_file_path_cleanup(self):
+        """Временный файл для dedoc удаляется и при ошибке разбора"""
+        with open("../docs/diploma_lib.docx", "rb") as file:
+            context = DocxContext(BytesIO(file.read()))
+
+        with self.assertRaises(RuntimeError):
+            with context.file_path() as file_path:
+                self.assertTrue(os.path.exists(file_path))
+                raise RuntimeError("Ошибка разбора")
+        self.assertFalse(os.path.exists(file_path))
+
+    def test_fast_mode_font_size_parity(self):
+        """
+        Размеры шрифта быстрого режима совпадают с аннотациями size dedoc 2.3.2,
+        записанными в tests/fixtures (tests/fixtures/make_dedoc_sizes.py)
+        """
+        for docx_file_path in self.sample_docs:
+            with self.subTest(docx_file_path=docx_file_path):
+                fixture = f"fixtures/{os.path.splitext(os.path.basename(docx_file_path))[0]}_dedoc_sizes.json"
+                with open(fixture, encoding="utf-8") as file:
+                    dedoc_lines = json.load(file)
+                parser = DocxParser(docx_file_path, use_dedoc=False)
+
+                # Строки dedoc начинаются с номера элемента списка, поэтому абзац ищется внутри строки
+                position = 0
+                for paragraph in parser.parsed_document["font_sizes"]:
+                    prefix = paragraph["text"][:50]
+                    while position < len(dedoc_lines) and prefix not in dedoc_lines[position]["text"]:
+                        position += 1
+                    self.assertLess(position, len(dedoc_lines), f"Нет строки dedoc для абзаца '{prefix}'")
+                    self.assertEqual(dedoc_lines[position]["sizes"], paragraph["sizes"], prefix)
+                    position += 1
+
+    def test_fast_mode_builtin_character_style(self):
+        """Встроенный стиль символов и фрагменты внутри гиперссылки учитываются, как у dedoc"""
+        doc = Document()
+        doc.styles["Strong"].font.size = Pt(12)
+        para = doc.add_paragraph("Опрос ")
+        run = para.add_run("https://example.com", "Strong")
+        hyperlink = para._p.makeelement(qn("w:hyperlink"))
+        hyperlink.append(run._r)
+        para._p.append(hyperlink)
+        stream = BytesIO()
+        doc.save(stream)
+
+        parser = DocxParser(stream.getvalue(), use_dedoc=False)
+        self.assertTrue(doc.styles["Strong"].builtin)
+        self.assertEqual(parser.parsed_document["font_sizes"][0]["sizes"], ["11.0", "12.0"])
+
+
+class TestIncrementalDocx(unittest.TestCase):
+    """Повторная проверка .docx в рамках сессии совпадает с полным разбором"""
+
+    def setUp(self):
+        self.manager = SettingsManager()
+        self.manager.open("../settings.json")
+        with open("../docs/diploma_lib.docx", "rb") as file:
+            self.content = file.read()
+        IncrementalDocxParser.clear()
+
+    @staticmethod
+    def save(document: Document) -> bytes:
+        stream = BytesIO()
+        document.save(stream)
+        return stream.getvalue()
+
+    def test_changed_paragraphs_match_full_parse(self):
+        document = Document(BytesIO(self.content))
+        paragraph = next(para for para in document.paragraphs if para.text.strip())
+        paragraph.add_run(" (см. рисунок 9)")
+        if document.tables:
+            document.tables[0].cell(0, 0).text = "Измененная ячейка"
+        edited = self.save(document)
+
+        for version in (self.content, edited):
+            full = DocxParser(version, use_dedoc=False)
+            incremental = IncrementalDocxParser(version, use_dedoc=False, session_id="test")
+            self.assertEqual(incremental.parsed_document, full.parsed_document)
+
+        stats = IncrementalDocxParser.get_stats()
+        self.assertEqual(stats["sessions"], 1)
+        self.assertGreater(stats["hits"], 0)
+
+    def test_dedoc_result_reused_for_same_content(self):
+        # Повторное сохранение без изменений текста: меняются только свойства документа (docProps)
+        resaved = BytesIO()
+        with zipfile.ZipFile(BytesIO(self.content)) as source, zipfile.ZipFile(resaved, "w") as target:
+            for info in source.infolist():
+                data = source.read(info.filename)
+                if info.filename == "docProps/core.xml":
+                    data = data.replace(b"</cp:coreProperties>", b"<cp:revision>99</cp:revision></cp:coreProperties>")
+                target.writestr(info, data)
+        serialised = {"content": {"structure": {"text": "", "annotations": [], "subparagraphs": []}}}
+
+        with mock.patch.object(DocxParser, "init_dedoc", return_value=serialised) as init_dedoc:
+            IncrementalDocxParser(self.content, session_id="test")
+            parser = IncrementalDocxParser(resaved.getvalue(), session_id="test")
+
+        init_dedoc.assert_called_once()
+        self.assertIs(parser.serialised_document, serialised)
+        self.assertEqual(IncrementalDocxParser.get_stats()["dedoc_reused"], 1)
+
+
+class TestStreamingDocx(unittest.TestCase):
+    """Потоковый разбор больших .docx совпадает с полным разбором"""
+
+    def setUp(self):
+        with open("../docs/diploma_lib.docx", "rb") as file:
+            self.content = file.read()
+
+    def test_streaming_matches_full_parse(self):
+        full = DocxParser(self.content, use_dedoc=False)
+        streaming = StreamingDocxParser(self.content, use_dedoc=False)
+
+        self.assertEqual(streaming.parsed_document, full.parsed_document)
+        self.assertIsNone(streaming.context._DocxContext__document)
+
+    def test_threshold_selects_streaming(self):
+        context = DocxContext(self.content)
+        try:
+            StreamingThreshold.configure(1)
+            self.assertTrue(StreamingDocxParser.suits(context))
+            StreamingThreshold.configure(0)
+            self.assertFalse(StreamingDocxParser.suits(context))
+        finally:
+            StreamingThreshold.configure(10 * 1024 * 1024)
+
+    def test_parts_from_loaded_package(self):
+        """После построения дерева python-docx части берутся из его пакета, архив повторно не распаковывается"""
+        context = DocxContext(self.content)
+        self.assertIsNotNone(context.document)
+        try:
+            StreamingThreshold.configure(1)
+            self.assertFalse(StreamingDocxParser.suits(context), "Загруженный документ разобран повторно")
+        finally:
+            StreamingThreshold.configure(10 * 1024 * 1024)
+
+        with mock.patch.object(zipfile.ZipFile, "read") as read:
+            styles_xml = context.read_part("word/styles.xml")
+        read.assert_not_called()
+        self.assertEqual(etree.fromstring(styles_xml).tag, qn("w:styles"))
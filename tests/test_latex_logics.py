@@ -1,9 +1,17 @@
 import unittest
+import zipfile
 from io import BytesIO
 from pprint import pprint
+from unittest import mock
 
 from src.logics.checkers.latex_checker import LatexChecker
+from src.logics.parsers.incremental_latex_parser import IncrementalLatexParser
 from src.logics.parsers.latex_parser import LatexParser
+from src.logics.parsers.latex_project import LatexProject
+from src.logics.parsers.interval_index import IntervalIndex
+from src.logics.parsers.latex_tokenizer import LatexTokenizer
+from src.logics.parsers.quote_scanner import QuoteScanner
+from src.logics.sty_reference import StyReference
 from src.settings_manager import SettingsManager
 
 
@@ -51,6 +59,33 @@ class TestLatexLogics(unittest.TestCase):
         self.assertTrue(checker.errors, "Ошибки не были найдены при несоответствии .sty файла")
         print(checker.errors)
 
+    def test_sty_reference_all_blocks(self):
+        """Тест сравнения .sty: комментарии не учитываются, в отчет попадают все расхождения"""
+        lines = self.reference_sty_content[:]
+        same = "\n".join(["% комментарий"] + lines).encode("utf-8")
+        self.assertEqual(StyReference.compare(same), ())
+
+        lines[0] = "Неверная строка"
+        lines.append("\\newcommand{\\extra}{}")
+        errors = StyReference.compare("\n".join(lines).encode("utf-8"))
+        self.assertEqual(len(errors), 2, "Найдены не все расхождения")
+        self.assertIn("(строка 1)", errors[0])
+        self.assertIn("лишние строки", errors[1])
+        self.assertIs(StyReference.compare("\n".join(lines).encode("utf-8")), errors, "Результат не взят из кэша")
+
+    def test_check_sty_file_without_reference(self):
+        """Без эталона docs/settings.sty проверка .sty не выполняется, даже если файл пуст"""
+        with open("../docs/my.tex", "rb") as tex_file:
+            checker = LatexChecker(tex_file, BytesIO(b""), "course_work")
+
+        with mock.patch.object(StyReference, "REFERENCE_PATH", "../docs/missing.sty"):
+            self.assertIsNone(StyReference.compare(b""))
+            checker.check_sty_file()
+        self.assertFalse(checker.errors, "Ошибки найдены без эталонного .sty файла")
+
+        checker.check_sty_file()
+        self.assertEqual(checker.errors, ["Файл settings.sty не был загружен или пуст."])
+
     def test_latex_check_lists(self):
         pass
 
@@ -85,6 +120,76 @@ class TestLatexLogics(unittest.TestCase):
 
         self.assertTrue(result["valid"], "Структура документа не прошла проверку")
 
+    def test_tokenizer_nested_braces(self):
+        """Аргументы с вложенными скобками разбираются целиком"""
+        content = "\\chapter*{ВВЕДЕНИЕ}\\section{Модель $x_{i}$}\\begin{figure}\\label{fig:a}\\end{figure}"
+        tokens = LatexTokenizer(content)
+
+        section = tokens.first("section")
+        self.assertEqual(tokens.arg(section), "Модель $x_{i}$")
+        self.assertTrue(tokens.first("chapter").star)
+
+        figure = tokens.find_environments("figure")[0]
+        labels = tokens.find("label", start=figure.start, end=figure.end)
+        self.assertEqual([tokens.arg(label) for label in labels], ["fig:a"])
+
+    def test_interval_index(self):
+        index = IntervalIndex([(10, 20), (15, 30), (40, 50)])
+
+        self.assertEqual(index.ranges, [(10, 30), (40, 50)])
+        self.assertIn(10, index)
+        self.assertIn(30, index)
+        self.assertNotIn(35, index)
+        self.assertNotIn(5, index)
+
+    def test_quote_scanner(self):
+        text = 'Допустимо «слово», <<слово>> и «внешние „внутренние“». Ошибка "слово" и \'слово\'.'
+        spans = QuoteScanner.scan(text)
+
+        self.assertEqual([text[start:end] for start, end in spans], ['"слово"', "'слово'"])
+
+    def test_latex_project_source_map(self):
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as project_zip:
+            project_zip.writestr("main.tex", "\\documentclass{report}\n\\begin{document}\n% \\input{old}\n"
+                                             "\\input{chapters/intro}\n\\include{missing}\n\\end{document}\n")
+            project_zip.writestr("chapters/intro.tex", "Первая строка\n\nТекст с \"кавычками\".\n")
+            project_zip.write("../docs/settings.sty", "settings.sty")
+
+        project = LatexProject.from_zip(archive.getvalue())
+        self.assertEqual(project.main, "main.tex")
+        text, source_map, errors = project.expand()
+
+        self.assertIn("Текст с", text)
+        self.assertEqual(source_map.locate(text.index("\\end{document}")), ("main.tex", 6))
+        self.assertEqual(len(errors), 1)
+        self.assertIn("missing", errors[0])
+
+        result = LatexChecker.from_project(project, None, "diploma").check_document()
+        quote_errors = [error for error in result["errors"] if "кавычки" in error]
+        self.assertEqual(len(quote_errors), 1)
+        self.assertTrue(quote_errors[0].endswith("[chapters/intro.tex:3]"))
+        self.assertFalse(any("settings.sty" in error for error in result["errors"]))
+
+    def test_incremental_parser_matches_full_parse(self):
+        with open("../docs/my.tex", "rb") as tex_file:
+            content = tex_file.read()
+        # Вторая версия: изменена одна глава, добавлена незакрытая скобка в последней главе
+        chapter_start = content.rindex(b"\\chapter")
+        edited = content[:chapter_start] + "Текст \"в кавычках\" {\\bf жирный}\n{".encode() + content[chapter_start:]
+
+        IncrementalLatexParser.clear()
+        for version in (content, edited):
+            full = LatexParser(BytesIO(version))
+            incremental = IncrementalLatexParser(BytesIO(version), session_id="test")
+            self.assertEqual(incremental.tex_content, full.tex_content)
+            self.assertEqual(incremental.parsed_document, full.parsed_document)
+            self.assertEqual(incremental.errors, full.errors)
+
+        stats = IncrementalLatexParser.get_stats()
+        self.assertEqual(stats["sessions"], 1)
+        self.assertGreater(stats["hits"], 0)
+
 
 if __name__ == '__main__':
     unittest.main()
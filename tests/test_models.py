@@ -1,11 +1,13 @@
 import unittest
 
 from src.core.doc_type import DocType
+from src.core.job_status import JobStatus
 from src.core.rule_type import RuleType
 from src.models.document import Document
 from src.models.mistake import Mistake
 from src.models.recommendation import Recommendation
 from src.models.rule import Rule
+from src.models.validation_job import ValidationJob
 from src.models.validation_result import ValidationResult
 from src.models.validation_rules import ValidationRules
 from src.settings_manager import SettingsManager
@@ -423,3 +425,21 @@ class TestModels(unittest.TestCase):
         rules_str = str(val_rules)
         self.assertIn("Правила проверки", rules_str)
         self.assertIn("DIPLOMA", rules_str)
+
+    def test_validation_job_to_dict(self):
+        """Тест конвертации фоновой проверки в словарь и обратно"""
+        job = ValidationJob()
+        job.name = "diploma.docx"
+        job.doc_type = DocType.DIPLOMA
+        job.status = JobStatus.RUNNING
+        job.result = {"valid": True, "errors": []}
+        job.status = JobStatus.DONE
+
+        job_dict = job.to_dict()
+        self.assertEqual(job_dict["status"], "DONE")
+        self.assertIsNotNone(job_dict["finished_at"])
+
+        restored = ValidationJob()
+        restored.from_dict(job_dict)
+        self.assertEqual(restored.status, JobStatus.DONE)
+        self.assertEqual(restored.result, {"valid": True, "errors": []})
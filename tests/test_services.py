@@ -1,11 +1,48 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
+import zipfile
+from io import BytesIO
+from unittest import mock
 
 from src.core.doc_type import DocType
+from src.core.abstract_logic import AbstractLogic
+from src.core.event_type import EventType
+from src.core.validator import OperationException
+from src.logics import validation_tasks
+from src.logics.batch_service import BatchService
 from src.logics.doc_service import DocService
+from src.logics.job_service import JobService
+from src.logics.log_writer import LogWriter
+from src.logics.observe_service import ObserveService
+from src.logics.parsers.streaming_threshold import StreamingThreshold
+from src.logics.result_cache import ResultCache
 from src.logics.rule_service import RuleService
+from src.logics.worker_pool import WorkerPool
+from src.logics.worker_stats import WorkerStats
 from src.settings_manager import SettingsManager
 
 
+class RulesObserver(AbstractLogic):
+    """Наблюдатель, подписанный только на изменение правил"""
+
+    def __init__(self):
+        self.events = []
+
+    @property
+    def subscriptions(self) -> frozenset:
+        return frozenset({EventType.RULES_CHANGED})
+
+    def set_exception(self, ex: Exception):
+        super().set_exception(ex)
+
+    def handle_event(self, event_type: EventType, params):
+        super().handle_event(event_type, params)
+        self.events.append((event_type, params))
+
+
 class TestServices(unittest.TestCase):
 
     def setUp(self):
@@ -19,6 +56,214 @@ class TestServices(unittest.TestCase):
         self.assertTrue(rules, "Ошибка при загрузке правил")
         self.assertTrue(rules["structure_rules"], "Ошибка при загрузке структурных правил")
 
+    def test_rule_service_cache(self):
+        """Тест кэширования правил: повторная загрузка возвращает тот же неизменяемый снимок"""
+        RuleService.invalidate_cache(DocType.DIPLOMA)
+        first = RuleService.load_rules(DocType.DIPLOMA)
+        hits = RuleService.get_cache_stats()["hits"]
+        second = RuleService.load_rules(DocType.DIPLOMA)
+
+        self.assertIs(first, second, "Правила не были взяты из кэша")
+        self.assertEqual(RuleService.get_cache_stats()["hits"], hits + 1)
+        with self.assertRaises(TypeError):
+            first["structure_rules"]["required_chapters"] = []
+
+    def test_result_cache(self):
+        """Тест кэша результатов: ключ зависит от режима проверки, изменение правил очищает записи"""
+        ResultCache()
+        key = ResultCache.make_key(DocType.DIPLOMA, False, b"document")
+        self.assertNotEqual(key, ResultCache.make_key(DocType.DIPLOMA, True, b"document"))
+
+        ResultCache.put(key, {"errors": []})
+        self.assertEqual(ResultCache.get(key), {"errors": []}, "Результат не был взят из кэша")
+
+        ObserveService.raise_event(EventType.RULES_CHANGED, DocType.DIPLOMA)
+        self.assertIsNone(ResultCache.get(key), "Кэш не очищен после изменения правил")
+
+    def test_job_service_max_finished(self):
+        """Тест хранения фоновых задач: сверх max_finished удаляются самые старые завершенные задачи"""
+        settings = self.manager.current_settings
+        ResultCache()
+        key = ResultCache.make_key(DocType.DIPLOMA, False, b"job document")
+        ResultCache.put(key, {"valid": True, "errors": []})
+        JobService.configure(1, 10, 3600, 2)
+        try:
+            jobs = [JobService.submit(f"doc{index}.tex", DocType.DIPLOMA, validation_tasks.validate_latex,
+                                      cache_key=key) for index in range(3)]
+            self.assertIsNone(JobService.get_job(jobs[0].id), "Самая старая задача не удалена")
+            self.assertIsNotNone(JobService.get_job(jobs[1].id))
+            self.assertIsNotNone(JobService.get_job(jobs[2].id))
+        finally:
+            JobService.configure(settings.job_workers, settings.job_queue_size, settings.job_result_ttl,
+                                 settings.job_max_finished)
+
+    def test_job_service_publishes_stripped_result(self):
+        """Тест фоновой задачи: результат публикуется только после извлечения служебных ключей"""
+        started = threading.Event()
+        published = []
+        result = {"valid": True, "errors": [], "timings": {"name": "latex", "seconds": 0.1},
+                  "worker_stats": {"pid": -3, "dedoc_pool": {}, "rule_cache": {}}}
+
+        def execute(func, *args):
+            started.wait(5)
+            return result
+
+        def collect(value):
+            published.append(JobService.get_job(job.id).result)
+            value.pop("timings", None)
+
+        with mock.patch("src.logics.job_service.WorkerPool.execute", side_effect=execute), \
+                mock.patch("src.logics.job_service.TimingStats.collect", side_effect=collect):
+            job = JobService.submit("doc.tex", DocType.DIPLOMA, validation_tasks.validate_latex)
+            started.set()
+            for _ in range(100):
+                if job.status.name == "DONE":
+                    break
+                time.sleep(0.05)
+
+        self.assertEqual(job.status.name, "DONE")
+        self.assertEqual(published, [None], "Результат опубликован до извлечения служебных ключей")
+        self.assertNotIn("timings", job.result)
+        self.assertNotIn("worker_stats", job.result)
+
+    def test_log_writer_rotation(self):
+        """Тест фоновой записи журнала: сообщения дописываются пачками, файл ротируется по размеру"""
+        settings = self.manager.current_settings
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "application.log")
+            LogWriter.configure(log_path, 100, 200, 0, 2)
+            try:
+                for index in range(20):
+                    LogWriter.write(f"Сообщение {index:02d}")
+                LogWriter.flush()
+
+                self.assertTrue(os.path.exists(log_path + ".1"), "Журнал не был ротирован")
+                self.assertFalse(os.path.exists(log_path + ".3"), "Лишние архивы журнала не удалены")
+                with open(log_path, encoding="utf-8") as log_file:
+                    self.assertTrue(log_file.read().endswith("Сообщение 19\n"))
+            finally:
+                LogWriter.configure("application.log", settings.log_queue_size, settings.log_max_mb * 1024 * 1024,
+                                    settings.log_rotate_hours * 3600, settings.log_backup_count)
+
+    def test_log_writer_time_rotation(self):
+        """Тест ротации журнала по времени: учитывается время изменения файла, а не запуск процесса"""
+        settings = self.manager.current_settings
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "application.log")
+            LogWriter.configure(log_path, 100, 0, 3600, 2)
+            try:
+                with open(log_path, "w", encoding="utf-8") as log_file:
+                    log_file.write("Старое сообщение\n")
+                LogWriter.write("Сообщение 1")
+                LogWriter.flush()
+                self.assertFalse(os.path.exists(log_path + ".1"), "Журнал текущего часа ротирован")
+
+                modified = time.time() - 2 * 3600
+                os.utime(log_path, (modified, modified))
+                LogWriter.write("Сообщение 2")
+                LogWriter.flush()
+                self.assertTrue(os.path.exists(log_path + ".1"), "Журнал прошлого часа не был ротирован")
+                with open(log_path, encoding="utf-8") as log_file:
+                    self.assertEqual(log_file.read(), "Сообщение 2\n")
+            finally:
+                LogWriter.configure("application.log", settings.log_queue_size, settings.log_max_mb * 1024 * 1024,
+                                    settings.log_rotate_hours * 3600, settings.log_backup_count)
+
+    def test_worker_pool_route_key(self):
+        """Тест пула процессов: задачи одной сессии выполняет один процесс"""
+        settings = self.manager.current_settings
+        WorkerPool.configure(2, 4)
+        try:
+            WorkerPool.start()
+            for session_id in ("session-1", "session-2", "session-3"):
+                pids = {WorkerPool.execute(os.getpid, route_key=session_id) for _ in range(5)}
+                self.assertEqual(len(pids), 1, f"Задачи сессии {session_id} выполнялись разными процессами")
+        finally:
+            WorkerPool.configure(settings.worker_pool_size, settings.worker_queue_size)
+
+    def test_worker_pool_initializer(self):
+        """Тест пула процессов: дочерние процессы настраиваются функцией инициализации"""
+        settings = self.manager.current_settings
+        WorkerPool.configure(1, 2, initializer=validation_tasks.warm_up_worker, initargs=(False, 1, 12345))
+        try:
+            WorkerPool.start()
+            self.assertEqual(WorkerPool.execute(StreamingThreshold.get), 12345,
+                             "Дочерний процесс не настроен при запуске")
+        finally:
+            WorkerPool.configure(settings.worker_pool_size, settings.worker_queue_size)
+
+    def test_warm_up_worker_error(self):
+        """Тест инициализации процесса проверки: ошибка прогрева dedoc записывается в журнал"""
+        settings = self.manager.current_settings
+        events = []
+        with mock.patch("src.logics.dedoc_pool.DedocPool.warm_up", side_effect=RuntimeError("нет моделей")), \
+                mock.patch("src.logics.observe_service.ObserveService.raise_event",
+                           side_effect=lambda event_type, params: events.append((event_type, params()))):
+            validation_tasks.warm_up_worker(True, settings.dedoc_pool_size)
+
+        self.assertEqual(events, [(EventType.LOG_ERROR, "Не удалось прогреть dedoc: нет моделей")])
+
+    def test_worker_stats(self):
+        """Тест счетчиков процессов проверки: берутся последние значения процесса и суммируются по процессам"""
+        before = WorkerStats.get_stats("rule_cache")
+        for pid, hits in ((-1, 1), (-2, 2), (-1, 5)):
+            result = {"valid": True, "worker_stats": {"pid": pid, "rule_cache": {"hits": hits, "misses": 1}}}
+            WorkerStats.collect(result)
+            self.assertNotIn("worker_stats", result, "Счетчики не извлечены из результата")
+
+        after = WorkerStats.get_stats("rule_cache")
+        self.assertEqual(after["hits"], before["hits"] + 7)
+        self.assertEqual(after["misses"], before["misses"] + 2)
+
+    def test_worker_stats_gauges(self):
+        """Тест состояния пула dedoc процессов проверки: созданные и занятые менеджеры суммируются по процессам"""
+        before = WorkerStats.get_stats("dedoc_pool")
+        for pid, in_use in ((-4, 1), (-5, 0)):
+            WorkerStats.collect({"worker_stats": {"pid": pid, "dedoc_pool": {
+                "warm_parses": 0, "cold_parses": 1, "created": 1, "in_use": in_use}}})
+
+        after = WorkerStats.get_stats("dedoc_pool")
+        self.assertEqual(after["created"], before["created"] + 2)
+        self.assertEqual(after["in_use"], before["in_use"] + 1)
+        self.assertEqual(after["processes"], before["processes"] + 2)
+        self.assertIn("in_use", WorkerStats.snapshot()["dedoc_pool"])
+
+    def test_batch_archive_limits(self):
+        """Тест ограничений zip-архива пакетной проверки: количество и размер файлов после распаковки"""
+        settings = self.manager.current_settings
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("a.tex", b"%" * 1024)
+            zip_file.writestr("b.tex", b"%" * 1024)
+            zip_file.writestr("notes.txt", b"%" * 1024 * 1024)
+        content = archive.getvalue()
+
+        try:
+            BatchService.configure(2, 1024, 2048)
+            self.assertEqual([name for name, _ in BatchService.read_archive(content)], ["a.tex", "b.tex"])
+            for limits in ((1, 1024, 2048), (2, 1023, 2048), (2, 1024, 2047)):
+                BatchService.configure(*limits)
+                with self.assertRaises(OperationException, msg=f"Ограничения {limits} не применены"):
+                    BatchService.read_archive(content)
+        finally:
+            BatchService.configure(settings.batch_max_files, settings.batch_max_file_mb * 1024 * 1024,
+                                   settings.batch_max_total_mb * 1024 * 1024)
+
+    def test_observe_service_dispatch(self):
+        """Тест рассылки событий: наблюдатель получает только свои события, сообщение без подписчиков не формируется"""
+        observer = RulesObserver()
+        calls = []
+        try:
+            with mock.patch.object(ObserveService, "observers", [observer]):
+                ObserveService.update_subscriptions()
+                ObserveService.raise_event(EventType.LOG_DEBUG, lambda: calls.append("formatted"))
+                ObserveService.raise_event(EventType.RULES_CHANGED, lambda: DocType.DIPLOMA)
+        finally:
+            ObserveService.update_subscriptions()
+
+        self.assertEqual(calls, [], "Сообщение сформировано без подписчиков")
+        self.assertEqual(observer.events, [(EventType.RULES_CHANGED, DocType.DIPLOMA)])
+
     def test_rule_service_get_rule_types(self):
         """Тест получения типов правил"""
         types = RuleService.get_rule_types()
@@ -62,6 +62,14 @@ class TestSettingsManager(unittest.TestCase):
         settings_instance.logging_level = valid_value
         self.assertEqual(settings_instance.logging_level, LoggingLevel(valid_value))
 
+    def test_dedoc_pool_size_setter(self):
+        settings_instance = SettingsModel()
+        settings_instance.dedoc_pool_size = 4
+        self.assertEqual(settings_instance.dedoc_pool_size, 4)
+
+        with self.assertRaises(ArgumentException):
+            settings_instance.dedoc_pool_size = 0
+
 
 class TestSavingSettingsManager(unittest.TestCase):
 